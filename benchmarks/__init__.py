@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Micro benchmarks of neat's hot paths.
+
+Each benchmark is runnable as a module from the repository root, for
+example ``python -m benchmarks.translator``.
+"""
+
+import timeit
+import logging
+from typing import Dict
+
+from neat import const
+
+
+def measure(function, number: int=100, repeat: int=5) -> float:
+    """ Measures the best seconds per call of a function.
+
+    :param function: The function to call without arguments
+    :type function: callable
+    :param number: The number of calls per timed run
+    :type number: int
+    :param repeat: The number of timed runs
+    :type repeat: int
+    :returns: The best seconds per call
+    :rtype: float
+    """
+
+    const.log_level = logging.CRITICAL
+    return (
+        min(timeit.repeat(function, number=number, repeat=repeat)) / number
+    )
+
+
+def report(title: str, results: Dict[str, float], baseline: str) -> None:
+    """ Prints the per call timings of benchmarked variants.
+
+    :param title: The title of the benchmark
+    :type title: str
+    :param results: The best seconds per call keyed by variant
+    :type results: dict
+    :param baseline: The variant the speedups are relative to
+    :type baseline: str
+    :returns: Does not return
+    :rtype: None
+    """
+
+    print(title)
+    for (variant, seconds) in results.items():
+        print((
+            '  {variant:<20} {usec:>12.1f} usec/call {speedup:>8.2f}x'
+        ).format(
+            variant=variant, usec=(seconds * 1e6),
+            speedup=(results[baseline] / seconds)
+        ))
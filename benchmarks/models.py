@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Compares the slotted record models against the previous dict models.
+
+The previous models are reproduced here: every field lives in the
+instance ``__dict__`` behind a property probing it with ``hasattr``, and
+every point allocates its own meta dictionary.
+Run from the repository root with ``python -m benchmarks.models``.
+"""
+
+import argparse
+import tracemalloc
+import collections
+
+from neat.models.record import Record, RecordPoint
+
+from . import measure, report
+
+
+def _legacy_property(attribute: str, convert=None) -> property:
+    """ Builds a property the way the previous models defined them.
+    """
+
+    def getter(self):
+        if hasattr(self, attribute):
+            return getattr(self, attribute)
+
+    def setter(self, value):
+        setattr(self, attribute, (convert(value) if convert else value))
+
+    return property(getter, setter)
+
+
+class LegacyRecordPoint(object):
+
+    number = _legacy_property('_number')
+    name = _legacy_property('_name')
+    unit = _legacy_property('_unit')
+    value = _legacy_property('_value')
+
+    def __init__(self, **kwargs):
+        self._meta = {}
+        for (k, v) in kwargs.items():
+            if hasattr(self, k):
+                setattr(self, k, v)
+            else:
+                self._meta[k] = v
+
+    def to_dict(self):
+        data = {'value': self.value, 'unit': self.unit}
+        if hasattr(self, '_name'):
+            data['name'] = self.name
+        if hasattr(self, '_number'):
+            data['number'] = self.number
+        return data
+
+
+class LegacyRecord(object):
+
+    device_name = _legacy_property('_device_name')
+    name = _legacy_property('_name')
+    lon = _legacy_property('_lon', float)
+    lat = _legacy_property('_lat', float)
+    timestamp = _legacy_property('_timestamp', int)
+    age = _legacy_property('_age', float)
+    ttl = _legacy_property('_ttl', int)
+    type = _legacy_property('_device_type')
+    data = _legacy_property('_data')
+    parsed = _legacy_property('_parsed')
+
+    def __init__(self, **kwargs):
+        (self._data, self._parsed, self._meta,) = ({}, {}, {},)
+        for (k, v) in kwargs.items():
+            if hasattr(self, k):
+                setattr(self, k, v)
+            else:
+                self._meta[k] = v
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'device_name': self.device_name,
+            'type': self.type,
+            'timestamp': self.timestamp,
+            'data': {
+                str(number): point.to_dict()
+                for (number, point) in self.data.items()
+            },
+            'parsed': {
+                name: point.to_dict()
+                for (name, point) in self.parsed.items()
+            },
+            'coord': {'lon': self.lon, 'lat': self.lat},
+            'ttl': self.ttl,
+            'meta': self._meta,
+        }
+
+
+_meta = {
+    'name': 'benchmark', 'type': 'WIND', 'lat': 1.0, 'lon': 2.0, 'ttl': 300,
+    'location': 'roof',
+}
+
+
+def build(record_class, point_class, points: int):
+    """ Builds a record the way the translator does.
+    """
+
+    record = record_class(**_meta)
+    record.device_name = 'Benchmark Device'
+    record.timestamp = 1487952382
+    record.age = 59.0
+    record.data = {
+        number: point_class(
+            name='Point {}'.format(number), value=float(number), unit='watt'
+        )
+        for number in range(points)
+    }
+    record.parsed = {
+        'point_{}'.format(number): point_class(value=float(number), unit='kW')
+        for number in range(4)
+    }
+    return record
+
+
+def memory(record_class, point_class, points: int, records: int) -> float:
+    """ Measures the bytes allocated per record kept alive.
+    """
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [
+            build(record_class, point_class, points) for _ in range(records)
+        ]
+        allocated = (tracemalloc.get_traced_memory()[0] - before)
+    finally:
+        tracemalloc.stop()
+    del kept
+    return (allocated / records)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=16)
+    parser.add_argument('--records', type=int, default=2000)
+    args = parser.parse_args()
+
+    variants = collections.OrderedDict((
+        ('legacy', (LegacyRecord, LegacyRecordPoint)),
+        ('slots', (Record, RecordPoint)),
+    ))
+    assert (
+        build(LegacyRecord, LegacyRecordPoint, args.points).to_dict() ==
+        build(Record, RecordPoint, args.points).to_dict()
+    )
+
+    report(
+        'record build ({} points)'.format(args.points),
+        collections.OrderedDict(
+            (name, measure(lambda: build(
+                record_class, point_class, args.points
+            ), number=1000))
+            for (name, (record_class, point_class)) in variants.items()
+        ), 'legacy'
+    )
+    report(
+        'record build and to_dict ({} points)'.format(args.points),
+        collections.OrderedDict(
+            (name, measure(lambda: build(
+                record_class, point_class, args.points
+            ).to_dict(), number=1000))
+            for (name, (record_class, point_class)) in variants.items()
+        ), 'legacy'
+    )
+    print('memory per record ({} points)'.format(args.points))
+    for (name, (record_class, point_class)) in variants.items():
+        print('  {name:<20} {size:>12.0f} bytes'.format(
+            name=name,
+            size=memory(record_class, point_class, args.points, args.records)
+        ))
+
+
+if __name__ == '__main__':
+    main()
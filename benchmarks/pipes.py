@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Measures MongoDB and RethinkDB pipe throughput at several batch sizes.
+
+Inserts go to in-process stand-ins for the databases, which encode the
+documents and sleep for a simulated round-trip per request.
+The RethinkDB stand-in also waits for a simulated disk flush before
+acknowledging hard durability inserts.
+Run from the repository root with ``python -m benchmarks.pipes``.
+"""
+
+import json
+import time
+import logging
+import argparse
+from unittest.mock import patch
+
+from neat import const
+from neat.models.record import Record, RecordPoint
+from neat.pipe.mongodb import MongoDBPipe
+from neat.pipe.rethinkdb import RethinkDBPipe
+
+import bson
+import rethinkdb
+
+
+class StandInCollection(object):
+    """ A collection answering every request after a fixed round-trip.
+    """
+
+    def __init__(self, round_trip: float):
+        (self.round_trip, self.documents, self.requests) = (round_trip, 0, 0)
+
+    def _request(self, documents: list) -> None:
+        for document in documents:
+            bson.encode(document)
+        time.sleep(self.round_trip)
+        self.documents += len(documents)
+        self.requests += 1
+
+    def insert_one(self, document: dict) -> None:
+        self._request([document])
+
+    def insert_many(self, documents: list, ordered: bool=True) -> None:
+        self._request(documents)
+
+
+class _StandInQuery(object):
+    """ A query answering with a fixed result when run.
+    """
+
+    def __init__(self, result=None, delay: float=0.0):
+        (self.result, self.delay) = (result, delay)
+
+    def run(self, connection):
+        if self.delay > 0:
+            time.sleep(self.delay)
+        return self.result
+
+    def __getattr__(self, name: str):
+        return (lambda *args, **kwargs: self)
+
+
+class StandInTable(object):
+    """ A RethinkDB table answering inserts after a fixed round-trip.
+    """
+
+    def __init__(self, round_trip: float, flush: float):
+        (self.round_trip, self.flush) = (round_trip, flush)
+        (self.documents, self.requests) = (0, 0)
+
+    def insert(self, documents: list, durability: str='hard'):
+        json.dumps(documents, default=dict)
+        (self.documents, self.requests) = (
+            (self.documents + len(documents)), (self.requests + 1)
+        )
+        return _StandInQuery({'errors': 0}, delay=(
+            self.round_trip +
+            (self.flush if durability == 'hard' else 0.0)
+        ))
+
+    def index_list(self):
+        return _StandInQuery(['expires'])
+
+    def between(self, *args, **kwargs):
+        return _StandInQuery({'deleted': 0})
+
+
+class StandInDriver(object):
+    """ The parts of the RethinkDB driver used by the pipe.
+    """
+
+    (errors, minval) = (rethinkdb.errors, rethinkdb.minval)
+
+    def __init__(self, table: StandInTable):
+        self._table = table
+
+    def connect(self, *args, **kwargs):
+        return _StandInQuery(True)
+
+    def db_list(self):
+        return _StandInQuery([const.module_name])
+
+    def table_list(self):
+        return _StandInQuery(['benchmark'])
+
+    def table(self, name: str):
+        return self._table
+
+
+def build(count: int, points: int) -> list:
+    """ Builds validated records of distinct timestamps.
+    """
+
+    records = []
+    for timestamp in range(count):
+        record = Record(
+            name='benchmark', device_name='Benchmark Device', type='WIND',
+            lon=2.0, lat=1.0, ttl=300, timestamp=timestamp
+        )
+        record.data = {
+            number: RecordPoint(
+                name='Point {}'.format(number), value=float(number),
+                unit='watt'
+            )
+            for number in range(points)
+        }
+        assert record.validate()
+        records.append(record)
+    return records
+
+
+def run(pipe: MongoDBPipe, records: list, insert_one: bool=False) -> float:
+    """ Writes records through a pipe, returning the records per second.
+    """
+
+    started = time.perf_counter()
+    if insert_one:
+        # NOTE: the previous write path, one request per record
+        for record in records:
+            pipe._table.insert_one(pipe.document(record))
+    else:
+        for record in records:
+            pipe.accept(record)
+        pipe.flush()
+    seconds = (time.perf_counter() - started)
+    assert pipe._table.documents == len(records)
+    return (len(records) / seconds)
+
+
+def print_results(title: str, results: list) -> None:
+    """ Prints the records per second of benchmarked variants.
+    """
+
+    print(title)
+    for (variant, rate) in results:
+        print((
+            '  {variant:<20} {rate:>12.0f} records/sec {speedup:>8.2f}x'
+        ).format(
+            variant=variant, rate=rate, speedup=(rate / results[0][1])
+        ))
+
+
+def run_rethinkdb(args: argparse.Namespace, records: list) -> None:
+    """ Benchmarks the RethinkDB pipe's batch sizes and durabilities.
+    """
+
+    results = []
+    for durability in ('hard', 'soft',):
+        for batch_size in (1, 10, 100, 500):
+            table = StandInTable(args.round_trip, args.disk_flush)
+            with patch(
+                'neat.pipe.rethinkdb.rethinkdb', StandInDriver(table)
+            ), patch.object(RethinkDBPipe, '_cleaning_scheduler'):
+                pipe = RethinkDBPipe(
+                    'localhost', 28015, 'benchmark', batch_size=batch_size,
+                    flush_delay=None, durability=durability
+                )
+                started = time.perf_counter()
+                for record in records:
+                    pipe.accept(record)
+                pipe.flush()
+                seconds = (time.perf_counter() - started)
+            assert table.documents == len(records)
+            results.append((
+                '{durability} batch_size={batch_size}'.format(
+                    durability=durability, batch_size=batch_size
+                ),
+                (len(records) / seconds)
+            ))
+    print_results((
+        'rethinkdb pipe ({records} records, {points} points, '
+        '{round_trip:.1f} ms round-trip, {disk_flush:.1f} ms disk flush)'
+    ).format(
+        records=args.records, points=args.points,
+        round_trip=(args.round_trip * 1e3),
+        disk_flush=(args.disk_flush * 1e3)
+    ), results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--points', type=int, default=16)
+    parser.add_argument('--round-trip', type=float, default=0.0005)
+    parser.add_argument('--disk-flush', type=float, default=0.002)
+    args = parser.parse_args()
+
+    const.log_level = logging.CRITICAL
+    records = build(args.records, args.points)
+    results = []
+    for batch_size in (None, 1, 10, 100, 500):
+        pipe = MongoDBPipe(
+            'localhost', 27017, 'benchmark', entry_delay=0,
+            batch_size=(batch_size or 1), flush_delay=None
+        )
+        pipe._table = StandInCollection(args.round_trip)
+        results.append((
+            ('insert_one' if batch_size is None else
+             'batch_size={}'.format(batch_size)),
+            run(pipe, records, insert_one=(batch_size is None))
+        ))
+
+    print_results((
+        'mongodb pipe ({records} records, {points} points, '
+        '{round_trip:.1f} ms round-trip)'
+    ).format(
+        records=args.records, points=args.points,
+        round_trip=(args.round_trip * 1e3)
+    ), results)
+    run_rethinkdb(args, records)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Compares the ``lxml`` and ``bs4`` engines of the ObviusTranslator.
+
+Run from the repository root with ``python -m benchmarks.translator``.
+"""
+
+import collections
+
+from neat.translator.obvius import ObviusTranslator
+from tests import fixtures
+
+from . import measure, report
+
+
+def main():
+    meta = {'name': 'benchmark', 'type': 'WIND'}
+
+    results = collections.OrderedDict()
+    for engine in ('bs4', 'lxml',):
+        translator = ObviusTranslator()
+        translator._engine = engine
+        # NOTE: the unit map is built lazily, keep it out of the timings
+        translator.unit_map
+        results['parse ' + engine] = measure(
+            lambda: translator.parse(fixtures.OBVIUS_VALID_DAT)
+        )
+        results['translate ' + engine] = measure(
+            lambda: translator.translate(fixtures.OBVIUS_VALID_DAT, meta=meta)
+        )
+    report(
+        'ObviusTranslator parse', collections.OrderedDict(
+            (k, v) for (k, v) in results.items() if k.startswith('parse')
+        ), 'parse bs4'
+    )
+    report(
+        'ObviusTranslator translate', collections.OrderedDict(
+            (k, v) for (k, v) in results.items() if k.startswith('translate')
+        ), 'translate bs4'
+    )
+
+
+if __name__ == '__main__':
+    main()
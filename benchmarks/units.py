@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Compares unit setup of per instance registries against the shared one.
+
+Every variant runs in a fresh interpreter which sets up the given number of
+translators plus every device type, reporting setup time and peak RSS.
+Run from the repository root with ``python -m benchmarks.units``.
+"""
+
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+
+
+def legacy(translators: int) -> None:
+    """ Sets up units the way translators and devices used to.
+    """
+
+    import pint
+    from neat.device import DeviceType
+    from neat.translator.obvius import ObviusTranslator
+
+    for _ in range(translators):
+        registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+        {
+            k: registry.parse_expression(v)
+            for (k, v) in ObviusTranslator._expression_unit_map.items()
+        }
+    for _ in DeviceType:
+        pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+
+
+def shared(translators: int) -> None:
+    """ Sets up units through the shared registry and unit table.
+    """
+
+    from neat.device import DeviceType
+    from neat.translator.obvius import ObviusTranslator
+
+    for _ in range(translators):
+        ObviusTranslator()
+    for device_type in DeviceType:
+        device_type.value[1].ureg
+
+
+def run(variant: str, translators: int) -> dict:
+    """ Runs a variant in a fresh interpreter.
+    """
+
+    result = subprocess.run(
+        [
+            sys.executable, '-m', 'benchmarks.units',
+            '--variant', variant, '--translators', str(translators),
+        ],
+        stdout=subprocess.PIPE, check=True
+    )
+    return json.loads(result.stdout.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--variant', choices=('legacy', 'shared'))
+    parser.add_argument('--translators', type=int, default=4)
+    args = parser.parse_args()
+
+    if args.variant is not None:
+        # NOTE: neat itself is imported before the baseline is taken
+        import logging
+        from neat import const
+        const.log_level = logging.CRITICAL
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        {'legacy': legacy, 'shared': shared}[args.variant](args.translators)
+        print(json.dumps({
+            'seconds': (time.perf_counter() - started),
+            'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            'rss_growth_kb': (
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+            ),
+        }))
+        return
+
+    print((
+        'unit setup of {translators} translators and all device types'
+    ).format(translators=args.translators))
+    results = {_: run(_, args.translators) for _ in ('legacy', 'shared')}
+    for (variant, result) in results.items():
+        print((
+            '  {variant:<8} {seconds:>8.3f} s {rss_kb:>10d} KB peak RSS '
+            '(+{rss_growth_kb} KB for units)'
+        ).format(variant=variant, **result))
+    print('  speedup  {:>8.2f}x'.format(
+        results['legacy']['seconds'] / results['shared']['seconds']
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Compares record validation against per call ``jsonschema.validate``.
+
+Run from the repository root with ``python -m benchmarks.validation``.
+"""
+
+import argparse
+import logging
+import collections
+
+from neat import const
+from neat.models.record import Record, RecordPoint
+
+import jsonschema
+
+from . import measure, report
+
+
+def legacy_validate(record: Record) -> bool:
+    """ Validates a record the way the record model previously did.
+    """
+
+    try:
+        jsonschema.validate(record.to_dict(), const.record_schema)
+        return True
+    except jsonschema.exceptions.ValidationError as exc:
+        const.log.warning((
+            'caught {record.__class__.__name__} validation error on the '
+            'record `{to_dict}`, {exc} ...'
+        ).format(record=record, to_dict=record.to_dict(), exc=str(exc)))
+    return False
+
+
+def build(points: int, valid: bool=True) -> Record:
+    """ Builds a record the way the translator does.
+    """
+
+    record = Record(
+        name='benchmark', device_name='Benchmark Device', type='WIND',
+        lon=2.0, lat=1.0, ttl=300, timestamp=1487952382
+    )
+    record.data = {
+        number: RecordPoint(
+            name='Point {}'.format(number), value=float(number), unit='watt'
+        )
+        for number in range(points)
+    }
+    record.parsed = {
+        'point_{}'.format(letter): RecordPoint(
+            value=float(number), unit=('watt' if valid else None)
+        )
+        for (number, letter) in enumerate('abcd')
+    }
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=16)
+    parser.add_argument('--records', type=int, default=100)
+    args = parser.parse_args()
+
+    const.log_level = logging.CRITICAL
+
+    for valid in (True, False):
+        records = [build(args.points, valid) for _ in range(args.records)]
+        assert (
+            [legacy_validate(record) for record in records] ==
+            Record.validate_many(records) ==
+            [valid] * args.records
+        )
+        report_title = (
+            '{state} records ({records} records, {points} points)'
+        ).format(
+            state=('valid' if valid else 'invalid'),
+            records=args.records, points=args.points
+        )
+        report(report_title, collections.OrderedDict((
+            ('jsonschema.validate', measure(
+                lambda: [legacy_validate(record) for record in records],
+                number=5
+            )),
+            ('validate', measure(
+                lambda: [record.validate() for record in records], number=5
+            )),
+            ('validate_many', measure(
+                lambda: Record.validate_many(records), number=5
+            )),
+        )), 'jsonschema.validate')
+
+
+if __name__ == '__main__':
+    main()
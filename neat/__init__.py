@@ -6,7 +6,7 @@
 
 from . import const
 from .client import BasicClient
-from .engine import Engine
+from .engine import Engine, AsyncEngine
 from . import (
     device,
     scheduler,
@@ -0,0 +1,204 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+from typing import List
+
+from . import const
+from . import requester
+from .models import Record
+from .pipe._common import AbstractPipe
+from .translator import get_translator
+from .translator._common import AbstractTranslator
+
+
+class Backfill(object):
+    """ A one-shot job backfilling the stored interval logs of devices.
+
+    Logs are streamed from their requesters, translated into timestamped
+    records and written to the pipes in batches through
+    :meth:`~neat.pipe._common.AbstractPipe.accept_many`.
+    For example, backfilling the last day of every configured device:
+
+    .. code-block:: python
+
+        job = Backfill.from_devices(config['devices'], pipes)
+        job.run(time.time() - 86400)
+    """
+
+    # NOTE: live requesters map onto the log requester of the same host
+    _log_requesters = {
+        'ObviusRequester': 'ObviusLogRequester',
+        'AsyncObviusRequester': 'ObviusLogRequester',
+        'ObviusHostRequester': 'ObviusHostLogRequester',
+    }
+    _live_options = ('host_concurrency',)
+
+    def __init__(
+        self, requesters: List[requester.ObviusLogRequester],
+        pipes: List[AbstractPipe], batch_size: int=500
+    ):
+        """ Initializes the backfill job.
+
+        :param requesters: The log requesters of the devices to backfill
+        :type requesters: list
+        :param pipes: The pipes to write the backfilled records to
+        :type pipes: list
+        :param batch_size: The records written to the pipes at once (500)
+        :type batch_size: int
+        """
+
+        (self.requesters, self.pipes) = (requesters, list(pipes))
+        self.batch_size = max(int(batch_size), 1)
+        self.translators = {}
+
+    def __repr__(self):
+        """ A string representation of the backfill job.
+
+        :returns: A string representation of the backfill job
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} requesters={requesters}>'
+        ).format(self=self, requesters=len(self.requesters))
+
+    @classmethod
+    def from_devices(
+        cls, devices: List[dict], pipes: List[AbstractPipe],
+        batch_size: int=500
+    ):
+        """ Creates a backfill job from the device configs of a client.
+
+        :param devices: The device configs (as in the client's config)
+        :type devices: list
+        :param pipes: The pipes to write the backfilled records to
+        :type pipes: list
+        :param batch_size: The records written to the pipes at once (500)
+        :type batch_size: int
+        :returns: An instance of the created backfill job
+        :rtype: Backfill
+        """
+
+        requesters = []
+        for (device_index, device) in enumerate(devices):
+            requester_name = device['requester']['$']
+            if requester_name not in cls._log_requesters:
+                const.log.warning((
+                    'no log requester for `{requester_name}` of device at '
+                    'index `{device_index}`, skipping ...'
+                ).format(
+                    requester_name=requester_name, device_index=device_index
+                ))
+                continue
+            requester_config = {
+                k: v
+                for (k, v) in device['requester'].items()
+                if k != '$' and k not in cls._live_options
+            }
+            requesters.append(getattr(
+                requester, cls._log_requesters[requester_name]
+            )(**requester_config))
+        return cls(requesters, pipes, batch_size=batch_size)
+
+    def _translator(
+        self, requester: requester.ObviusLogRequester
+    ) -> AbstractTranslator:
+        """ Retrieves the translator of a requester, creating it if needed.
+
+        :param requester: The requester to retrieve the translator for
+        :type requester: ObviusLogRequester
+        :returns: The translator of the requester
+        :rtype: AbstractTranslator
+        """
+
+        requester_name = requester.__class__.__name__
+        if requester_name not in self.translators:
+            translator_class = get_translator(requester_name)
+            if translator_class is None:
+                raise ValueError((
+                    "no translator supports requester '{requester_name}'"
+                ).format(requester_name=requester_name))
+            self.translators[requester_name] = translator_class()
+        return self.translators[requester_name]
+
+    def _write(self, records: List[Record]) -> None:
+        """ Writes a batch of records to every pipe.
+
+        :param records: The batch of records to write
+        :type records: list
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for piper in self.pipes:
+            piper.accept_many(records)
+
+    def run(self, start: float, end: float=None) -> dict:
+        """ Runs the backfill job for a range of time.
+
+        :param start: The earliest unix timestamp to backfill
+        :type start: float
+        :param end: The unix timestamp to stop backfilling before (unbounded)
+        :type end: float
+        :returns: The record counts and throughput of the job
+        :rtype: dict
+        """
+
+        for piper in list(self.pipes):
+            if not piper.validate():
+                const.log.warning((
+                    'pipe `{piper}` did not pass validation, '
+                    'removing from pipes ...'
+                ).format(piper=piper))
+                self.pipes.remove(piper)
+
+        stats = {'records': 0, 'invalid': 0, 'batches': 0, 'devices': {}}
+        started = time.perf_counter()
+        for log_requester in self.requesters:
+            translator = self._translator(log_requester)
+            for (device_id, meta) in log_requester.devices:
+                device_started = time.perf_counter()
+                (records, invalid, batch) = (0, 0, [])
+                for record in translator.records(
+                    log_requester.fetch(device_id), meta=meta,
+                    start=start, end=end
+                ):
+                    if not record.validate():
+                        invalid += 1
+                        continue
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        self._write(batch)
+                        (records, batch) = ((records + len(batch)), [])
+                        stats['batches'] += 1
+                if len(batch) > 0:
+                    self._write(batch)
+                    records += len(batch)
+                    stats['batches'] += 1
+                seconds = (time.perf_counter() - device_started)
+                const.log.info((
+                    'backfilled `{records}` records of device `{device_id}` '
+                    'from `{log_requester._obvius_ip}` in `{seconds:.3f}` '
+                    'seconds ...'
+                ).format(
+                    records=records, device_id=device_id,
+                    log_requester=log_requester, seconds=seconds
+                ))
+                stats['devices'][meta.get('name', device_id)] = {
+                    'records': records,
+                    'invalid': invalid,
+                    'seconds': seconds,
+                }
+                stats['records'] += records
+                stats['invalid'] += invalid
+        stats['seconds'] = (time.perf_counter() - started)
+        stats['records_per_second'] = (
+            (stats['records'] / stats['seconds'])
+            if stats['seconds'] > 0 else
+            0.0
+        )
+        return stats
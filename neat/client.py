@@ -8,12 +8,13 @@ import os
 import abc
 
 from . import const
-from .engine import Engine
 from . import (
+    engine,
     scheduler,
     requester,
     pipe
 )
+from .backfill import Backfill
 
 import yaml
 
@@ -57,6 +58,7 @@ class BasicClient(AbstractClient):
         :type config: dict
         """
 
+        self._config = config
         device_pairs = []
         pipers = []
         for (device_index, device) in enumerate(config['devices']):
@@ -111,7 +113,14 @@ class BasicClient(AbstractClient):
                     'could not initialize pipe `{piper[$]}` with config '
                     '{piper_config} ...'
                 ).format(piper=piper, piper_config=piper_config))
-        self.engine = Engine(dict(device_pairs), pipers)
+        engine_config = {
+            k: v
+            for (k, v) in (config.get('engine') or {}).items()
+            if k != '$'
+        }
+        self.engine = getattr(
+            engine, (config.get('engine') or {}).get('$', 'Engine')
+        )(dict(device_pairs), pipers, **engine_config)
 
     @staticmethod
     def from_config(config: str):
@@ -138,6 +147,27 @@ class BasicClient(AbstractClient):
                 "given file at '{config}' does not exist"
             ).format(config=config))
 
+    def backfill(
+        self, start: float, end: float=None, batch_size: int=500
+    ) -> dict:
+        """ Backfills the stored interval logs of the configured devices.
+
+        .. note:: Runs once and does not start the engine
+
+        :param start: The earliest unix timestamp to backfill
+        :type start: float
+        :param end: The unix timestamp to stop backfilling before (unbounded)
+        :type end: float
+        :param batch_size: The records written to the pipes at once (500)
+        :type batch_size: int
+        :returns: The record counts and throughput of the backfill
+        :rtype: dict
+        """
+
+        return Backfill.from_devices(
+            self._config['devices'], self.engine.pipes, batch_size=batch_size
+        ).run(start, end=end)
+
     def start(self) -> None:
         """ Starts the engine.
 
@@ -147,8 +177,7 @@ class BasicClient(AbstractClient):
 
         try:
             self.engine.start()
-            for _ in self.engine.register.keys():
-                _.join()
+            self.engine.join()
         except KeyboardInterrupt:
             const.log.info(('terminating client `{self}`').format(self=self))
             self.engine.stop()
@@ -156,6 +156,16 @@ class _const(object):
                 self._record_schema = json.load(fp)
         return self._record_schema
 
+    @property
+    def record_validator(self) -> 'SchemaValidator':
+        """ The validator of the record schema, compiled only once.
+        """
+
+        if not hasattr(self, '_record_validator'):
+            from .models.validator import SchemaValidator
+            self._record_validator = SchemaValidator(self.record_schema)
+        return self._record_validator
+
     @property
     def log_dir(self) -> str:
         """ The logging directroy which should be used.
@@ -9,6 +9,7 @@ import enum
 from typing import Dict
 
 from . import const
+from .units import UnitConverter, get_registry
 from .models.record import Record, RecordPoint
 
 import pint
@@ -35,11 +36,20 @@ class AbstractDevice(object, metaclass=abc.ABCMeta):
     @property
     def ureg(self) -> pint.UnitRegistry:
         """ The unit registry for all devices.
+
+        .. note:: The registry is shared process wide
+        """
+
+        return get_registry()
+
+    @property
+    def converter(self) -> UnitConverter:
+        """ The cache of compiled unit conversions for the device.
         """
 
-        if not hasattr(self, '_ureg'):
-            self._ureg = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
-        return self._ureg
+        if not hasattr(self, '_converter'):
+            self._converter = UnitConverter(self.ureg)
+        return self._converter
 
     def parse(self, record: Record) -> Dict[str, RecordPoint]:
         """ Parses a given record for the necessary device fields.
@@ -56,12 +66,12 @@ class AbstractDevice(object, metaclass=abc.ABCMeta):
             for (parsed_name, parsed_config) in record.parsed.items():
                 record_point = record.data[parsed_config['point']]
                 try:
-                    parsed_point = (self.ureg.Quantity(
-                        record_point.value, self.ureg.Unit(record_point.unit)
-                    )).to(self.ureg.Unit(self.fields[parsed_name]))
+                    (value, unit) = self.converter.convert(
+                        record_point.value, record_point.unit,
+                        self.fields[parsed_name]
+                    )
                     record_parsed[parsed_name] = RecordPoint(
-                        value=parsed_point.magnitude,
-                        unit=str(parsed_point.units)
+                        value=value, unit=unit
                     )
                 except KeyError as exc:
                     const.log.warning((
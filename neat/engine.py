@@ -4,15 +4,26 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import os
+import asyncio
+import functools
+import threading
+import multiprocessing.util
 from typing import Dict, List
 
-from . import const
+from . import const, device
 from .models.record import Record
-from .scheduler._common import AbstractScheduler
-from .requester._common import AbstractRequester
+from .scheduler._common import (
+    AbstractScheduler, AbstractAsyncScheduler, spread_phases
+)
+from .requester._common import (
+    AbstractRequester, AbstractAsyncRequester, LatencyStats
+)
 from .translator._common import AbstractTranslator
 from .pipe._common import AbstractPipe
+from .pipe.dispatcher import PipeDispatcher
 from .translator import get_translator
+from .translator.pool import TranslatorPool
 
 import blinker
 
@@ -24,10 +35,16 @@ class Engine(object):
     on_start = blinker.Signal()
     on_stop = blinker.Signal()
 
+    # NOTE: seconds stop waits for each terminated scheduler to finish
+    stop_timeout = 30.0
+
     def __init__(
         self,
         register: Dict[AbstractScheduler, AbstractRequester]={},
         pipes: List[AbstractPipe]=[],
+        phase_spread: bool=False, phase_jitter: float=0.0,
+        translate_workers: int=0, pipe_queue: int=0,
+        pipe_policy: str='block', pipe_spill_dir: str=None,
     ):
         """ Initializes an instance of the engine.
 
@@ -35,11 +52,54 @@ class Engine(object):
         :type register: dict
         :param pipes: A list of pipes that should be used for records
         :type pipes: list
+        :param phase_spread: Spreads first requests of hosts over the delay
+            (False)
+        :type phase_spread: bool
+        :param phase_jitter: The bounded jitter of spread phases (0.0 - 1.0)
+        :type phase_jitter: float
+        :param translate_workers: Translator worker processes, 0 for inline
+        :type translate_workers: int
+        :param pipe_queue: Records queued per pipe writer thread, 0 for inline
+        :type pipe_queue: int
+        :param pipe_policy: The policy of full pipe queues ('block')
+        :type pipe_policy: str
+        :param pipe_spill_dir: The directory pipe queues spill to (temp dir)
+        :type pipe_spill_dir: str
+
+        .. note:: ``translate_workers`` requires schedulers driven by the
+            engine's process (such as ``SharedDelayScheduler``), forked
+            schedulers are daemonic and cannot start translator processes
         """
 
+        if translate_workers > 0:
+            for scheduler in register.keys():
+                if getattr(scheduler, 'forks', False):
+                    raise ValueError((
+                        "translate_workers cannot be used with scheduler "
+                        "'{scheduler}' signaling from a forked process"
+                    ).format(scheduler=scheduler))
         self._register = register
         self._pipes = pipes
         self._translators = {}
+        (self._phase_spread, self._phase_jitter) = (phase_spread, phase_jitter)
+        self._translator_pool = (
+            TranslatorPool(translate_workers)
+            if translate_workers > 0 else
+            None
+        )
+        if pipe_policy not in PipeDispatcher.policies:
+            raise ValueError((
+                "unknown pipe policy '{pipe_policy}', expected one of "
+                "{policies}"
+            ).format(
+                pipe_policy=pipe_policy, policies=PipeDispatcher.policies
+            ))
+        (self._pipe_queue, self._pipe_policy, self._pipe_spill_dir) = (
+            pipe_queue, pipe_policy, pipe_spill_dir
+        )
+        (self._dispatchers, self._pid) = ({}, os.getpid())
+        # NOTE: tracks the scheduler whose tick is handled by each thread
+        self._context = threading.local()
 
     @property
     def register(self) -> Dict[AbstractScheduler, AbstractRequester]:
@@ -62,6 +122,62 @@ class Engine(object):
 
         return self._pipes
 
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the engine's components.
+
+        .. note:: Scheduler metrics are keyed by their requester, unit
+            conversion metrics only cover conversions of this process
+        """
+
+        return {
+            'schedulers': {
+                repr(requester): scheduler.metrics
+                for (scheduler, requester) in self.register.items()
+            },
+            'requesters': {
+                repr(requester): requester.metrics
+                for requester in self.register.values()
+            },
+            'translators': {
+                name: translator.metrics
+                for (name, translator) in self.translators.items()
+            },
+            'translation': (
+                self._translator_pool.metrics
+                if self._translator_pool is not None else
+                {}
+            ),
+            # NOTE: the queue of pipes with a dispatcher and the buffer of
+            # batching pipes are reported as well
+            'pipes': {
+                repr(piper): self._pipe_metrics(piper)
+                for piper in self.pipes
+            },
+            # NOTE: only devices which have converted units are reported
+            'units': {
+                device_type.name: device_type.value[1].converter.metrics
+                for device_type in device.DeviceType
+                if hasattr(device_type.value[1], '_converter')
+            },
+        }
+
+    def _pipe_metrics(self, piper: AbstractPipe) -> dict:
+        """ Builds the metrics of a pipe, its queue and its buffer.
+
+        :param piper: The pipe to build the metrics of
+        :type piper: AbstractPipe
+        :returns: The metrics of the pipe
+        :rtype: dict
+        """
+
+        metrics = dict(piper.metrics)
+        if piper in self._dispatchers:
+            metrics['queue'] = self._dispatchers[piper].metrics
+        if piper.batch_size > 1:
+            metrics['buffer'] = piper.buffer_metrics
+        return metrics
+
     def on_scheduled(self, scheduler: AbstractScheduler) -> None:
         """ Event handler for when schedulers trigger their mapped requesters.
 
@@ -74,7 +190,13 @@ class Engine(object):
         const.log.debug((
             'scheduled request from scheduler `{scheduler}` ...'
         ).format(scheduler=scheduler))
-        self.register[scheduler].request()
+        if self._pid != os.getpid():
+            self._forked()
+        self._context.scheduler = scheduler
+        try:
+            self.register[scheduler].request(timeout=scheduler.budget)
+        finally:
+            self._context.scheduler = None
 
     def on_data(
         self,
@@ -95,12 +217,88 @@ class Engine(object):
         const.log.debug((
             'recieved data from requester `{requester}` ...'
         ).format(requester=requester, data=data))
+        if self._translator_pool is not None:
+            self._translator_pool.submit(
+                requester, requester.__class__.__name__, data, meta,
+                functools.partial(
+                    self._deliver,
+                    getattr(self._context, 'scheduler', None)
+                )
+            )
+        else:
+            self._translator(requester).translate(data, meta=meta)
+
+    def _deliver(
+        self, scheduler: AbstractScheduler, records: List[Record]
+    ) -> None:
+        """ Handles records translated by the translator pool.
+
+        :param scheduler: The scheduler whose tick requested the data
+        :type scheduler: AbstractScheduler
+        :param records: The translated records
+        :type records: list
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self._context.scheduler = scheduler
+        try:
+            for record in records:
+                self.on_record(record)
+        finally:
+            self._context.scheduler = None
+
+    def _translator(self, requester: AbstractRequester) -> AbstractTranslator:
+        """ Retrieves the translator of a requester, creating it if needed.
+
+        :param requester: The requester to retrieve the translator for
+        :type requester: AbstractRequester
+        :returns: The translator of the requester
+        :rtype: AbstractTranslator
+        """
+
         requester_name = requester.__class__.__name__
         if requester_name not in self.translators:
-            translator = get_translator(requester_name)()
+            translator_class = get_translator(requester_name)
+            if translator_class is None:
+                raise ValueError((
+                    "no translator supports requester '{requester_name}'"
+                ).format(requester_name=requester_name))
+            translator = translator_class()
             translator.signal.connect(self.on_record)
-            self.translators[requester_name] = get_translator(requester_name)()
-        self.translators[requester_name].translate(data, meta=meta)
+            self.translators[requester_name] = translator
+        return self.translators[requester_name]
+
+    def _setup_translators(self) -> None:
+        """ Creates the translators of all registered requesters.
+
+        .. note:: Done before schedulers are started so forked schedulers
+            share the unit registry and tables instead of building their own
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for requester in self.register.values():
+            try:
+                self._translator(requester)
+            except ValueError as exc:
+                const.log.warning((
+                    'no translator for requester `{requester}`, {exc} ...'
+                ).format(requester=requester, exc=exc))
+
+    def _observe(self, record: Record) -> None:
+        """ Feeds a record back to the scheduler whose tick produced it.
+
+        :param record: The translated record
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        scheduler = getattr(self._context, 'scheduler', None)
+        if scheduler is not None:
+            scheduler.observe(record)
 
     def on_record(self, record: Record) -> None:
         """ Event handler for when translators finish translation of some data.
@@ -116,11 +314,29 @@ class Engine(object):
                 'invalid record recieved `{record}` ...'
             ).format(record=record))
         else:
+            self._observe(record)
             const.log.debug((
                 'adding record `{record}` to pipes ...'
             ).format(record=record))
             for piper in self.pipes:
-                piper.accept(record)
+                self._dispatch(piper, record)
+
+    def _dispatch(self, piper: AbstractPipe, record: Record) -> None:
+        """ Hands a record to a pipe, through its dispatcher if it has one.
+
+        :param piper: The pipe to hand the record to
+        :type piper: AbstractPipe
+        :param record: The record to hand to the pipe
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        dispatcher = self._dispatchers.get(piper)
+        if dispatcher is not None:
+            dispatcher.put(record)
+        else:
+            piper.accept(record)
 
     def on_commit(self, piper: AbstractPipe, record: Record) -> None:
         """ Event handler for when pipes finish writing out a record.
@@ -137,16 +353,14 @@ class Engine(object):
             'pipe `{piper}` successfully handled record `{record}` ...'
         ).format(piper=piper, record=record))
 
-    def start(self) -> None:
-        """ Starts the engine.
+    def _setup_pipes(self) -> None:
+        """ Validates the pipes and connects to their commit signals.
 
         :returns: Does not return
         :rtype: None
         """
 
-        self.on_start.send(self)
-
-        for piper in self.pipes:
+        for piper in list(self.pipes):
             if not piper.validate():
                 const.log.warning((
                     'pipe `{piper}` did not pass validation, '
@@ -158,6 +372,143 @@ class Engine(object):
                     'utilizing pipe `{piper}` ...'
                 ).format(piper=piper))
                 piper.signal.connect(self.on_commit)
+                if self._pipe_queue > 0 and piper not in self._dispatchers:
+                    self._start_dispatcher(piper)
+
+    def _start_dispatcher(self, piper: AbstractPipe) -> None:
+        """ Starts the writer thread dispatching records to a pipe.
+
+        :param piper: The pipe to dispatch records to
+        :type piper: AbstractPipe
+        :returns: Does not return
+        :rtype: None
+        """
+
+        dispatcher = PipeDispatcher(
+            piper, maxsize=self._pipe_queue, policy=self._pipe_policy,
+            spill_dir=self._pipe_spill_dir
+        )
+        dispatcher.start()
+        self._dispatchers[piper] = dispatcher
+
+    def _forked(self) -> None:
+        """ Sets up the pipes of a forked scheduler process.
+
+        .. note:: The writer threads of the parent do not exist in forked
+            processes, each process starts its own and writes out its
+            queued records once its scheduler is terminated
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        (self._dispatchers, self._pid) = ({}, os.getpid())
+        if self._pipe_queue > 0:
+            for piper in self.pipes:
+                self._start_dispatcher(piper)
+        multiprocessing.util.Finalize(None, self._close_pipes, exitpriority=10)
+
+    def _close_pipes(self) -> None:
+        """ Writes out queued and buffered records, then closes the pipes.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for (piper, dispatcher) in list(self._dispatchers.items()):
+            const.log.info((
+                'writing out `{metrics[depth]}` queued and '
+                '`{metrics[spilled]}` spilled records of `{piper}` ...'
+            ).format(piper=piper, metrics=dispatcher.metrics))
+            dispatcher.close()
+            del self._dispatchers[piper]
+        for piper in self.pipes:
+            try:
+                piper.flush()
+            except Exception as exc:
+                const.log.exception((
+                    'failed writing out buffered records of `{piper}`, '
+                    '{exc} ...'
+                ).format(piper=piper, exc=exc))
+            try:
+                piper.close()
+            except Exception as exc:
+                const.log.exception((
+                    'failed closing `{piper}`, {exc} ...'
+                ).format(piper=piper, exc=exc))
+
+    def _spread_phases(self) -> None:
+        """ Spreads the first requests of schedulers sharing the same host.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if not self._phase_spread:
+            return
+        hosts = {}
+        for (scheduler, requester) in self.register.items():
+            if requester.host is not None:
+                hosts.setdefault(requester.host, []).append(scheduler)
+        for (host, schedulers) in hosts.items():
+            spread_phases(schedulers, jitter=self._phase_jitter)
+            const.log.info((
+                'spread `{count}` schedulers of host `{host[0]}:{host[1]}` '
+                'across phases {phases} ...'
+            ).format(
+                host=host, count=len(schedulers),
+                phases=[round(_.phase, 3) for _ in schedulers]
+            ))
+
+    def _log_latency(self, baseline: bool=False) -> None:
+        """ Logs the observed response latency of every requested host.
+
+        .. note:: Latency is kept in shared memory, requests made by
+            forked schedulers are included
+
+        :param baseline: Marks the current latency as the hosts' baseline
+        :type baseline: bool
+        :returns: Does not return
+        :rtype: None
+        """
+
+        hosts = {}
+        for requester in self.register.values():
+            latency = getattr(requester, 'latency', None)
+            if requester.host is not None and \
+                    isinstance(latency, LatencyStats):
+                hosts[requester.host] = latency
+        for (host, latency) in hosts.items():
+            if baseline:
+                const.log.info((
+                    'host `{host[0]}:{host[1]}` baseline latency '
+                    'mean `{latency[mean]:.3f}`, p95 `{latency[p95]:.3f}`, '
+                    'max `{latency[max]:.3f}` seconds over `{latency[count]}` '
+                    'requests with `{latency[timeouts]}` timeouts ...'
+                ).format(host=host, latency=latency.mark()))
+                continue
+            latency = latency.to_dict()
+            const.log.info((
+                'host `{host[0]}:{host[1]}` observed latency '
+                'mean `{latency[mean]:.3f}`, p95 `{latency[p95]:.3f}`, '
+                'max `{latency[max]:.3f}` seconds over `{latency[count]}` '
+                'requests with `{latency[timeouts]}` timeouts against the '
+                'baseline mean `{latency[baseline][mean]:.3f}`, p95 '
+                '`{latency[baseline][p95]:.3f}` seconds ...'
+            ).format(host=host, latency=latency))
+
+    def start(self) -> None:
+        """ Starts the engine.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self.on_start.send(self)
+        self._setup_pipes()
+        self._setup_translators()
+        self._log_latency(baseline=True)
+        self._spread_phases()
 
         for (scheduler, requester) in self.register.items():
             scheduler.signal.connect(self.on_scheduled)
@@ -168,6 +519,16 @@ class Engine(object):
                 'with pid `{scheduler.pid}` for `{requester}` ...'
             ).format(scheduler=scheduler, requester=requester))
 
+    def join(self) -> None:
+        """ Blocks until all of the engine's schedulers have stopped.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for scheduler in self.register.keys():
+            scheduler.join()
+
     def stop(self) -> None:
         """ Stops the engine.
 
@@ -186,4 +547,233 @@ class Engine(object):
                 '`{scheduler.pid}` is terminated ...'
             ).format(scheduler=scheduler))
             scheduler.terminate()
+        # NOTE: forked schedulers write out their pipes before exiting
+        for scheduler in self.register.keys():
+            scheduler.join(self.stop_timeout)
+        if self._translator_pool is not None:
+            self._translator_pool.shutdown()
+        self._close_pipes()
+        self._log_latency()
+        self.on_stop.send(self)
+
+
+class AsyncEngine(Engine):
+    """ Provides communication between the subpackages on an asyncio loop.
+
+    .. note:: Requires async schedulers mapped to async requesters
+    """
+
+    def __init__(
+        self,
+        register: Dict[AbstractAsyncScheduler, AbstractAsyncRequester]={},
+        pipes: List[AbstractPipe]=[],
+        phase_spread: bool=False, phase_jitter: float=0.0,
+        translate_workers: int=0, pipe_queue: int=0,
+        pipe_policy: str='block', pipe_spill_dir: str=None,
+    ):
+        """ Initializes an instance of the async engine.
+
+        :param register: A dictionary of async schedulers mapped to requesters
+        :type register: dict
+        :param pipes: A list of pipes that should be used for records
+        :type pipes: list
+        :param phase_spread: Spreads first requests of hosts over the delay
+            (False)
+        :type phase_spread: bool
+        :param phase_jitter: The bounded jitter of spread phases (0.0 - 1.0)
+        :type phase_jitter: float
+        :param translate_workers: Translator worker processes, 0 for inline
+        :type translate_workers: int
+        :param pipe_queue: Records queued per pipe writer thread, 0 for inline
+        :type pipe_queue: int
+        :param pipe_policy: The policy of full pipe queues ('block')
+        :type pipe_policy: str
+        :param pipe_spill_dir: The directory pipe queues spill to (temp dir)
+        :type pipe_spill_dir: str
+        """
+
+        super().__init__(
+            register=register, pipes=pipes,
+            phase_spread=phase_spread, phase_jitter=phase_jitter,
+            translate_workers=translate_workers, pipe_queue=pipe_queue,
+            pipe_policy=pipe_policy, pipe_spill_dir=pipe_spill_dir
+        )
+        (self._loop, self._thread) = (None, None)
+        self._tasks = set()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """ The event loop the engine is running on.
+        """
+
+        return self._loop
+
+    def _spawn(self, coroutine) -> asyncio.Future:
+        """ Schedules a coroutine on the engine's loop, keeping a reference.
+
+        :param coroutine: The coroutine to schedule
+        :type coroutine: coroutine
+        :returns: The scheduled task
+        :rtype: asyncio.Future
+        """
+
+        task = asyncio.ensure_future(coroutine, loop=self._loop)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def on_scheduled(self, scheduler: AbstractAsyncScheduler) -> None:
+        """ Event handler for when schedulers trigger their mapped requesters.
+
+        :param scheduler: The scheduler that needs to run its requester
+        :type scheduler: AbstractAsyncScheduler
+        :returns: Does not return
+        :rtype: None
+        """
+
+        const.log.debug((
+            'scheduled request from scheduler `{scheduler}` ...'
+        ).format(scheduler=scheduler))
+        requester = self.register[scheduler]
+        response = await requester.request(timeout=scheduler.budget)
+        if response is not None:
+            (data, meta) = response
+            self._context.scheduler = scheduler
+            try:
+                self.on_data(requester, data, meta)
+            finally:
+                self._context.scheduler = None
+
+    def _deliver(
+        self, scheduler: AbstractAsyncScheduler, records: List[Record]
+    ) -> None:
+        """ Handles records translated by the translator pool.
+
+        .. note:: Records are handed over to the engine's loop
+
+        :param scheduler: The scheduler whose tick requested the data
+        :type scheduler: AbstractAsyncScheduler
+        :param records: The translated records
+        :type records: list
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(
+                super()._deliver, scheduler, records
+            )
+
+    def _dispatch(self, piper: AbstractPipe, record: Record) -> None:
+        """ Hands a record to a pipe, through its dispatcher if it has one.
+
+        .. note:: Pipes without a dispatcher are awaited as tasks, the
+            ``block`` policy of full queues blocks the engine's loop
+
+        :param piper: The pipe to hand the record to
+        :type piper: AbstractPipe
+        :param record: The record to hand to the pipe
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        dispatcher = self._dispatchers.get(piper)
+        if dispatcher is not None:
+            dispatcher.put(record)
+        else:
+            self._spawn(piper.accept_async(record))
+
+    def _run(self) -> None:
+        """ Runs the engine's event loop until stopped.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        asyncio.set_event_loop(self._loop)
+        for (scheduler, requester) in self.register.items():
+            if not isinstance(scheduler, AbstractAsyncScheduler) or \
+                    not isinstance(requester, AbstractAsyncRequester):
+                const.log.error((
+                    'cannot drive scheduler `{scheduler}` for `{requester}` '
+                    'on `{self}`, both must be async ...'
+                ).format(self=self, scheduler=scheduler, requester=requester))
+                continue
+            const.log.info((
+                'starting async scheduler `{scheduler}` '
+                'for `{requester}` ...'
+            ).format(scheduler=scheduler, requester=requester))
+            self._spawn(scheduler.run(self.on_scheduled))
+        self._loop.run_forever()
+
+    async def _shutdown(self) -> None:
+        """ Cancels all running tasks and closes requester sessions.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for requester_class in set(
+            requester.__class__ for requester in self.register.values()
+        ):
+            if hasattr(requester_class, 'close'):
+                await requester_class.close()
+        self._loop.stop()
+
+    def start(self) -> None:
+        """ Starts the engine's event loop in a daemon thread.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self.on_start.send(self)
+        self._setup_pipes()
+        self._setup_translators()
+        self._log_latency(baseline=True)
+        self._spread_phases()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        const.log.info((
+            'starting engine event loop thread as daemon ...'
+        ).format(self=self))
+        self._thread.start()
+
+    def join(self) -> None:
+        """ Blocks until the engine's event loop has stopped.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._thread is not None:
+            # NOTE: joining in small increments allows KeyboardInterrupt
+            while self._thread.is_alive():
+                self._thread.join(1.0)
+
+    def stop(self) -> None:
+        """ Stops the engine.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        const.log.info((
+            'stopping engine event loop with `{tasks}` running tasks ...'
+        ).format(tasks=len(self._tasks)))
+        if self._translator_pool is not None:
+            self._translator_pool.shutdown()
+        if self._thread is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+            self._thread.join()
+            self._loop.close()
+            (self._loop, self._thread) = (None, None)
+        self._close_pipes()
+        self._log_latency()
         self.on_stop.send(self)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import json
+import time
+import fnmatch
+import concurrent.futures
+from typing import Tuple, List, Iterator
+
+from . import const
+from .models import Record, RecordBatch
+from .pipe._common import AbstractPipe
+
+import blinker
+
+
+_translators = {}
+
+
+def _import_file(path: str, meta: dict) -> Tuple[List[Record], int]:
+    """ Translates and validates an archived payload within a worker process.
+
+    :param path: The path of the archived payload
+    :type path: str
+    :param meta: The meta of the payload's device
+    :type meta: dict
+    :returns: A tuple of the valid records and the count of invalid records
+    :rtype: tuple
+    """
+
+    from .translator import ObviusTranslator, ObviusLogTranslator
+    from .translator.obvius import decode_xml
+
+    extension = os.path.splitext(path)[-1].lower()
+    translator_class = (
+        ObviusTranslator if extension == '.xml' else ObviusLogTranslator
+    )
+    if translator_class not in _translators:
+        translator = translator_class()
+        # NOTE: an instance signal keeps records away from receivers which
+        # the worker inherited from its parent when forked
+        translator.signal = blinker.Signal()
+        _translators[translator_class] = translator
+    translator = _translators[translator_class]
+    if translator_class is ObviusTranslator:
+        # NOTE: archived payloads are decoded as their prolog declares
+        with open(path, 'rb') as fp:
+            records = list(translator.records(
+                decode_xml(fp.read()), meta=meta, device_time=True
+            ))
+    else:
+        with open(path, 'r', encoding='utf-8', errors='replace') as fp:
+            records = list(translator.records(fp, meta=meta))
+    try:
+        # NOTE: a file holds the records of a single device, the batch
+        # checks its device fields and point columns once for all records
+        checks = RecordBatch(records).validate()
+    except ValueError:
+        # NOTE: raised when a point changes to an inconvertible unit
+        checks = Record.validate_many(records)
+    # NOTE: records rejected by the batch are validated on their own to log
+    # the reason they were rejected
+    valid = [
+        record
+        for (record, is_valid) in zip(records, checks)
+        if is_valid or record.validate()
+    ]
+    return (valid, (len(records) - len(valid)))
+
+
+class BulkImporter(object):
+    """ An offline importer of archived Obvius payloads.
+
+    Walks a directory tree of archived xml responses and csv interval logs,
+    translating and validating files in parallel worker processes and
+    writing the records to the pipes in batches through
+    :meth:`~neat.pipe._common.AbstractPipe.accept_many`.
+    The records of each file are validated at once as a
+    :class:`~neat.models.batch.RecordBatch`.
+    Each file is matched to its device's meta by the first device whose
+    ``pattern`` (relative to the imported directory) matches.
+    For example:
+
+    .. code-block:: python
+
+        importer = BulkImporter(pipes, [
+            {'pattern': 'wind/*', 'name': 'wind.1', 'type': 'WIND'},
+        ], checkpoint='import.json')
+        importer.run('/archive/obvius')
+
+    .. note:: Records of xml payloads are stamped with the device's time,
+        progress is saved to the checkpoint after every written batch so an
+        interrupted import resumes with the files not yet written
+    """
+
+    extensions = ('.xml', '.csv', '.log',)
+
+    def __init__(
+        self, pipes: List[AbstractPipe], devices: List[dict],
+        workers: int=None, batch_size: int=500, checkpoint: str=None,
+        report_delay: float=10.0
+    ):
+        """ Initializes the bulk importer.
+
+        :param pipes: The pipes to write the imported records to
+        :type pipes: list
+        :param devices: The meta of each device, including its ``pattern``
+        :type devices: list
+        :param workers: The worker processes to parse with (cpu count)
+        :type workers: int
+        :param batch_size: The records written to the pipes at once (500)
+        :type batch_size: int
+        :param checkpoint: The path of the progress checkpoint (None)
+        :type checkpoint: str
+        :param report_delay: Seconds in between progress reports (10.0)
+        :type report_delay: float
+        """
+
+        self.pipes = list(pipes)
+        self.devices = []
+        for device in devices:
+            device = dict(device)
+            self.devices.append((device.pop('pattern'), device))
+        self.workers = int(workers if workers else (os.cpu_count() or 1))
+        self.batch_size = max(int(batch_size), 1)
+        self.checkpoint = (
+            os.path.abspath(os.path.expanduser(checkpoint))
+            if checkpoint else
+            None
+        )
+        self.report_delay = report_delay
+
+    def __repr__(self):
+        """ A string representation of the bulk importer.
+
+        :returns: A string representation of the bulk importer
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} workers={self.workers}>'
+        ).format(self=self)
+
+    def meta(self, relpath: str) -> dict:
+        """ Retrieves the device meta of an archived file.
+
+        :param relpath: The path of the file relative to the imported directory
+        :type relpath: str
+        :returns: The meta of the file's device, None if no device matches
+        :rtype: dict
+        """
+
+        for (pattern, meta) in self.devices:
+            if fnmatch.fnmatch(relpath, pattern):
+                return meta
+
+    def walk(self, directory: str) -> Iterator[Tuple[str, str]]:
+        """ Walks a directory tree for archived files in a stable order.
+
+        :param directory: The directory to walk
+        :type directory: str
+        :returns: A generator of the path and relative path of each file
+        :rtype: Iterator[tuple]
+        """
+
+        for (root, dirnames, filenames) in os.walk(directory):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if os.path.splitext(filename)[-1].lower() in self.extensions:
+                    path = os.path.join(root, filename)
+                    yield (path, os.path.relpath(path, directory))
+
+    def load_checkpoint(self) -> dict:
+        """ Loads the progress of previous runs from the checkpoint.
+
+        :returns: The relative paths of written files mapped to their stamps
+        :rtype: dict
+        """
+
+        if self.checkpoint is None or not os.path.isfile(self.checkpoint):
+            return {}
+        try:
+            with open(self.checkpoint, 'r') as fp:
+                return json.load(fp).get('files', {})
+        except (ValueError, OSError) as exc:
+            const.log.warning((
+                'could not load import checkpoint `{self.checkpoint}`, '
+                'starting over, {exc} ...'
+            ).format(self=self, exc=exc))
+        return {}
+
+    def save_checkpoint(self, files: dict, stats: dict) -> None:
+        """ Atomically saves the progress of the import to the checkpoint.
+
+        :param files: The relative paths of written files mapped to stamps
+        :type files: dict
+        :param stats: The current stats of the import
+        :type stats: dict
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self.checkpoint is None:
+            return
+        temporary = '{self.checkpoint}.tmp'.format(self=self)
+        with open(temporary, 'w') as fp:
+            json.dump({'files': files, 'stats': stats}, fp)
+        os.replace(temporary, self.checkpoint)
+
+    @staticmethod
+    def _stamp(path: str) -> list:
+        """ Builds the stamp identifying the version of a file.
+
+        :param path: The path of the file
+        :type path: str
+        :returns: The modification time and size of the file
+        :rtype: list
+        """
+
+        stat = os.stat(path)
+        return [stat.st_mtime, stat.st_size]
+
+    def run(self, directory: str) -> dict:
+        """ Imports the archived files of a directory tree.
+
+        :param directory: The directory to import
+        :type directory: str
+        :returns: The file and record counts and throughput of the import
+        :rtype: dict
+        """
+
+        directory = os.path.abspath(os.path.expanduser(directory))
+        for piper in list(self.pipes):
+            if not piper.validate():
+                const.log.warning((
+                    'pipe `{piper}` did not pass validation, '
+                    'removing from pipes ...'
+                ).format(piper=piper))
+                self.pipes.remove(piper)
+
+        done = self.load_checkpoint()
+        stats = {
+            'files': 0, 'skipped': 0, 'resumed': 0, 'failed': 0,
+            'records': 0, 'invalid': 0, 'batches': 0,
+        }
+        (batch, pending) = ([], {})
+        started = last_report = time.perf_counter()
+
+        def flush():
+            for index in range(0, len(batch), self.batch_size):
+                records = batch[index:(index + self.batch_size)]
+                for piper in self.pipes:
+                    piper.accept_many(records)
+                stats['records'] += len(records)
+                stats['batches'] += 1
+            del batch[:]
+            done.update(pending)
+            pending.clear()
+            self.save_checkpoint(done, stats)
+
+        def collect(future, relpath, stamp):
+            try:
+                (records, invalid) = future.result()
+            except Exception as exc:
+                stats['failed'] += 1
+                const.log.error((
+                    'could not import `{relpath}`, {exc} ...'
+                ).format(relpath=relpath, exc=exc))
+                return
+            stats['files'] += 1
+            stats['invalid'] += invalid
+            batch.extend(records)
+            pending[relpath] = stamp
+            if len(batch) >= self.batch_size:
+                flush()
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers
+        ) as executor:
+            # NOTE: the files in flight are bounded so huge trees are not
+            # loaded into memory at once, results are collected in order
+            in_flight = []
+            for (path, relpath) in self.walk(directory):
+                meta = self.meta(relpath)
+                if meta is None:
+                    stats['skipped'] += 1
+                    continue
+                stamp = self._stamp(path)
+                if done.get(relpath) == stamp:
+                    stats['resumed'] += 1
+                    continue
+                in_flight.append((
+                    executor.submit(_import_file, path, meta), relpath, stamp
+                ))
+                while len(in_flight) >= (self.workers * 4) or (
+                    len(in_flight) > 0 and in_flight[0][0].done()
+                ):
+                    collect(*in_flight.pop(0))
+                if (time.perf_counter() - last_report) >= self.report_delay:
+                    last_report = time.perf_counter()
+                    self._report(stats, (last_report - started))
+            for entry in in_flight:
+                collect(*entry)
+        flush()
+
+        stats['seconds'] = (time.perf_counter() - started)
+        stats['records_per_second'] = (
+            (stats['records'] / stats['seconds'])
+            if stats['seconds'] > 0 else
+            0.0
+        )
+        self._report(stats, stats['seconds'])
+        return stats
+
+    def _report(self, stats: dict, seconds: float) -> None:
+        """ Logs the progress of the import.
+
+        :param stats: The current stats of the import
+        :type stats: dict
+        :param seconds: The seconds since the import started
+        :type seconds: float
+        :returns: Does not return
+        :rtype: None
+        """
+
+        const.log.info((
+            'imported `{stats[records]}` records from `{stats[files]}` files '
+            '(`{rate:.1f}` records/sec, `{stats[failed]}` failed, '
+            '`{stats[resumed]}` resumed) ...'
+        ).format(
+            stats=stats,
+            rate=((stats['records'] / seconds) if seconds > 0 else 0.0)
+        ))
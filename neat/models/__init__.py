@@ -6,3 +6,4 @@
 
 from ._common import *
 from .record import Record, RecordPoint
+from .batch import RecordBatch
@@ -11,6 +11,8 @@ class AbstractModel(object, metaclass=abc.ABCMeta):
     """ The base class for all valid models.
     """
 
+    __slots__ = ()
+
     @abc.abstractmethod
     def validate(self) -> bool:
         """ Self validates the model.
@@ -0,0 +1,592 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import re
+import math
+import array
+import bisect
+import numbers
+import collections
+from typing import Tuple, List, Dict, Iterable, Hashable
+
+from .. import const
+from ..units import UnitConverter
+from .record import Record, RecordPoint
+
+import pint
+
+
+class _Column(object):
+    """ A column of point values in a record batch.
+    """
+
+    __slots__ = ('unit', 'values', 'present',)
+
+    def __init__(self, unit: str, values, present):
+        """ Initializes the column.
+
+        :param unit: The pint unit expression of every value in the column
+        :type unit: str
+        :param values: The values of the column, NaN if missing or None
+        :type values: array.array
+        :param present: The presence of each value (missing, value or None)
+        :type present: array.array
+        """
+
+        (self.unit, self.values, self.present) = (unit, values, present)
+
+
+class RecordBatch(object):
+    """ A columnar batch of records.
+
+    Timestamps, ages and point values are stored in :mod:`array` backed
+    columns, device fields are stored once per distinct device.
+    Data points are keyed by ``('data', number, name)`` and parsed points by
+    ``('parsed', name)``, every column keeps a single unit, which values of
+    appended records are converted to.
+
+    Slices (including those of :meth:`between`) are read-only views sharing
+    the columns of their batch without copying, :meth:`by_device` copies the
+    batch once in device order and returns views of the copy.
+    The :class:`~neat.importer.BulkImporter` validates each archived file's
+    records as a batch.
+
+    .. note:: Not a subclass of :class:`neat.models._common.AbstractModel`,
+        point ``number`` fields are not kept (the data key is)
+
+    .. warning:: A batch cannot be appended to while slices of it are alive
+    """
+
+    (MISSING, VALUE, NULL) = (0, 1, 2)
+    _data_key_expr = re.compile(r'^[0-9]+$')
+    _parsed_key_expr = re.compile(r'^[a-z_-]+$')
+
+    def __init__(
+        self, records: Iterable[Record]=None, converter: UnitConverter=None
+    ):
+        """ Initializes the record batch.
+
+        :param records: Any records to preliminarily append (None)
+        :type records: Iterable[Record]
+        :param converter: The converter for mismatching units (shared)
+        :type converter: UnitConverter
+        """
+
+        (self._devices, self._device_keys) = ([], {})
+        self._device_index = array.array('L')
+        self._timestamps = array.array('d')
+        self._ages = array.array('d')
+        self._columns = collections.OrderedDict()
+        (self._length, self._view) = (0, False)
+        self._converter = converter
+        if records:
+            self.extend(records)
+
+    def __repr__(self):
+        """ A string representation of the record batch.
+
+        :returns: A string representation of the record batch
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} records={self._length} '
+            'devices={devices} columns={columns}>'
+        ).format(
+            self=self, devices=len(self._devices), columns=len(self._columns)
+        )
+
+    def __len__(self):
+        """ The number of records in the batch.
+
+        :returns: The number of records in the batch
+        :rtype: int
+        """
+
+        return self._length
+
+    def __getitem__(self, index: slice):
+        """ Slices the batch without copying.
+
+        :param index: The contiguous slice of records
+        :type index: slice
+        :returns: A read-only view of the sliced records
+        :rtype: RecordBatch
+        """
+
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError((
+                "record batches only support contiguous slices, got '{index}'"
+            ).format(index=index))
+        (start, stop, _) = index.indices(self._length)
+        return self.slice(start, max(start, stop))
+
+    @property
+    def converter(self) -> UnitConverter:
+        """ The converter of mismatching units.
+        """
+
+        if self._converter is None:
+            self._converter = UnitConverter()
+        return self._converter
+
+    @property
+    def columns(self) -> List[Hashable]:
+        """ The keys of the batch's point columns.
+        """
+
+        return list(self._columns.keys())
+
+    @property
+    def timestamps(self) -> memoryview:
+        """ A view of the timestamps of the batch's records.
+        """
+
+        return memoryview(self._timestamps)
+
+    @property
+    def names(self) -> List[str]:
+        """ The device names of the batch's records.
+        """
+
+        return [self._devices[index][0] for index in self._device_index]
+
+    def unit(self, key: Hashable) -> str:
+        """ The unit of a point column.
+
+        :param key: The key of the column
+        :type key: Hashable
+        :returns: The pint unit expression of the column
+        :rtype: str
+        """
+
+        return self._columns[key].unit
+
+    def values(self, key: Hashable) -> memoryview:
+        """ A view of the values of a point column.
+
+        .. note:: Missing and None values are NaN, see :meth:`present`
+
+        :param key: The key of the column
+        :type key: Hashable
+        :returns: The values of the column
+        :rtype: memoryview
+        """
+
+        return memoryview(self._columns[key].values)
+
+    def present(self, key: Hashable) -> memoryview:
+        """ A view of the presence of a point column's values.
+
+        :param key: The key of the column
+        :type key: Hashable
+        :returns: The ``MISSING``, ``VALUE`` or ``NULL`` state of each value
+        :rtype: memoryview
+        """
+
+        return memoryview(self._columns[key].present)
+
+    def _device(self, record: Record) -> int:
+        """ Retrieves the index of a record's device fields, adding if new.
+
+        :param record: The record whose device fields are retrieved
+        :type record: Record
+        :returns: The index of the record's device fields
+        :rtype: int
+        """
+
+        key = (
+            record.name, record.device_name, record.type,
+            record.lon, record.lat, record.ttl,
+        )
+        for index in self._device_keys.get(key, ()):
+            if self._devices[index][6] == record._meta:
+                return index
+        self._devices.append(key + (dict(record._meta),))
+        self._device_keys.setdefault(key, []).append(len(self._devices) - 1)
+        return (len(self._devices) - 1)
+
+    def _point_value(self, key: Hashable, point: RecordPoint) -> tuple:
+        """ Resolves the value of a record's point in its column's unit.
+
+        :param key: The key of the point's column
+        :type key: Hashable
+        :param point: The point to resolve
+        :type point: RecordPoint
+        :returns: A tuple of the value and its presence state
+        :rtype: tuple
+        """
+
+        if point.value is None:
+            return (math.nan, self.NULL)
+        column = self._columns.get(key)
+        if column is None or point.unit == column.unit:
+            return (point.value, self.VALUE)
+        try:
+            (function, _) = self.converter.conversion(point.unit, column.unit)
+            return (function(point.value), self.VALUE)
+        except (
+            pint.errors.DimensionalityError,
+            pint.errors.UndefinedUnitError, TypeError, AttributeError
+        ):
+            raise ValueError((
+                "cannot convert '{point.unit}' to column '{key}' in "
+                "'{column.unit}'"
+            ).format(point=point, key=key, column=column))
+
+    def append(self, record: Record) -> None:
+        """ Appends a record to the batch.
+
+        .. note:: Nothing is appended if any point cannot be converted to
+            the unit of its column
+
+        :param record: The record to append
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._view:
+            raise ValueError('record batch views are read-only')
+        points = {}
+        for (number, point) in record.data.items():
+            key = ('data', number, point.name)
+            points[key] = (point.unit, self._point_value(key, point))
+        for (name, point) in record.parsed.items():
+            key = ('parsed', name)
+            points[key] = (point.unit, self._point_value(key, point))
+        for (key, (unit, _)) in points.items():
+            if key not in self._columns:
+                self._columns[key] = _Column(
+                    unit,
+                    array.array('d', [math.nan]) * self._length,
+                    array.array('b', [self.MISSING]) * self._length
+                )
+        for (key, column) in self._columns.items():
+            (value, state) = (
+                points[key][1] if key in points else (math.nan, self.MISSING)
+            )
+            column.values.append(value)
+            column.present.append(state)
+        self._device_index.append(self._device(record))
+        self._timestamps.append(
+            math.nan if record.timestamp is None else record.timestamp
+        )
+        self._ages.append(math.nan if record.age is None else record.age)
+        self._length += 1
+
+    def extend(self, records: Iterable[Record]) -> None:
+        """ Appends many records to the batch.
+
+        :param records: The records to append
+        :type records: Iterable[Record]
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for record in records:
+            self.append(record)
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Record], converter: UnitConverter=None
+    ):
+        """ Creates a record batch from records.
+
+        :param records: The records of the batch
+        :type records: Iterable[Record]
+        :param converter: The converter for mismatching units (shared)
+        :type converter: UnitConverter
+        :returns: The created record batch
+        :rtype: RecordBatch
+        """
+
+        return cls(records, converter=converter)
+
+    def record(self, index: int) -> Record:
+        """ Builds the record at an index of the batch.
+
+        :param index: The index of the record
+        :type index: int
+        :returns: The record at the index
+        :rtype: Record
+        """
+
+        (name, device_name, device_type, lon, lat, ttl, meta) = \
+            self._devices[self._device_index[index]]
+        record = Record(**meta)
+        for (field, value) in (
+            ('name', name), ('device_name', device_name),
+            ('type', device_type), ('lon', lon), ('lat', lat), ('ttl', ttl),
+        ):
+            if value is not None:
+                setattr(record, field, value)
+        if not math.isnan(self._timestamps[index]):
+            record.timestamp = self._timestamps[index]
+        if not math.isnan(self._ages[index]):
+            record.age = self._ages[index]
+        (data, parsed) = ({}, {})
+        for (key, column) in self._columns.items():
+            state = column.present[index]
+            if state == self.MISSING:
+                continue
+            point = {
+                'value': (
+                    column.values[index] if state == self.VALUE else None
+                ),
+                'unit': column.unit,
+            }
+            if key[0] == 'data':
+                if key[2] is not None:
+                    point['name'] = key[2]
+                data[key[1]] = RecordPoint(**point)
+            else:
+                parsed[key[1]] = RecordPoint(**point)
+        (record.data, record.parsed) = (data, parsed)
+        return record
+
+    def to_records(self) -> List[Record]:
+        """ Builds the records of the batch.
+
+        :returns: The records of the batch
+        :rtype: list
+        """
+
+        return [self.record(index) for index in range(self._length)]
+
+    def slice(self, start: int, stop: int):
+        """ Slices the batch without copying.
+
+        :param start: The index of the first record of the slice
+        :type start: int
+        :param stop: The index to stop the slice before
+        :type stop: int
+        :returns: A read-only view of the sliced records
+        :rtype: RecordBatch
+        """
+
+        view = self.__class__(converter=self._converter)
+        (view._devices, view._device_keys) = (
+            self._devices, self._device_keys
+        )
+        view._device_index = memoryview(self._device_index)[start:stop]
+        view._timestamps = memoryview(self._timestamps)[start:stop]
+        view._ages = memoryview(self._ages)[start:stop]
+        for (key, column) in self._columns.items():
+            view._columns[key] = _Column(
+                column.unit,
+                memoryview(column.values)[start:stop],
+                memoryview(column.present)[start:stop]
+            )
+        (view._length, view._view) = ((stop - start), True)
+        return view
+
+    def take(self, indices: Iterable[int]):
+        """ Copies the records at the given indices into a new batch.
+
+        :param indices: The indices of the records in their new order
+        :type indices: Iterable[int]
+        :returns: A new batch of the records
+        :rtype: RecordBatch
+        """
+
+        indices = list(indices)
+        batch = self.__class__(converter=self._converter)
+        batch._devices = list(self._devices)
+        batch._device_keys = {
+            k: list(v) for (k, v) in self._device_keys.items()
+        }
+        batch._device_index = array.array(
+            'L', (self._device_index[_] for _ in indices)
+        )
+        batch._timestamps = array.array(
+            'd', (self._timestamps[_] for _ in indices)
+        )
+        batch._ages = array.array('d', (self._ages[_] for _ in indices))
+        for (key, column) in self._columns.items():
+            batch._columns[key] = _Column(
+                column.unit,
+                array.array('d', (column.values[_] for _ in indices)),
+                array.array('b', (column.present[_] for _ in indices))
+            )
+        batch._length = len(indices)
+        return batch
+
+    @property
+    def time_sorted(self) -> bool:
+        """ True if the batch's records are ordered by timestamp.
+        """
+
+        timestamps = self._timestamps
+        return all(
+            timestamps[index] <= timestamps[index + 1]
+            for index in range(self._length - 1)
+        )
+
+    def sort(self):
+        """ Copies the batch into a new batch ordered by timestamp.
+
+        :returns: A new batch ordered by timestamp
+        :rtype: RecordBatch
+        """
+
+        return self.take(sorted(
+            range(self._length), key=self._timestamps.__getitem__
+        ))
+
+    def between(self, start: float=None, end: float=None):
+        """ Slices the records in between two timestamps without copying.
+
+        :param start: The earliest timestamp to include (unbounded)
+        :type start: float
+        :param end: The timestamp to stop before (unbounded)
+        :type end: float
+        :returns: A read-only view of the records in the range
+        :rtype: RecordBatch
+        """
+
+        if not self.time_sorted:
+            raise ValueError((
+                "record batch must be ordered by timestamp, see 'sort()'"
+            ))
+        return self.slice(
+            (
+                bisect.bisect_left(self._timestamps, start)
+                if start is not None else
+                0
+            ),
+            (
+                bisect.bisect_left(self._timestamps, end)
+                if end is not None else
+                self._length
+            )
+        )
+
+    def by_device(self) -> Dict[str, 'RecordBatch']:
+        """ Groups the batch's records by device name.
+
+        The batch is copied once, ordered by device name and timestamp, each
+        device's records are then a view of the copy.
+
+        :returns: The device names mapped to views of their records
+        :rtype: dict
+        """
+
+        names = [self._devices[index][0] for index in self._device_index]
+        ordered = self.take(sorted(
+            range(self._length),
+            key=(lambda index: (
+                str(names[index]), self._timestamps[index]
+            ))
+        ))
+        (groups, start) = (collections.OrderedDict(), 0)
+        ordered_names = ordered.names
+        for index in range(1, (ordered._length + 1)):
+            if index == ordered._length or \
+                    ordered_names[index] != ordered_names[start]:
+                groups[ordered_names[start]] = ordered.slice(start, index)
+                start = index
+        return groups
+
+    def convert(self, key: Hashable, unit: str) -> Tuple[array.array, str]:
+        """ Converts every value of a point column to another unit.
+
+        .. note:: The conversion is compiled once for the whole column
+
+        :param key: The key of the column
+        :type key: Hashable
+        :param unit: The unit expression to convert to
+        :type unit: str
+        :returns: A tuple of the converted values and their unit
+        :rtype: tuple
+        """
+
+        column = self._columns[key]
+        (function, target) = self.converter.conversion(column.unit, unit)
+        return (array.array('d', map(function, column.values)), target)
+
+    @staticmethod
+    def _is_number(value) -> bool:
+        """ Checks if a value serializes as a json number.
+
+        :param value: The value to check
+        :type value: object
+        :returns: True if the value is a number, otherwise False
+        :rtype: bool
+        """
+
+        return (
+            isinstance(value, numbers.Number) and
+            not isinstance(value, bool)
+        )
+
+    def _valid_device(self, device: tuple) -> bool:
+        """ Checks if the fields of a device satisfy the record schema.
+
+        :param device: The device fields
+        :type device: tuple
+        :returns: True if the device fields are valid, otherwise False
+        :rtype: bool
+        """
+
+        (name, device_name, device_type, lon, lat, ttl, _) = device
+        return (
+            all(isinstance(_, str) for _ in (name, device_name, device_type))
+            and all(self._is_number(_) for _ in (lon, lat, ttl))
+        )
+
+    def _valid_column(self, key: Hashable, column: _Column) -> bool:
+        """ Checks if the points of a column satisfy the record schema.
+
+        :param key: The key of the column
+        :type key: Hashable
+        :param column: The column to check
+        :type column: _Column
+        :returns: True if the column's points are valid, otherwise False
+        :rtype: bool
+        """
+
+        if not isinstance(column.unit, str):
+            return False
+        if key[0] == 'data':
+            return bool(
+                self._data_key_expr.search(str(key[1])) and
+                isinstance(key[2], str)
+            )
+        return bool(
+            isinstance(key[1], str) and self._parsed_key_expr.search(key[1])
+        )
+
+    def validate(self) -> array.array:
+        """ Validates every record of the batch against the record schema.
+
+        Device fields and columns are checked once each, records are only
+        checked for their timestamps and the columns they have points in.
+
+        :returns: The validity (1 or 0) of each record
+        :rtype: array.array
+        """
+
+        devices = [self._valid_device(_) for _ in self._devices]
+        valid = array.array('b', (
+            int(
+                devices[self._device_index[index]] and
+                not math.isnan(self._timestamps[index])
+            )
+            for index in range(self._length)
+        ))
+        for (key, column) in self._columns.items():
+            if self._valid_column(key, column):
+                continue
+            const.log.debug((
+                'column `{key}` of `{self}` does not satisfy the record '
+                'schema ...'
+            ).format(self=self, key=key))
+            present = column.present
+            for index in range(self._length):
+                if present[index] != self.MISSING:
+                    valid[index] = 0
+        return valid
@@ -4,13 +4,115 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
-from typing import List, Dict
+import json
+import types
+import functools
+import itertools
+from typing import Any, List, Dict
 
 from .. import const
 from ._common import AbstractModel
+from .validator import SchemaValidator
 
 import pint
-import jsonschema
+
+
+class _Unset(object):
+    """ The marker of record point fields which were never set.
+    """
+
+    def __repr__(self):
+        """ A string representation of the marker.
+
+        :returns: A string representation of the marker
+        :rtype: str
+        """
+
+        return '<unset>'
+
+    def __reduce__(self) -> str:
+        """ Reduces the marker to the module's singleton when pickled.
+
+        .. note:: Keeps identity checks working for records sent back from
+            worker processes
+
+        :returns: The name of the module's singleton
+        :rtype: str
+        """
+
+        return '_unset'
+
+
+_unset = _Unset()
+
+# NOTE: every change of a record point or a record's mapping is stamped with
+# the next value of this counter, cached payloads built before are stale
+_changes = itertools.count(1)
+
+
+def _changing(method):
+    """ Wraps a mutating dictionary method to stamp the dictionary's change.
+
+    :param method: The mutating dictionary method
+    :type method: callable
+    :returns: The wrapped method
+    :rtype: callable
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._changed = next(_changes)
+        return result
+    return wrapper
+
+
+class _TrackedDict(dict):
+    """ A dictionary stamping the moment it was last changed.
+
+    .. note:: Holds the points and meta of records
+    """
+
+    __slots__ = ('_changed',)
+
+    def __init__(self, *args, **kwargs):
+        """ Initializes the dictionary.
+
+        :param args: The arguments of :class:`dict`
+        :type args: list
+        :param kwargs: The named arguments of :class:`dict`
+        :type kwargs: dict
+        """
+
+        super().__init__(*args, **kwargs)
+        self._changed = next(_changes)
+
+
+for _method in (
+    '__setitem__', '__delitem__', '__ior__', 'clear', 'pop', 'popitem',
+    'setdefault', 'update',
+):
+    # NOTE: ``__ior__`` is only defined by dictionaries since python 3.9
+    if hasattr(dict, _method):
+        setattr(_TrackedDict, _method, _changing(getattr(dict, _method)))
+
+
+def _freeze(value: Any) -> Any:
+    """ Copies a serialized value into a read-only value.
+
+    :param value: The serialized value to copy
+    :type value: Any
+    :returns: The value with dictionaries as read-only mappings
+    :rtype: Any
+    """
+
+    if isinstance(value, dict):
+        return types.MappingProxyType({
+            k: _freeze(v) for (k, v) in value.items()
+        })
+    elif isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 class RecordPoint(object):
@@ -19,26 +121,31 @@ class RecordPoint(object):
     .. note:: Not a subclass of :class:`neat.models._common.AbstractModel`
     """
 
+    __slots__ = ('_number', '_name', '_unit', '_value', '_meta', '_changed',)
+
     def __init__(self, **kwargs):
         """ Initializes the record point with any preliminary fields.
 
+        .. note:: Unknown fields are kept as meta, which is only allocated
+            if any are given
+
         :param kwargs: A dictionary of any preliminary fields
         :type kwargs: dict
         """
 
-        self._meta = {}
-        for (k, v) in kwargs.items():
-            if hasattr(self, k):
-                setattr(self, k, v)
-            else:
-                self._meta[k] = v
+        self._number = kwargs.pop('number', _unset)
+        self._name = kwargs.pop('name', _unset)
+        self._unit = kwargs.pop('unit', None)
+        self._value = kwargs.pop('value', None)
+        self._meta = (kwargs if len(kwargs) > 0 else None)
+        self._changed = 0
 
     @property
     def number(self) -> int:
         """ The number of the record point.
         """
 
-        if hasattr(self, '_number'):
+        if self._number is not _unset:
             return self._number
 
     @number.setter
@@ -49,14 +156,14 @@ class RecordPoint(object):
         :type number: int
         """
 
-        self._number = number
+        (self._number, self._changed) = (number, next(_changes))
 
     @property
     def name(self) -> str:
         """ The name of the record point.
         """
 
-        if hasattr(self, '_name'):
+        if self._name is not _unset:
             return self._name
 
     @name.setter
@@ -67,15 +174,14 @@ class RecordPoint(object):
         :type name: str
         """
 
-        self._name = name
+        (self._name, self._changed) = (name, next(_changes))
 
     @property
     def unit(self) -> str:
         """ The pint unit expression of the record point.
         """
 
-        if hasattr(self, '_unit'):
-            return self._unit
+        return self._unit
 
     @unit.setter
     def unit(self, unit: str) -> None:
@@ -85,15 +191,14 @@ class RecordPoint(object):
         :type unit: str
         """
 
-        self._unit = unit
+        (self._unit, self._changed) = (unit, next(_changes))
 
     @property
     def value(self) -> float:
         """ The value of the record point.
         """
 
-        if hasattr(self, '_value'):
-            return self._value
+        return self._value
 
     @value.setter
     def value(self, value: float) -> None:
@@ -103,7 +208,7 @@ class RecordPoint(object):
         :type value: float
         """
 
-        self._value = value
+        (self._value, self._changed) = (value, next(_changes))
 
     def to_dict(self) -> dict:
         """ Builds a serializable representation of the record point.
@@ -116,10 +221,10 @@ class RecordPoint(object):
             'value': self.value,
             'unit': self.unit
         }
-        if hasattr(self, '_name'):
-            data['name'] = self.name
-        if hasattr(self, '_number'):
-            data['number'] = self.number
+        if self._name is not _unset:
+            data['name'] = self._name
+        if self._number is not _unset:
+            data['number'] = self._number
         return data
 
 
@@ -127,6 +232,16 @@ class Record(AbstractModel):
     """ A model representation of a record.
     """
 
+    __slots__ = (
+        '_device_name', '_name', '_lon', '_lat', '_timestamp', '_age',
+        '_ttl', '_device_type', '_data', '_parsed', '_meta', '_payload',
+        '_encoded', '_payload_at',
+    )
+    _fields = frozenset((
+        'device_name', 'name', 'lon', 'lat', 'timestamp', 'age',
+        'ttl', 'type', 'data', 'parsed',
+    ))
+
     def __init__(self, **kwargs):
         """ Initializes the record with any preliminary fields.
 
@@ -134,9 +249,16 @@ class Record(AbstractModel):
         :type kwargs: dict
         """
 
-        (self._data, self._parsed, self._meta,) = ({}, {}, {},)
+        (
+            self._device_name, self._name, self._lon, self._lat,
+            self._timestamp, self._age, self._ttl, self._device_type,
+        ) = (None, None, None, None, None, None, None, None,)
+        (self._data, self._parsed, self._meta,) = (
+            _TrackedDict(), _TrackedDict(), _TrackedDict(),
+        )
+        (self._payload, self._encoded, self._payload_at) = (None, None, 0)
         for (k, v) in kwargs.items():
-            if hasattr(self, k):
+            if k in self._fields:
                 setattr(self, k, v)
             else:
                 self._meta[k] = v
@@ -152,13 +274,54 @@ class Record(AbstractModel):
             '<{self.__class__.__name__} ({self.timestamp}) "{self.name}">'
         ).format(self=self)
 
+    def __getstate__(self) -> dict:
+        """ Builds the pickled state of the record.
+
+        .. note:: The cached serializations are left out and rebuilt as
+            needed once unpickled
+
+        :returns: The pickled state of the record
+        :rtype: dict
+        """
+
+        return {
+            slot: getattr(self, slot)
+            for slot in self.__slots__
+            if slot not in ('_payload', '_encoded', '_payload_at',)
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """ Restores the record from its pickled state.
+
+        .. note:: Change stamps are drawn from a per process counter, the
+            stamps of the unpickled points and mappings are reset
+
+        :param state: The pickled state of the record
+        :type state: dict
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for (slot, value) in state.items():
+            setattr(self, slot, value)
+        (self._data, self._parsed, self._meta,) = (
+            _TrackedDict(self._data), _TrackedDict(self._parsed),
+            _TrackedDict(self._meta),
+        )
+        for mapping in (self._data, self._parsed, self._meta,):
+            mapping._changed = 0
+        for point in itertools.chain(
+            self._data.values(), self._parsed.values()
+        ):
+            point._changed = 0
+        (self._payload, self._encoded, self._payload_at) = (None, None, 0)
+
     @property
     def device_name(self) -> str:
         """ The human readable name of the device.
         """
 
-        if hasattr(self, '_device_name'):
-            return self._device_name
+        return self._device_name
 
     @device_name.setter
     def device_name(self, device_name: str) -> None:
@@ -169,14 +332,14 @@ class Record(AbstractModel):
         """
 
         self._device_name = device_name
+        self.invalidate()
 
     @property
     def name(self) -> str:
         """ The primary name of the device.
         """
 
-        if hasattr(self, '_name'):
-            return self._name
+        return self._name
 
     @name.setter
     def name(self, name: str) -> None:
@@ -187,14 +350,14 @@ class Record(AbstractModel):
         """
 
         self._name = name
+        self.invalidate()
 
     @property
     def lon(self) -> float:
         """ The longitude of the device.
         """
 
-        if hasattr(self, '_lon'):
-            return self._lon
+        return self._lon
 
     @lon.setter
     def lon(self, lon: float) -> None:
@@ -205,14 +368,14 @@ class Record(AbstractModel):
         """
 
         self._lon = float(lon)
+        self.invalidate()
 
     @property
     def lat(self) -> float:
         """ The latitude of the device.
         """
 
-        if hasattr(self, '_lat'):
-            return self._lat
+        return self._lat
 
     @lat.setter
     def lat(self, lat: float) -> None:
@@ -223,14 +386,14 @@ class Record(AbstractModel):
         """
 
         self._lat = float(lat)
+        self.invalidate()
 
     @property
     def timestamp(self) -> int:
         """ The record's creation unix timestamp.
         """
 
-        if hasattr(self, '_timestamp'):
-            return self._timestamp
+        return self._timestamp
 
     @timestamp.setter
     def timestamp(self, timestamp: int) -> None:
@@ -241,14 +404,34 @@ class Record(AbstractModel):
         """
 
         self._timestamp = int(timestamp)
+        self.invalidate()
+
+    @property
+    def age(self) -> float:
+        """ The seconds since the device last refreshed the record's data.
+
+        .. note:: Not included in the serialization of the record
+        """
+
+        return self._age
+
+    @age.setter
+    def age(self, age: float) -> None:
+        """ Sets the age of the record's data.
+
+        :param age: The new age of the record's data in seconds
+        :type age: float
+        """
+
+        self._age = (float(age) if age is not None else None)
+        self.invalidate()
 
     @property
     def ttl(self) -> int:
         """ The record's time to live in seconds.
         """
 
-        if hasattr(self, '_ttl'):
-            return self._ttl
+        return self._ttl
 
     @ttl.setter
     def ttl(self, ttl: int) -> None:
@@ -259,14 +442,14 @@ class Record(AbstractModel):
         """
 
         self._ttl = int(ttl)
+        self.invalidate()
 
     @property
     def type(self) -> str:
         """ The type of the device.
         """
 
-        if hasattr(self, '_device_type'):
-            return self._device_type
+        return self._device_type
 
     @type.setter
     def type(self, device_type: str) -> None:
@@ -277,14 +460,14 @@ class Record(AbstractModel):
         """
 
         self._device_type = device_type
+        self.invalidate()
 
     @property
     def data(self) -> Dict[int, RecordPoint]:
         """ The device's raw data points.
         """
 
-        if hasattr(self, '_data'):
-            return self._data
+        return self._data
 
     @data.setter
     def data(self, data: Dict[int, RecordPoint]) -> None:
@@ -294,15 +477,15 @@ class Record(AbstractModel):
         :type data: dict
         """
 
-        self._data = data
+        self._data = _TrackedDict(data)
+        self.invalidate()
 
     @property
     def parsed(self) -> Dict[str, RecordPoint]:
         """ The device's parsed data points.
         """
 
-        if hasattr(self, '_parsed'):
-            return self._parsed
+        return self._parsed
 
     @parsed.setter
     def parsed(self, parsed: Dict[str, RecordPoint]) -> None:
@@ -312,7 +495,8 @@ class Record(AbstractModel):
         :type parsed: dict
         """
 
-        self._parsed = parsed
+        self._parsed = _TrackedDict(parsed)
+        self.invalidate()
 
     def validate(self) -> bool:
         """ Self validates the record.
@@ -321,16 +505,98 @@ class Record(AbstractModel):
         :rtype: bool
         """
 
-        try:
-            jsonschema.validate(self.to_dict(), const.record_schema)
+        return self._validate(const.record_validator)
+
+    def _validate(self, validator: SchemaValidator) -> bool:
+        """ Validates the record against a compiled record schema validator.
+
+        :param validator: The compiled validator of the record schema
+        :type validator: SchemaValidator
+        :returns: True if valid, otherwise False
+        :rtype: bool
+        """
+
+        changed_at = self._changed_at()
+        to_dict = self.to_dict()
+        if validator.is_valid(to_dict):
+            if self._payload is None or changed_at > self._payload_at:
+                (self._payload, self._encoded, self._payload_at) = (
+                    _freeze(to_dict), None, changed_at,
+                )
             return True
-        except jsonschema.exceptions.ValidationError as exc:
-            const.log.warn((
-                'caught {self.__class__.__name__} validation error on the '
-                'record `{to_dict}`, {exc} ...'
-            ).format(self=self, to_dict=self.to_dict(), exc=str(exc)))
+        exc = validator.best_match(to_dict)
+        const.log.warn((
+            'caught {self.__class__.__name__} validation error on the '
+            'record `{to_dict}`, {exc} ...'
+        ).format(self=self, to_dict=to_dict, exc=str(exc)))
         return False
 
+    @classmethod
+    def validate_many(cls, records: List['Record']) -> List[bool]:
+        """ Validates many records at once.
+
+        :param records: The records to validate
+        :type records: list
+        :returns: True for each valid record, otherwise False
+        :rtype: list
+        """
+
+        validator = const.record_validator
+        return [record._validate(validator) for record in records]
+
+    def _changed_at(self) -> int:
+        """ Finds the stamp of the latest change to the record's points.
+
+        :returns: The latest change stamp of the points and mappings
+        :rtype: int
+        """
+
+        return max(itertools.chain(
+            (self._data._changed, self._parsed._changed, self._meta._changed,),
+            (point._changed for point in self._data.values()),
+            (point._changed for point in self._parsed.values()),
+        ))
+
+    @property
+    def payload(self) -> types.MappingProxyType:
+        """ The cached read-only serialization of the record.
+
+        .. note:: Built once, usually when the record passes validation,
+            and shared by every pipe the record is written to, changes to
+            the record's points or meta made in place rebuild it
+        """
+
+        changed_at = self._changed_at()
+        if self._payload is None or changed_at > self._payload_at:
+            (self._payload, self._encoded, self._payload_at) = (
+                _freeze(self.to_dict()), None, changed_at,
+            )
+        return self._payload
+
+    @property
+    def encoded(self) -> bytes:
+        """ The cached utf-8 json encoding of the record's payload.
+        """
+
+        payload = self.payload
+        if self._encoded is None:
+            self._encoded = json.dumps(
+                payload, default=dict, separators=(',', ':',)
+            ).encode('utf-8')
+        return self._encoded
+
+    def invalidate(self) -> None:
+        """ Drops the cached serializations of the record.
+
+        .. note:: Called by every field setter, changes made in place to
+            the record's points or meta are caught by their change stamps
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        (self._payload, self._encoded) = (None, None)
+
     def to_dict(self) -> dict:
         """ Builds a serializable representation of the record.
 
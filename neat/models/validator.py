@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import re
+import numbers
+from typing import Any, Callable
+
+import jsonschema
+
+
+class SchemaValidator(object):
+    """ A draft 4 schema validator compiled into plain Python checks.
+
+    The keywords of the schema are compiled once into nested checks which
+    accept or reject exactly as :class:`jsonschema.Draft4Validator` does.
+    Schemas using keywords the compiler does not know are checked by the
+    wrapped :class:`jsonschema.Draft4Validator` instead, which also builds
+    the errors of rejected instances.
+    """
+
+    # NOTE: keywords which never affect whether an instance is valid
+    _annotations = frozenset((
+        '$schema', 'id', 'title', 'description', 'default',
+    ))
+    _types = {
+        'object': (lambda instance: isinstance(instance, dict)),
+        'string': (lambda instance: isinstance(instance, str)),
+        'null': (lambda instance: instance is None),
+        'number': (
+            lambda instance: (
+                isinstance(instance, numbers.Number) and
+                not isinstance(instance, bool)
+            )
+        ),
+    }
+
+    def __init__(self, schema: dict):
+        """ Initializes the schema validator.
+
+        :param schema: The draft 4 schema to compile
+        :type schema: dict
+        """
+
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        (self.schema, self.validator) = (schema, validator_class(schema))
+        try:
+            self._check = self._compile(schema)
+        except NotImplementedError:
+            self._check = self.validator.is_valid
+
+    def __repr__(self):
+        """ A string representation of the schema validator.
+
+        :returns: A string representation of the schema validator
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} "{title}">'
+        ).format(self=self, title=self.schema.get('title'))
+
+    def _compile(self, schema: dict) -> Callable[[Any], bool]:
+        """ Compiles a (sub)schema into a check of instances.
+
+        :param schema: The (sub)schema to compile
+        :type schema: dict
+        :returns: A function returning True for valid instances
+        :rtype: callable
+        """
+
+        if not isinstance(schema, dict):
+            raise NotImplementedError()
+        unknown = (
+            set(schema.keys()) - self._annotations - {
+                'type', 'properties', 'patternProperties',
+                'additionalProperties', 'required',
+            }
+        )
+        if len(unknown) > 0:
+            raise NotImplementedError()
+        checks = []
+
+        if 'type' in schema:
+            types = schema['type']
+            if isinstance(types, str):
+                types = [types]
+            if any(_ not in self._types for _ in types):
+                raise NotImplementedError()
+            type_checks = tuple(self._types[_] for _ in types)
+            checks.append(
+                lambda instance: any(_(instance) for _ in type_checks)
+            )
+
+        properties = {
+            name: self._compile(subschema)
+            for (name, subschema) in schema.get('properties', {}).items()
+            if len(subschema) > 0
+        }
+        patterns = tuple(
+            (re.compile(pattern), self._compile(subschema))
+            for (pattern, subschema) in (
+                schema.get('patternProperties', {}).items()
+            )
+        )
+        additional = schema.get('additionalProperties', True)
+        if not isinstance(additional, bool):
+            raise NotImplementedError()
+        known = frozenset(schema.get('properties', {}).keys())
+        required = tuple(schema.get('required', ()))
+
+        def check_object(instance: dict) -> bool:
+            for name in required:
+                if name not in instance:
+                    return False
+            for (name, value) in instance.items():
+                matched = (name in known)
+                if matched and name in properties and \
+                        not properties[name](value):
+                    return False
+                for (pattern, check) in patterns:
+                    if pattern.search(name):
+                        matched = True
+                        if not check(value):
+                            return False
+                if not matched and not additional:
+                    return False
+            return True
+
+        if len(properties) > 0 or len(patterns) > 0 or \
+                len(required) > 0 or not additional:
+            checks.append(
+                lambda instance: (
+                    not isinstance(instance, dict) or check_object(instance)
+                )
+            )
+        checks = tuple(checks)
+        return (lambda instance: all(_(instance) for _ in checks))
+
+    def is_valid(self, instance: Any) -> bool:
+        """ Checks if an instance is valid.
+
+        :param instance: The instance to check
+        :type instance: Any
+        :returns: True if valid, otherwise False
+        :rtype: bool
+        """
+
+        return self._check(instance)
+
+    def best_match(
+        self, instance: Any
+    ) -> jsonschema.exceptions.ValidationError:
+        """ Finds the error ``jsonschema.validate`` raises for an instance.
+
+        :param instance: The instance to find the error of
+        :type instance: Any
+        :returns: The most relevant error, None if the instance is valid
+        :rtype: jsonschema.exceptions.ValidationError
+        """
+
+        return jsonschema.exceptions.best_match(
+            self.validator.iter_errors(instance)
+        )
@@ -4,9 +4,13 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import os
 import abc
+import asyncio
+import threading
 from typing import List
 
+from .. import const
 from ..models import Record
 
 import blinker
@@ -18,11 +22,20 @@ class AbstractPipe(object, metaclass=abc.ABCMeta):
 
     signal = blinker.Signal()
 
+    # NOTE: buffered records are flushed once ``batch_size`` are buffered or
+    # ``flush_delay`` seconds after the first of them was buffered
+    batch_size = 1
+    flush_delay = None
+    _buffer_lock = threading.Lock()
+
     @abc.abstractmethod
     def accept(self, record: Record) -> None:
         """ Accepts a record for placement in the pipe
 
-        .. note:: Does not ensure placement in the pipe if engine is closing
+        .. note:: Does not ensure placement in the pipe if engine is closing,
+            pipes should write the record's shared
+            :attr:`~neat.models.record.Record.payload` rather than
+            serializing the record again
 
         :param record: The record to place in the pipe
         :type record: Record
@@ -32,6 +45,172 @@ class AbstractPipe(object, metaclass=abc.ABCMeta):
 
         raise NotImplementedError()
 
+    def accept_many(self, records: List[Record]) -> None:
+        """ Accepts many records for placement in the pipe at once.
+
+        .. note:: By default accepts each record in turn, pipes able to
+            write many records at once should override this
+
+        :param records: The records to place in the pipe
+        :type records: list
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for record in records:
+            self.accept(record)
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the pipe.
+        """
+
+        return {}
+
+    @property
+    def buffered(self) -> int:
+        """ The number of buffered records waiting to be flushed.
+        """
+
+        return len(self._buffer_state()['records'])
+
+    @property
+    def buffer_metrics(self) -> dict:
+        """ The flush counters of the pipe's buffer in this process.
+        """
+
+        state = self._buffer_state()
+        with state['lock']:
+            return {
+                'buffered': len(state['records']),
+                'flushes': state['flushes'],
+                'failed_flushes': state['failed_flushes'],
+                'failed': state['failed'],
+            }
+
+    def _buffer_state(self) -> dict:
+        """ Retrieves the buffer of the pipe, creating it if needed.
+
+        .. note:: Forked processes start with an empty buffer of their own,
+            records buffered by the parent are flushed by the parent
+
+        :returns: The buffered records, their flush timer and locks
+        :rtype: dict
+        """
+
+        buffer = getattr(self, '_buffer', None)
+        if buffer is None or buffer['pid'] != os.getpid():
+            with self._buffer_lock:
+                buffer = getattr(self, '_buffer', None)
+                if buffer is None or buffer['pid'] != os.getpid():
+                    self._buffer = buffer = {
+                        'records': [], 'timer': None,
+                        'lock': threading.Lock(),
+                        'flush_lock': threading.Lock(),
+                        'pid': os.getpid(),
+                        'flushes': 0, 'failed_flushes': 0, 'failed': 0,
+                    }
+        return buffer
+
+    def buffer(self, record: Record) -> None:
+        """ Buffers a record to be placed in the pipe with the next flush.
+
+        .. note:: Flushes once :attr:`batch_size` records are buffered, a
+            timer flushes the buffer :attr:`flush_delay` seconds after its
+            first record was buffered
+
+        :param record: The record to buffer
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        state = self._buffer_state()
+        with state['lock']:
+            state['records'].append(record)
+            full = (len(state['records']) >= self.batch_size)
+            if not full and state['timer'] is None and \
+                    self.flush_delay is not None:
+                state['timer'] = threading.Timer(
+                    self.flush_delay, self._timed_flush
+                )
+                state['timer'].daemon = True
+                state['timer'].start()
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """ Places the buffered records in the pipe at once.
+
+        .. note:: Records of a failed flush are counted as failed in
+            :attr:`buffer_metrics` before the error is raised
+
+        :returns: The number of flushed records
+        :rtype: int
+        """
+
+        state = self._buffer_state()
+        # NOTE: flushes are serialized so buffered records keep their order
+        with state['flush_lock']:
+            with state['lock']:
+                (records, state['records']) = (state['records'], [])
+                if state['timer'] is not None:
+                    state['timer'].cancel()
+                    state['timer'] = None
+            if len(records) > 0:
+                try:
+                    self.accept_many(records)
+                except Exception:
+                    with state['lock']:
+                        state['failed_flushes'] += 1
+                        state['failed'] += len(records)
+                    raise
+                with state['lock']:
+                    state['flushes'] += 1
+            return len(records)
+
+    def _timed_flush(self) -> None:
+        """ Flushes the buffer from its flush timer, logging failures.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        try:
+            self.flush()
+        except Exception as exc:
+            const.log.exception((
+                'timed flush of `{self}` failed, buffered records were '
+                'dropped, {exc} ...'
+            ).format(self=self, exc=exc))
+
+    def close(self) -> None:
+        """ Releases the connections of the pipe.
+
+        .. note:: Called by the engine once buffered records are written
+            out, does nothing by default
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        pass
+
+    async def accept_async(self, record: Record) -> None:
+        """ Awaitable placement of a record in the pipe.
+
+        .. note:: By default runs :meth:`accept` in the event loop's executor
+
+        :param record: The record to place in the pipe
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        await asyncio.get_event_loop().run_in_executor(
+            None, self.accept, record
+        )
+
     @abc.abstractmethod
     def validate(self) -> bool:
         """ Self validates the pipe.
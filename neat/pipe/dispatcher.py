@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import pickle
+import tempfile
+import threading
+import collections
+
+from .. import const
+from ..models import Record
+from ._common import AbstractPipe
+
+
+class PipeDispatcher(object):
+    """ A bounded queue of records written to a pipe by a writer thread.
+
+    Records are written in the order they were put, so a slow pipe only
+    delays its own records.
+    Once the queue holds ``maxsize`` records, further records are handled
+    by the dispatcher's policy:
+
+    - ``block`` waits until the writer makes room in the queue
+    - ``drop_oldest`` drops the oldest queued record to make room
+    - ``spill`` appends records to a spill file on disk which the writer
+      reads back once the queue is written out
+    """
+
+    policies = ('block', 'drop_oldest', 'spill',)
+
+    def __init__(
+        self, piper: AbstractPipe, maxsize: int=1000, policy: str='block',
+        spill_dir: str=None
+    ):
+        """ Initializes the pipe dispatcher.
+
+        :param piper: The pipe to write records to
+        :type piper: AbstractPipe
+        :param maxsize: The records queued before the policy applies (1000)
+        :type maxsize: int
+        :param policy: The policy of a full queue ('block')
+        :type policy: str
+        :param spill_dir: The directory of the spill file (temp directory)
+        :type spill_dir: str
+        """
+
+        if policy not in self.policies:
+            raise ValueError((
+                "unknown policy '{policy}', expected one of {policies}"
+            ).format(policy=policy, policies=self.policies))
+        (self.piper, self.policy) = (piper, policy)
+        self.maxsize = max(int(maxsize), 1)
+        self.spill_dir = spill_dir
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        (self._spill, self._spill_reader, self._spilled) = (None, None, 0)
+        (self._written, self._failed, self._dropped, self._blocked) = (
+            0, 0, 0, 0,
+        )
+        (self._writing, self._closed, self._thread) = (False, False, None)
+
+    def __repr__(self):
+        """ A string representation of the pipe dispatcher.
+
+        :returns: A string representation of the pipe dispatcher
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} ({self.policy}) {self.piper}>'
+        ).format(self=self)
+
+    @property
+    def metrics(self) -> dict:
+        """ The queue depth and drop counters of the dispatcher.
+        """
+
+        with self._condition:
+            return {
+                'policy': self.policy,
+                'maxsize': self.maxsize,
+                'depth': len(self._queue),
+                'spilled': self._spilled,
+                'written': self._written,
+                'failed': self._failed,
+                'dropped': self._dropped,
+                'blocked': self._blocked,
+            }
+
+    def start(self) -> None:
+        """ Starts the dispatcher's writer thread.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self._closed = False
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        const.log.info((
+            'starting `{self}` writer thread as daemon ...'
+        ).format(self=self))
+        self._thread.start()
+
+    def put(self, record: Record) -> None:
+        """ Queues a record to be written to the pipe.
+
+        .. note:: Only the ``block`` policy ever waits on the writer
+
+        :param record: The record to queue
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._condition:
+            if self._closed:
+                self._dropped += 1
+                return
+            if self._spilled > 0:
+                # NOTE: records follow the spilled records until they are
+                # read back so that records are written in order
+                self._spill_record(record)
+            elif len(self._queue) >= self.maxsize:
+                if self.policy == 'block':
+                    self._blocked += 1
+                    while len(self._queue) >= self.maxsize and \
+                            not self._closed:
+                        self._condition.wait()
+                    if self._closed:
+                        self._dropped += 1
+                        return
+                    self._queue.append(record)
+                elif self.policy == 'drop_oldest':
+                    self._queue.popleft()
+                    self._dropped += 1
+                    self._queue.append(record)
+                else:
+                    self._spill_record(record)
+            else:
+                self._queue.append(record)
+            self._condition.notify_all()
+
+    def _spill_record(self, record: Record) -> None:
+        """ Appends a record to the spill file.
+
+        .. note:: Must be called while holding the dispatcher's condition
+
+        :param record: The record to spill
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(
+                prefix='{}-spill-'.format(const.module_name),
+                dir=self.spill_dir
+            )
+            self._spill_reader = 0
+        self._spill.seek(0, os.SEEK_END)
+        pickle.dump(record, self._spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self._spilled += 1
+
+    def _unspill_record(self) -> Record:
+        """ Reads the next record back from the spill file.
+
+        .. note:: Must be called while holding the dispatcher's condition
+
+        :returns: The oldest spilled record
+        :rtype: Record
+        """
+
+        self._spill.seek(self._spill_reader)
+        record = pickle.load(self._spill)
+        (self._spill_reader, self._spilled) = (
+            self._spill.tell(), (self._spilled - 1)
+        )
+        if self._spilled <= 0:
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._spill_reader = 0
+        return record
+
+    def _next(self) -> Record:
+        """ Waits for the next record to write.
+
+        :returns: The next record to write, None once closed and drained
+        :rtype: Record
+        """
+
+        with self._condition:
+            while len(self._queue) <= 0 and self._spilled <= 0:
+                if self._closed:
+                    return None
+                self._condition.wait()
+            self._writing = True
+            if len(self._queue) > 0:
+                record = self._queue.popleft()
+            else:
+                record = self._unspill_record()
+            self._condition.notify_all()
+            return record
+
+    def _run(self) -> None:
+        """ Writes queued records to the pipe until closed.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        while True:
+            record = self._next()
+            if record is None:
+                return
+            try:
+                self.piper.accept(record)
+                written = True
+            except Exception as exc:
+                written = False
+                const.log.exception((
+                    'pipe `{self.piper}` failed to write `{record}`, '
+                    '{exc} ...'
+                ).format(self=self, record=record, exc=exc))
+            with self._condition:
+                if written:
+                    self._written += 1
+                else:
+                    self._failed += 1
+                self._writing = False
+                self._condition.notify_all()
+
+    def join(self, timeout: float=None) -> bool:
+        """ Waits until every queued and spilled record is written.
+
+        :param timeout: The seconds to wait at most (unbounded)
+        :type timeout: float
+        :returns: True if every record was written, otherwise False
+        :rtype: bool
+        """
+
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: (
+                    len(self._queue) <= 0 and self._spilled <= 0 and
+                    not self._writing
+                ),
+                timeout=timeout
+            )
+
+    def close(self, timeout: float=None) -> None:
+        """ Writes out the queued records and stops the writer thread.
+
+        :param timeout: The seconds to wait for the writer at most (unbounded)
+        :type timeout: float
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                const.log.warning((
+                    'writer of `{self}` did not finish in `{timeout}` '
+                    'seconds, `{depth}` records left unwritten ...'
+                ).format(
+                    self=self, timeout=timeout,
+                    depth=(len(self._queue) + self._spilled)
+                ))
+                return
+            self._thread = None
+        with self._condition:
+            if self._spill is not None:
+                self._spill.close()
+                (self._spill, self._spill_reader) = (None, None)
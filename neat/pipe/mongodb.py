@@ -5,6 +5,7 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 import time
+from typing import List
 
 from .. import const
 from ..models import Record
@@ -19,7 +20,10 @@ class MongoDBPipe(AbstractPipe):
     .. note:: Records are always placed in the `neat` table.
     """
 
-    def __init__(self, ip: str, port: int, table: str, entry_delay: int=600):
+    def __init__(
+        self, ip: str, port: int, table: str, entry_delay: int=600,
+        batch_size: int=1, flush_delay: float=1.0, write_concern: dict=None
+    ):
         """ Initializes the MongoDB pipe.
 
         :param ip: The IP of the MongoDB instance
@@ -30,11 +34,25 @@ class MongoDBPipe(AbstractPipe):
         :type table: str
         :param entry_delay: Seconds between allowing records into the database
         :type entry_delay: int
+        :param batch_size: Records inserted at once, 1 inserts every record
+        :type batch_size: int
+        :param flush_delay: Seconds records may wait for a batch (1.0)
+        :type flush_delay: float
+        :param write_concern: The write concern of inserts, as ``{'w': 1}``
+        :type write_concern: dict
         """
 
         (self._ip, self._port) = (ip, port)
         self._table_name = table
         (self._entry_register, self._entry_delay) = ({}, entry_delay)
+        (self.batch_size, self.flush_delay) = (
+            max(int(batch_size), 1), flush_delay
+        )
+        self._write_concern = (
+            pymongo.WriteConcern(**write_concern)
+            if write_concern is not None else
+            None
+        )
 
     def __repr__(self):
         """ A string representation of the pipe.
@@ -84,39 +102,63 @@ class MongoDBPipe(AbstractPipe):
         """
 
         if not hasattr(self, '_table'):
-            self._table = self.db.collection[self._table_name]
+            table = self.db.collection[self._table_name]
+            if self._write_concern is not None:
+                table = table.with_options(write_concern=self._write_concern)
+            self._table = table
         return self._table
 
+    def document(self, record: Record) -> dict:
+        """ Builds the MongoDB document of a record.
+
+        .. note:: Only the top level of the record's shared payload is
+            copied, as the driver adds the ``_id`` of inserted documents
+
+        :param record: The record to build the document of
+        :type record: Record
+        :returns: The document of the record
+        :rtype: dict
+        """
+
+        return {
+            (k.replace('$', '') if k.startswith('$') else k): v
+            for (k, v) in record.payload.items()
+        }
+
     def accept(self, record: Record) -> None:
         """ Accepts a record to be placed into the MongoDB instance.
 
+        .. note:: Records are buffered for a batched insert if the pipe's
+            ``batch_size`` is greater than 1
+
         :param record: The record to be placed in the MongoDB instance
         :type record: Record
         :returns: Does not return
         :rtype: None
         """
 
-        const.log.debug((
-            'handling `{record}` with `{self}` ...'
-        ).format(self=self, record=record))
-        last_write = time.time()
-        insert = False
-        try:
-            last_write = (time.time() - self._entry_register[record.name])
-            if last_write >= self._entry_delay:
-                insert = True
-        except KeyError as exc:
-            self._entry_register[record.name] = time.time()
-            insert = True
-        if insert:
-            const.log.debug((
-                'commiting `{record}` records into `{self}` ...'
-            ).format(self=self, record=record))
-            self.table.insert_one({
-                (k.replace('$', '') if k.startswith('$') else k): v
-                for (k, v) in record.to_dict().items()
-            })
+        if self.batch_size > 1:
+            self.buffer(record)
         else:
+            self.accept_many([record])
+
+    def _should_insert(self, record: Record) -> bool:
+        """ Checks if a record's entry delay has passed, registering it if so.
+
+        :param record: The record to check
+        :type record: Record
+        :returns: True if the record should be inserted, otherwise False
+        :rtype: bool
+        """
+
+        # NOTE: entries are spaced by the record's own timestamp so that
+        # backfilled records are thinned the same way live records are
+        written = (
+            record.timestamp if record.timestamp is not None else time.time()
+        )
+        last_write = (written - self._entry_register.get(record.name, 0))
+        if record.name in self._entry_register and \
+                0 <= last_write < self._entry_delay:
             const.log.debug((
                 'dropping `{record}` for `{self}`, time till next write is '
                 '`{next_write}` seconds ...'
@@ -124,7 +166,43 @@ class MongoDBPipe(AbstractPipe):
                 self=self, record=record,
                 next_write=(self._entry_delay - last_write)
             ))
-        self.signal.send(self, record=record)
+            return False
+        self._entry_register[record.name] = written
+        return True
+
+    def accept_many(self, records: List[Record]) -> None:
+        """ Accepts many records to be placed into the MongoDB instance.
+
+        .. note:: Records are inserted unordered with a single request, a
+            failed document does not stop the others from being inserted
+
+        :param records: The records to be placed in the MongoDB instance
+        :type records: list
+        :returns: Does not return
+        :rtype: None
+        """
+
+        documents = [
+            self.document(record)
+            for record in records
+            if self._should_insert(record)
+        ]
+        if len(documents) > 0:
+            const.log.debug((
+                'commiting `{count}` records into `{self}` ...'
+            ).format(self=self, count=len(documents)))
+            try:
+                self.table.insert_many(documents, ordered=False)
+            except pymongo.errors.BulkWriteError as exc:
+                const.log.error((
+                    'failed to insert `{failed}` of `{count}` records into '
+                    '`{self}` ...'
+                ).format(
+                    self=self, count=len(documents),
+                    failed=len(exc.details.get('writeErrors', []))
+                ))
+        for record in records:
+            self.signal.send(self, record=record)
 
     def validate(self) -> bool:
         """ Self validates the MongoDB pipe.
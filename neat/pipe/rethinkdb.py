@@ -4,6 +4,7 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import os
 import time
 import threading
 from typing import List
@@ -21,7 +22,11 @@ class RethinkDBPipe(AbstractPipe):
     .. note:: Records are always placed in the `neat` table.
     """
 
-    def __init__(self, ip: str, port: int, table: str, clean_delay: int=300):
+    def __init__(
+        self, ip: str, port: int, table: str, clean_delay: int=300,
+        health_delay: float=30.0, clean_chunk: int=1000,
+        batch_size: int=1, flush_delay: float=1.0, durability: str=None
+    ):
         """ Initializes the RethinkDB pipe.
 
         :param ip: The IP of the RethinkDB instance
@@ -32,15 +37,44 @@ class RethinkDBPipe(AbstractPipe):
         :type table: str
         :param clean_delay: Seconds between cleaning dead records
         :type clean_delay: int
+        :param health_delay: Idle seconds before a connection is checked (30.0)
+        :type health_delay: float
+        :param clean_chunk: Expired records deleted per query (1000)
+        :type clean_chunk: int
+        :param batch_size: Records inserted at once, 1 inserts every record
+        :type batch_size: int
+        :param flush_delay: Seconds records may wait for a batch (1.0)
+        :type flush_delay: float
+        :param durability: The durability of inserts, 'hard' or 'soft'
+            (the table's durability)
+        :type durability: str
         """
 
+        if durability not in (None, 'hard', 'soft',):
+            raise ValueError((
+                "unknown durability '{durability}', expected 'hard' or 'soft'"
+            ).format(durability=durability))
+
         (self._ip, self._port) = (ip, port)
         self._table_name = table
         (self._last_cleaned, self._clean_delay) = (0, clean_delay)
+        self._health_delay = health_delay
+        (self._local, self._lock, self._connections, self._pid) = (
+            threading.local(), threading.Lock(), [], os.getpid()
+        )
+        (self._opened, self._reconnects, self._failures, self._checks) = (
+            0, 0, 0, 0,
+        )
+        self._clean_chunk = max(int(clean_chunk), 1)
+        (self.batch_size, self.flush_delay) = (
+            max(int(batch_size), 1), flush_delay
+        )
+        self._insert_options = (
+            {'durability': durability} if durability is not None else {}
+        )
+        (self._sweeps, self._swept, self._last_sweep) = (0, 0, {})
 
-        if self._table_name not in rethinkdb.table_list()\
-                .run(self.connection):
-            rethinkdb.table_create(self._table_name).run(self.connection)
+        self._setup()
         self.table = rethinkdb.table(self._table_name)
 
         self._cleaning_thread = threading.Thread(
@@ -67,29 +101,158 @@ class RethinkDBPipe(AbstractPipe):
 
     @property
     def connection(self):
-        """ The client attached to the RethinkDB uri.
+        """ The connection of the current thread to the RethinkDB uri.
+
+        .. note:: Connections are reopened in forked processes
 
         .. warning:: RethinkDB driver connections are not thread safe
         """
 
         # NOTE: unfortunately rethinkdb driver connections are not thread safe
-        # For this reason, a new connection must be initalized on each request
+        # For this reason, each thread reuses a connection of its own
+        self._drop_inherited()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connect()
+        elif not connection.is_open():
+            connection = self._reconnect(connection)
+        elif (time.monotonic() - self._local.used) >= self._health_delay:
+            with self._lock:
+                self._checks += 1
+            try:
+                connection.server()
+            except rethinkdb.errors.ReqlDriverError as exc:
+                const.log.warning((
+                    'connection of `{self}` failed its health check, '
+                    'reconnecting, {exc} ...'
+                ).format(self=self, exc=exc))
+                connection = self._reconnect(connection)
+        self._local.used = time.monotonic()
+        return connection
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the pipe, including connection churn.
+        """
+
+        with self._lock:
+            return {
+                'connections': len(self._connections),
+                'opened': self._opened,
+                'reconnects': self._reconnects,
+                'failures': self._failures,
+                'health_checks': self._checks,
+                'sweeps': self._sweeps,
+                'swept': self._swept,
+                'last_sweep': dict(self._last_sweep),
+            }
+
+    def _drop_inherited(self) -> None:
+        """ Drops the connections a forked process inherited from its parent.
+
+        .. note:: Forked processes must not share the parent's sockets, the
+            inherited connections are dropped without being closed
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._pid != os.getpid():
+            (self._local, self._lock, self._connections, self._pid) = (
+                threading.local(), threading.Lock(), [], os.getpid()
+            )
+
+    def _connect(self):
+        """ Opens a new connection for the current thread.
+
+        :returns: The opened connection
+        :rtype: rethinkdb.net.DefaultConnection
+        """
+
         try:
             connection = rethinkdb.connect(
                 self._ip, self._port,
                 db=const.module_name
             )
-            if const.module_name not in rethinkdb.db_list()\
-                    .run(connection):
-                rethinkdb.db_create(const.module_name)\
-                    .run(connection)
-            return connection
         except rethinkdb.errors.ReqlDriverError as exc:
+            with self._lock:
+                self._failures += 1
             const.log.error((
                 'could not connect to rethinkdb server at '
                 '`{self._ip}:{self._port}`, {exc.message} ...'
             ).format(self=self, exc=exc))
             raise exc
+        with self._lock:
+            self._opened += 1
+            self._connections.append(connection)
+        (self._local.connection, self._local.used) = (
+            connection, time.monotonic()
+        )
+        return connection
+
+    def _reconnect(self, connection):
+        """ Reopens a closed or unhealthy connection of the current thread.
+
+        :param connection: The connection to reopen
+        :type connection: rethinkdb.net.DefaultConnection
+        :returns: The reopened connection
+        :rtype: rethinkdb.net.DefaultConnection
+        """
+
+        try:
+            connection.reconnect(noreply_wait=False)
+        except rethinkdb.errors.ReqlDriverError as exc:
+            with self._lock:
+                self._failures += 1
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            self._local.connection = None
+            const.log.error((
+                'could not reconnect to rethinkdb server at '
+                '`{self._ip}:{self._port}`, {exc.message} ...'
+            ).format(self=self, exc=exc))
+            raise exc
+        with self._lock:
+            self._reconnects += 1
+        return connection
+
+    def _setup(self) -> None:
+        """ Creates the database and table of the pipe if they do not exist.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        connection = self.connection
+        if const.module_name not in rethinkdb.db_list().run(connection):
+            rethinkdb.db_create(const.module_name).run(connection)
+        if self._table_name not in rethinkdb.table_list().run(connection):
+            rethinkdb.table_create(self._table_name).run(connection)
+        table = rethinkdb.table(self._table_name)
+        if 'expires' not in table.index_list().run(connection):
+            # NOTE: records written before the expires field was stored are
+            # indexed by the expiry computed from their timestamp and ttl
+            table.index_create('expires', lambda record: (
+                record['expires'].default(record['timestamp'] + record['ttl'])
+            )).run(connection)
+            table.index_wait('expires').run(connection)
+
+    def close(self) -> None:
+        """ Closes every connection of the pipe.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self._drop_inherited()
+        with self._lock:
+            (connections, self._connections) = (self._connections, [])
+        for connection in connections:
+            try:
+                connection.close(noreply_wait=False)
+            except rethinkdb.errors.ReqlDriverError:
+                pass
+        self._local = threading.local()
 
     def _cleaning_scheduler(self, delay: float) -> None:
         """ Waits for a couple seconds before cleaning.
@@ -104,39 +267,106 @@ class RethinkDBPipe(AbstractPipe):
             self.clean()
             time.sleep(delay)
 
+    def document(self, record: Record) -> dict:
+        """ Builds the RethinkDB document of a record.
+
+        .. note:: Only the top level of the record's shared payload is
+            copied to add the indexed ``expires`` timestamp of the record
+
+        :param record: The record to build the document of
+        :type record: Record
+        :returns: The document of the record
+        :rtype: dict
+        """
+
+        document = dict(record.payload)
+        document['expires'] = (record.timestamp + record.ttl)
+        return document
+
     def accept(self, record: Record) -> None:
         """ Accepts a record to be placed into the RethinkDB instance.
 
+        .. note:: Records are buffered for a batched insert if the pipe's
+            ``batch_size`` is greater than 1
+
         :param record: The record to be placed into the RethinkDB instance
         :type record: Record
         :returns: Does not return
         :rtype: None
         """
 
-        const.log.debug((
-            'commiting `{record}` records into `{self}` ...'
-        ).format(self=self, record=record))
-        self.table.insert(record.to_dict()).run(self.connection)
-        self.signal.send(self, record=record)
+        if self.batch_size > 1:
+            self.buffer(record)
+        else:
+            self.accept_many([record])
 
-    def clean(self) -> None:
-        """ Cleans dead records from the RethinkDB instance.
+    def accept_many(self, records: List[Record]) -> None:
+        """ Accepts many records to be placed into the RethinkDB instance.
 
+        .. note:: Records are inserted with a single query
+
+        :param records: The records to be placed into the RethinkDB instance
+        :type records: list
         :returns: Does not return
         :rtype: None
         """
 
+        if len(records) <= 0:
+            return
         const.log.debug((
-            'cleaning expired records from `{self.table}` ...'
-        ).format(self=self))
-        deletion_results = self.table.filter(lambda record: (
-            record['timestamp'] + record['ttl']
-        ) <= time.time()).delete().run(self.connection)
+            'commiting `{count}` records into `{self}` ...'
+        ).format(self=self, count=len(records)))
+        insert_results = self.table.insert(
+            [self.document(record) for record in records],
+            **self._insert_options
+        ).run(self.connection)
+        if insert_results.get('errors', 0) > 0:
+            const.log.error((
+                'failed to insert `{insert_results[errors]}` of `{count}` '
+                'records into `{self}`, {insert_results[first_error]} ...'
+            ).format(
+                self=self, count=len(records), insert_results=insert_results
+            ))
+        for record in records:
+            self.signal.send(self, record=record)
+
+    def clean(self) -> int:
+        """ Cleans dead records from the RethinkDB instance.
+
+        .. note:: Expired records are found through the ``expires`` index
+            and deleted in chunks of ``clean_chunk`` records, so writes are
+            not held up by a single large delete
+
+        :returns: The number of deleted records
+        :rtype: int
+        """
+
         const.log.debug((
-            'cleaned `{deleted_count}` records from `{self.table}` ...'
-        ).format(self=self, deleted_count=deletion_results['deleted']))
+            'cleaning expired records from `{self._table_name}` ...'
+        ).format(self=self))
+        (started, now) = (time.perf_counter(), time.time())
+        (deleted, chunks) = (0, 0)
+        while True:
+            deletion_results = self.table.between(
+                rethinkdb.minval, now, index='expires', right_bound='closed'
+            ).limit(self._clean_chunk).delete().run(self.connection)
+            deleted += deletion_results['deleted']
+            chunks += 1
+            if deletion_results['deleted'] < self._clean_chunk:
+                break
+        seconds = (time.perf_counter() - started)
+        with self._lock:
+            self._sweeps += 1
+            self._swept += deleted
+            self._last_sweep = {
+                'deleted': deleted, 'chunks': chunks, 'seconds': seconds,
+            }
+        const.log.info((
+            'cleaned `{deleted}` records from `{self._table_name}` in '
+            '`{chunks}` chunks over `{seconds:.3f}` seconds ...'
+        ).format(self=self, deleted=deleted, chunks=chunks, seconds=seconds))
         self._last_cleaned = time.time()
-        return deletion_results['deleted']
+        return deleted
 
     def validate(self) -> bool:
         """ Self validates the RethinkDB pipe.
@@ -146,7 +376,18 @@ class RethinkDBPipe(AbstractPipe):
         """
 
         try:
-            self.connection
+            connection = self.connection
+            # NOTE: reused connections are checked against the server
+            with self._lock:
+                self._checks += 1
+            try:
+                connection.server()
+            except rethinkdb.errors.ReqlDriverError as exc:
+                const.log.warning((
+                    'connection of `{self}` failed its health check, '
+                    'reconnecting, {exc} ...'
+                ).format(self=self, exc=exc))
+                self._reconnect(connection)
             return True
         except rethinkdb.errors.ReqlDriverError as exc:
             pass
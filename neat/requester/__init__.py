@@ -5,4 +5,8 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 from ._common import *
-from .obvius import ObviusRequester
+from .breaker import BreakerState, CircuitBreaker
+from .obvius import (
+    ObviusRequester, ObviusHostRequester, AsyncObviusRequester,
+    ObviusLogRequester, ObviusHostLogRequester
+)
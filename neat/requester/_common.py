@@ -5,22 +5,175 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 import abc
+import multiprocessing
+from typing import Tuple
 
 import blinker
 
 
+class LatencyStats(object):
+    """ The observed response latency of a host.
+
+    .. note:: Values live in shared memory so they are readable by the
+        engine even when recorded from a forked scheduler process
+    """
+
+    fields = ('count', 'timeouts', 'total', 'max',)
+    baseline_fields = ('count', 'timeouts', 'mean', 'max', 'p50', 'p95',)
+
+    def __init__(self, window: int=128):
+        """ Initializes the latency stats.
+
+        :param window: The number of recent samples kept for percentiles
+        :type window: int
+        """
+
+        self._window = window
+        # NOTE: the counters are followed by the marked baseline and the
+        # ring of recent samples
+        self._values = multiprocessing.Array('d', (
+            len(self.fields) + len(self.baseline_fields) + window
+        ))
+        self._samples = (len(self.fields) + len(self.baseline_fields))
+
+    def record(self, seconds: float, timeout: bool=False) -> None:
+        """ Records the latency of a response.
+
+        :param seconds: The seconds the host took to respond
+        :type seconds: float
+        :param timeout: True if the host did not respond in time
+        :type timeout: bool
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._values.get_lock():
+            index = (int(self._values[0]) % self._window)
+            self._values[self._samples + index] = seconds
+            self._values[0] += 1
+            self._values[1] += int(timeout)
+            self._values[2] += seconds
+            self._values[3] = max(self._values[3], seconds)
+
+    def _stats(self) -> dict:
+        """ Computes the stats of the recorded latency.
+
+        .. note:: Requires the lock of the shared values to be held
+
+        :returns: The stats of the recorded latency
+        :rtype: dict
+        """
+
+        (count, timeouts, total, maximum) = self._values[:len(self.fields)]
+        samples = sorted(self._values[
+            self._samples:(self._samples + min(int(count), self._window))
+        ])
+        stats = {
+            'count': int(count),
+            'timeouts': int(timeouts),
+            'mean': ((total / count) if count > 0 else 0.0),
+            'max': maximum,
+        }
+        for (name, percent) in (('p50', 0.5), ('p95', 0.95),):
+            stats[name] = (
+                samples[min(int(len(samples) * percent), len(samples) - 1)]
+                if len(samples) > 0 else
+                0.0
+            )
+        return stats
+
+    def mark(self) -> dict:
+        """ Marks the current stats as the baseline of later stats.
+
+        :returns: The marked baseline stats
+        :rtype: dict
+        """
+
+        offset = len(self.fields)
+        with self._values.get_lock():
+            stats = self._stats()
+            for (index, field) in enumerate(self.baseline_fields):
+                self._values[offset + index] = stats[field]
+        return {field: stats[field] for field in self.baseline_fields}
+
+    def to_dict(self) -> dict:
+        """ Builds a serializable representation of the latency stats.
+
+        :returns: A serializable representation of the latency stats
+        :rtype: dict
+        """
+
+        offset = len(self.fields)
+        with self._values.get_lock():
+            stats = self._stats()
+            stats['baseline'] = dict(zip(
+                self.baseline_fields,
+                self._values[offset:(offset + len(self.baseline_fields))]
+            ))
+        for field in ('count', 'timeouts'):
+            stats['baseline'][field] = int(stats['baseline'][field])
+        return stats
+
+
 class AbstractRequester(object, metaclass=abc.ABCMeta):
     """ The abstract class for requester classes.
     """
 
     signal = blinker.Signal()
 
+    @property
+    def host(self) -> Tuple[str, int]:
+        """ The host the requester requests from, None if not applicable.
+        """
+
+        return None
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the requester.
+        """
+
+        return {}
+
     @abc.abstractmethod
-    def request(self) -> None:
+    def request(self, timeout: float=None) -> None:
         """ The requester method for making requests.
 
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
         :returns: Does not return
         :rtype: None
         """
 
         raise NotImplementedError()
+
+
+class AbstractAsyncRequester(object, metaclass=abc.ABCMeta):
+    """ The abstract class for asyncio requester classes.
+    """
+
+    @property
+    def host(self) -> Tuple[str, int]:
+        """ The host the requester requests from, None if not applicable.
+        """
+
+        return None
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the requester.
+        """
+
+        return {}
+
+    @abc.abstractmethod
+    async def request(self, timeout: float=None) -> Tuple[str, dict]:
+        """ The requester coroutine for making requests.
+
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
+        :returns: A tuple of the retrieved data and meta, None on failure
+        :rtype: tuple
+        """
+
+        raise NotImplementedError()
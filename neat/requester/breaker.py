@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import enum
+import time
+import random
+import multiprocessing
+
+from .. import const
+
+import blinker
+
+
+class BreakerState(enum.Enum):
+    """ An enumeration of circuit breaker states.
+    """
+
+    CLOSED    = 'closed'
+    OPEN      = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class _SharedField(object):
+    """ A circuit breaker field kept in the breaker's shared values.
+    """
+
+    def __init__(self, index: int, load=float, dump=float):
+        """ Initializes the shared field.
+
+        :param index: The index of the field in the shared values
+        :type index: int
+        :param load: Converts the shared value to the field's value (float)
+        :type load: callable
+        :param dump: Converts the field's value to the shared value (float)
+        :type dump: callable
+        """
+
+        (self.index, self.load, self.dump) = (index, load, dump)
+
+    def __get__(self, instance, owner):
+        """ Reads the field from the breaker's shared values.
+
+        :param instance: The breaker the field is read from
+        :type instance: CircuitBreaker
+        :param owner: The class of the breaker
+        :type owner: type
+        :returns: The value of the field
+        :rtype: Any
+        """
+
+        if instance is None:
+            return self
+        return self.load(instance._values[self.index])
+
+    def __set__(self, instance, value) -> None:
+        """ Writes the field to the breaker's shared values.
+
+        :param instance: The breaker the field is written to
+        :type instance: CircuitBreaker
+        :param value: The new value of the field
+        :type value: Any
+        :returns: Does not return
+        :rtype: None
+        """
+
+        instance._values[self.index] = self.dump(value)
+
+
+class CircuitBreaker(object):
+    """ A circuit breaker guarding requests to a single host.
+
+    The breaker opens after ``threshold`` consecutive failures, rejecting
+    requests until an exponentially growing (and jittered) delay has passed.
+    It then half opens, allowing a single probe request through which
+    either closes the breaker on success or opens it again on failure.
+
+    .. note:: Transitions are sent through the class level ``signal``,
+        the breaker's state lives in shared memory so it guards its host for
+        every forked scheduler process and is readable by the engine
+    """
+
+    signal = blinker.Signal()
+    _states = tuple(BreakerState)
+
+    _state = _SharedField(
+        0, load=(lambda value: CircuitBreaker._states[int(value)]),
+        dump=(lambda state: CircuitBreaker._states.index(state))
+    )
+    _failures = _SharedField(1, load=int)
+    _opens = _SharedField(2, load=int)
+    _rejected = _SharedField(3, load=int)
+    _retry_at = _SharedField(4)
+    _probing = _SharedField(5, load=bool)
+    # NOTE: the count of transitions is followed by a ring of the recent
+    # transitions' times, previous and new states
+    _transition_count = _SharedField(6, load=int)
+    _transitions_offset = 7
+
+    def __init__(
+        self, name: str,
+        threshold: int=3, delay: float=5.0, max_delay: float=300.0,
+        backoff: float=2.0, jitter: float=0.1, history: int=16
+    ):
+        """ Initializes the circuit breaker.
+
+        :param name: The name of the guarded host
+        :type name: str
+        :param threshold: The consecutive failures which open the breaker (3)
+        :type threshold: int
+        :param delay: The seconds before the first probe request (5.0)
+        :type delay: float
+        :param max_delay: The maximum seconds in between probe requests (300)
+        :type max_delay: float
+        :param backoff: The delay multiplier for each failed probe (2.0)
+        :type backoff: float
+        :param jitter: The bounded jitter as a fraction of the delay (0.1)
+        :type jitter: float
+        :param history: The number of recent transitions kept (16)
+        :type history: int
+        """
+
+        self.name = name
+        (self.threshold, self.backoff) = (int(threshold), float(backoff))
+        (self.delay, self.max_delay) = (float(delay), float(max_delay))
+        self.jitter = min(max(float(jitter), 0.0), 1.0)
+        self.history = max(int(history), 1)
+        self._values = multiprocessing.Array(
+            'd', (self._transitions_offset + (self.history * 3))
+        )
+        self._lock = self._values.get_lock()
+
+    def __repr__(self):
+        """ A string representation of the circuit breaker.
+
+        :returns: A string representation of the circuit breaker
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} "{self.name}" '
+            'state={self._state.value}>'
+        ).format(self=self)
+
+    @property
+    def state(self) -> BreakerState:
+        """ The current state of the breaker.
+        """
+
+        return self._state
+
+    def _transition(self, state: BreakerState) -> None:
+        """ Moves the breaker to a new state.
+
+        .. note:: Expects the breaker's lock to be held
+
+        :param state: The new state of the breaker
+        :type state: BreakerState
+        :returns: Does not return
+        :rtype: None
+        """
+
+        (previous, self._state) = (self._state, state)
+        offset = (
+            self._transitions_offset +
+            ((self._transition_count % self.history) * 3)
+        )
+        self._values[offset:(offset + 3)] = [
+            time.time(),
+            self._states.index(previous), self._states.index(state),
+        ]
+        self._transition_count += 1
+        if state == BreakerState.OPEN:
+            delay = min(
+                (self.delay * (self.backoff ** (self._opens - 1))),
+                self.max_delay
+            )
+            delay *= (1.0 + random.uniform(-self.jitter, self.jitter))
+            self._retry_at = (time.monotonic() + delay)
+            const.log.warning((
+                'circuit breaker `{self.name}` opened after `{failures}` '
+                'failures, probing again in `{delay:.3f}` seconds ...'
+            ).format(self=self, failures=self._failures, delay=delay))
+        else:
+            const.log.info((
+                'circuit breaker `{self.name}` moved from `{previous}` '
+                'to `{state}` ...'
+            ).format(self=self, previous=previous.value, state=state.value))
+        self.signal.send(self, previous=previous, state=state)
+
+    def allow(self) -> bool:
+        """ Checks if a request to the host may be made.
+
+        :returns: True if the request may be made, otherwise False
+        :rtype: bool
+        """
+
+        with self._lock:
+            if self._state == BreakerState.OPEN and \
+                    time.monotonic() >= self._retry_at:
+                self._transition(BreakerState.HALF_OPEN)
+            if self._state == BreakerState.CLOSED:
+                return True
+            if self._state == BreakerState.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self._rejected += 1
+            return False
+
+    def success(self) -> None:
+        """ Records a successful request, closing the breaker.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            (self._failures, self._opens, self._probing) = (0, 0, False)
+            if self._state != BreakerState.CLOSED:
+                self._transition(BreakerState.CLOSED)
+
+    def failure(self) -> None:
+        """ Records a failed request, opening the breaker if necessary.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            self._failures += 1
+            if self._state == BreakerState.HALF_OPEN or (
+                self._state == BreakerState.CLOSED and
+                self._failures >= self.threshold
+            ):
+                (self._opens, self._probing) = ((self._opens + 1), False)
+                self._transition(BreakerState.OPEN)
+
+    def release(self) -> None:
+        """ Ends a request which neither succeeded nor failed.
+
+        .. note:: Allows a new probe if the request was the breaker's probe
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            if self._state == BreakerState.HALF_OPEN:
+                self._probing = False
+
+    def to_dict(self) -> dict:
+        """ Builds a serializable representation of the breaker.
+
+        :returns: A serializable representation of the breaker
+        :rtype: dict
+        """
+
+        with self._lock:
+            count = self._transition_count
+            transitions = []
+            for index in range(max(count - self.history, 0), count):
+                offset = (
+                    self._transitions_offset + ((index % self.history) * 3)
+                )
+                (at, previous, state) = self._values[offset:(offset + 3)]
+                transitions.append((
+                    at, self._states[int(previous)].value,
+                    self._states[int(state)].value,
+                ))
+            return {
+                'state': self._state.value,
+                'failures': self._failures,
+                'opens': self._opens,
+                'rejected': self._rejected,
+                'retry_in': (
+                    max((self._retry_at - time.monotonic()), 0.0)
+                    if self._state == BreakerState.OPEN else
+                    0.0
+                ),
+                'transitions': transitions,
+            }
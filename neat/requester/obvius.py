@@ -4,13 +4,21 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import copy
 import urllib
+import asyncio
+from typing import Tuple, List, Iterator
 
 from .. import const
-from ._common import AbstractRequester
+from ._common import AbstractRequester, AbstractAsyncRequester, LatencyStats
+from .pool import SessionPool
+from .breaker import CircuitBreaker
+from ..translator.obvius import parse_xml
 
 import blinker
+import aiohttp
 import requests
+import lxml.etree
 
 
 class ObviusRequester(AbstractRequester):
@@ -18,11 +26,16 @@ class ObviusRequester(AbstractRequester):
     """
 
     _request_endpoint = '/setup/devicexml.cgi'
+    session_pool = SessionPool()
+    host_latency = {}
+    host_breakers = {}
 
     def __init__(
         self, device_id: int, obvius_ip: str,
         obvius_user: str, obvius_pass: str, obvius_port: int=80,
-        timeout: int=10, **kwargs: dict
+        timeout: int=10, pool_size: int=10, pool_idle_timeout: float=300.0,
+        breaker_threshold: int=3, breaker_delay: float=5.0,
+        breaker_max_delay: float=300.0, **kwargs: dict
     ):
         """ The Obvius requester initializer.
 
@@ -38,15 +51,40 @@ class ObviusRequester(AbstractRequester):
         :type obvius_port: int
         :param timeout: The request timeout period (10 seconds)
         :type timeout: int
+        :param pool_size: The keep-alive connections kept for the host (10)
+        :type pool_size: int
+        :param pool_idle_timeout: Seconds before idle connections close (300)
+        :type pool_idle_timeout: float
+        :param breaker_threshold: The failures which open the host breaker (3)
+        :type breaker_threshold: int
+        :param breaker_delay: The seconds before probing an opened host (5.0)
+        :type breaker_delay: float
+        :param breaker_max_delay: The maximum seconds in between probes (300)
+        :type breaker_max_delay: float
         :param kwargs: Any additional attributes for valid record creation
         :type kwargs: dict
+
+        .. note:: The first requester of a host sets its pool and breaker
+            options, its latency and breaker are created right away so
+            they are shared with the processes of forked schedulers
         """
 
         self._device_id = device_id
         self._timeout = timeout
+        (self._pool_size, self._pool_idle_timeout) = (
+            pool_size, pool_idle_timeout
+        )
+        self._breaker_options = dict(
+            threshold=breaker_threshold, delay=breaker_delay,
+            max_delay=breaker_max_delay
+        )
         (self._obvius_ip, self._obvius_port) = (obvius_ip, obvius_port)
         (self._obvius_user, self._obvius_pass) = (obvius_user, obvius_pass)
         self._meta = kwargs
+        # NOTE: created before any scheduler forks so the shared memory of
+        # the host's latency and breaker is inherited
+        for attribute in ('latency', 'breaker',):
+            getattr(self, attribute)
 
     def __repr__(self):
         """ Generates string representation of the obvius requester.
@@ -60,35 +98,150 @@ class ObviusRequester(AbstractRequester):
             '({self._obvius_ip}:{self._obvius_port}) {self._device_id}>'
         ).format(self=self))
 
-    def request(self) -> None:
+    @property
+    def host(self) -> Tuple[str, int]:
+        """ The ip and port of the Obvius server.
+        """
+
+        return (self._obvius_ip, self._obvius_port)
+
+    @property
+    def url(self) -> str:
+        """ The device status url of the Obvius server.
+        """
+
+        return urllib.parse.urljoin(
+            'http://{self._obvius_ip}:{self._obvius_port}'.format(self=self),
+            self._request_endpoint
+        )
+
+    @property
+    def params(self) -> dict:
+        """ The query parameters for requesting the device status.
+        """
+
+        return {'ADDRESS': self._device_id, 'TYPE': 'DATA'}
+
+    @property
+    def latency(self) -> LatencyStats:
+        """ The observed response latency of the requester's host.
+        """
+
+        if self.host not in self.host_latency:
+            self.host_latency[self.host] = LatencyStats()
+        return self.host_latency[self.host]
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """ The circuit breaker guarding the requester's host.
+
+        .. note:: Breakers live in shared memory, requesters driven by
+            forked schedulers guard their host together
+        """
+
+        if self.host not in self.host_breakers:
+            self.host_breakers[self.host] = CircuitBreaker(
+                '{self._obvius_ip}:{self._obvius_port}'.format(self=self),
+                **self._breaker_options
+            )
+        return self.host_breakers[self.host]
+
+    @property
+    def metrics(self) -> dict:
+        """ The host latency, breaker and session reuse metrics.
+        """
+
+        return {
+            'latency': self.latency.to_dict(),
+            'breaker': self.breaker.to_dict(),
+            'pool': self.session_pool.metrics['sessions'].get(
+                '{self._obvius_user}@{self._obvius_ip}:{self._obvius_port}'
+                .format(self=self),
+                {}
+            ),
+        }
+
+    @property
+    def session(self) -> requests.Session:
+        """ The keep-alive session shared by requesters of the same host.
+        """
+
+        return self.session_pool.session(
+            (
+                self._obvius_ip, self._obvius_port,
+                self._obvius_user, self._obvius_pass
+            ),
+            pool_size=self._pool_size,
+            idle_timeout=self._pool_idle_timeout
+        )
+
+    def effective_timeout(self, timeout: float=None) -> float:
+        """ Resolves the effective timeout of a request.
+
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
+        :returns: The lesser of the budget and the requester's timeout
+        :rtype: float
+        """
+
+        if timeout is None:
+            return self._timeout
+        return min(timeout, self._timeout)
+
+    def request(self, timeout: float=None) -> None:
         """ Request information from the obvius.
 
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
         :returns: Does not return
         :rtype: None
         """
 
+        timeout = self.effective_timeout(timeout)
+        if not self.breaker.allow():
+            const.log.debug((
+                'skipping device `{self._device_id}` request, circuit '
+                'breaker of `{self._obvius_ip}` is open ...'
+            ).format(self=self))
+            return
         const.log.debug((
             'requesting device `{self._device_id}` status from '
             '`{self._obvius_ip}` ...'
         ).format(self=self))
         try:
-            requests.get(
-                urllib.parse.urljoin(
-                    (
-                        'http://{self._obvius_ip}:{self._obvius_port}'
-                    ).format(self=self),
-                    self._request_endpoint
-                ),
+            self.session.get(
+                self.url,
                 auth=(self._obvius_user, self._obvius_pass),
-                params={'ADDRESS': self._device_id, 'TYPE': 'DATA'},
+                params=self.params,
                 hooks=dict(response=self.receive),
-                timeout=self._timeout
+                timeout=timeout
             )
-        except requests.exceptions.ConnectTimeout as exc:
+        except requests.exceptions.Timeout as exc:
+            self.latency.record(timeout, timeout=True)
+            self.breaker.failure()
             const.log.error((
-                'connection timeout occured after `{self._timeout}` seconds '
+                'connection timeout occured after `{timeout}` seconds '
                 'for device `{self._device_id}` at `{self._obvius_ip}` ...'
-            ).format(self=self))
+            ).format(self=self, timeout=timeout))
+        except requests.exceptions.RequestException as exc:
+            self.breaker.failure()
+            const.log.error((
+                'request failed for device `{self._device_id}` at '
+                '`{self._obvius_ip}`, {exc} ...'
+            ).format(self=self, exc=exc))
+        finally:
+            self.breaker.release()
+
+    def split(self, data: str) -> Iterator[Tuple[str, dict]]:
+        """ Splits received data into the payloads of individual devices.
+
+        :param data: The data received from the Obvius server
+        :type data: str
+        :returns: A generator of device data and meta tuples
+        :rtype: Iterator[tuple]
+        """
+
+        yield (data, self._meta)
 
     def receive(self, resp: requests.Response, *args, **kwargs) -> None:
         """ The receiver of information from the requester.
@@ -103,13 +256,518 @@ class ObviusRequester(AbstractRequester):
         :rtype: None
         """
 
+        self.latency.record(resp.elapsed.total_seconds())
+        # NOTE: only server errors count against the host's breaker
+        if resp.status_code >= 500:
+            self.breaker.failure()
+        else:
+            self.breaker.success()
         if resp.status_code == 200:
             const.log.debug((
                 'received response from `{resp.url}` ...'
             ).format(resp=resp))
-            self.signal.send(self, data=resp.text, meta=self._meta)
+            for (data, meta) in self.split(resp.text):
+                self.signal.send(self, data=data, meta=meta)
         else:
             const.log.error((
                 'received invalid response from `{resp.url}` '
                 '({resp.status_code}) ...'
             ).format(resp=resp))
+
+
+class ObviusHostRequester(ObviusRequester):
+    """ The batched requester for many devices of the same Obvius server.
+
+    Every configured device of the host is fetched in a single sweep and the
+    returned ``<devices>`` are demultiplexed into per device payloads, each
+    sent with the configured meta of its device.
+    For example:
+
+    .. code-block:: yaml
+
+        requester:
+          $:           ObviusHostRequester
+          obvius_ip:   127.0.0.1
+          obvius_user: user
+          obvius_pass: pass
+          devices:
+            - device_id: 18
+              name:      solar_therm.1
+              type:      SOLAR_THERM
+            - device_id: 19
+              name:      wind.1
+              type:      WIND
+    """
+
+    def __init__(
+        self, devices: List[dict], obvius_ip: str,
+        obvius_user: str, obvius_pass: str, obvius_port: int=80,
+        timeout: int=10, pool_size: int=10, pool_idle_timeout: float=300.0,
+        breaker_threshold: int=3, breaker_delay: float=5.0,
+        breaker_max_delay: float=300.0
+    ):
+        """ The Obvius host requester initializer.
+
+        :param devices: The meta of each device, including its ``device_id``
+        :type devices: list
+        :param obvius_ip: The IP of the Obvius server
+        :type obvius_ip: str
+        :param obvius_user: The auth username of the Obvius server
+        :type obvius_user: str
+        :param obvius_pass: The auth password of the Obvius server (readonly)
+        :type obvius_pass: str
+        :param obvius_port: The port of the Obvius server (80)
+        :type obvius_port: int
+        :param timeout: The request timeout period (10 seconds)
+        :type timeout: int
+        :param pool_size: The keep-alive connections kept for the host (10)
+        :type pool_size: int
+        :param pool_idle_timeout: Seconds before idle connections close (300)
+        :type pool_idle_timeout: float
+        :param breaker_threshold: The failures which open the host breaker (3)
+        :type breaker_threshold: int
+        :param breaker_delay: The seconds before probing an opened host (5.0)
+        :type breaker_delay: float
+        :param breaker_max_delay: The maximum seconds in between probes (300)
+        :type breaker_max_delay: float
+        """
+
+        super().__init__(
+            None, obvius_ip, obvius_user, obvius_pass,
+            obvius_port=obvius_port, timeout=timeout,
+            pool_size=pool_size, pool_idle_timeout=pool_idle_timeout,
+            breaker_threshold=breaker_threshold, breaker_delay=breaker_delay,
+            breaker_max_delay=breaker_max_delay
+        )
+        self._devices = {}
+        for device in devices:
+            device = dict(device)
+            self._devices[str(device.pop('device_id'))] = device
+        self._device_id = sorted(self._devices.keys())
+
+    @property
+    def params(self) -> dict:
+        """ The query parameters for requesting every device status.
+        """
+
+        return {'TYPE': 'DATA'}
+
+    def split(self, data: str) -> Iterator[Tuple[str, dict]]:
+        """ Splits the host's data into the payloads of configured devices.
+
+        :param data: The data received from the Obvius server
+        :type data: str
+        :returns: A generator of device data and meta tuples
+        :rtype: Iterator[tuple]
+        """
+
+        try:
+            root = parse_xml(data)
+        except lxml.etree.XMLSyntaxError as exc:
+            const.log.error((
+                'received unparsable devices from `{self._obvius_ip}`, '
+                '{exc} ...'
+            ).format(self=self, exc=exc))
+            return
+        found = set()
+        for device in root.iter('device'):
+            address = (device.findtext('address') or '').strip()
+            if address not in self._devices:
+                continue
+            found.add(address)
+            payload = lxml.etree.Element(root.tag)
+            for child in root:
+                if child.tag != 'devices':
+                    payload.append(copy.deepcopy(child))
+            lxml.etree.SubElement(payload, 'devices').append(
+                copy.deepcopy(device)
+            )
+            yield (
+                lxml.etree.tostring(payload, encoding='unicode'),
+                self._devices[address]
+            )
+        for address in (set(self._devices.keys()) - found):
+            const.log.warning((
+                'device `{address}` was missing from the devices of '
+                '`{self._obvius_ip}` ...'
+            ).format(self=self, address=address))
+
+
+class AsyncObviusRequester(ObviusRequester, AbstractAsyncRequester):
+    """ The asyncio requester for the Obvius server.
+
+    .. note:: Requesters share one :class:`aiohttp.ClientSession` per host
+    """
+
+    _sessions = {}
+    _semaphores = {}
+
+    def __init__(
+        self, device_id: int, obvius_ip: str,
+        obvius_user: str, obvius_pass: str, obvius_port: int=80,
+        timeout: int=10, host_concurrency: int=4, **kwargs: dict
+    ):
+        """ The async Obvius requester initializer.
+
+        :param device_id: The id of the Obvius device to request
+        :type device_id: int
+        :param obvius_ip: The IP of the Obvius server
+        :type obvius_ip: str
+        :param obvius_user: The auth username of the Obvius server
+        :type obvius_user: str
+        :param obvius_pass: The auth password of the Obvius server (readonly)
+        :type obvius_pass: str
+        :param obvius_port: The port of the Obvius server (80)
+        :type obvius_port: int
+        :param timeout: The request timeout period (10 seconds)
+        :type timeout: int
+        :param host_concurrency: The maximum in flight requests per host (4)
+        :type host_concurrency: int
+        :param kwargs: Any additional attributes for valid record creation
+        :type kwargs: dict
+
+        .. note:: The first requester to request a host sets its concurrency
+        """
+
+        super().__init__(
+            device_id, obvius_ip, obvius_user, obvius_pass,
+            obvius_port=obvius_port, timeout=timeout, **kwargs
+        )
+        self._host_concurrency = host_concurrency
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """ The client session shared by all requesters of the same host.
+
+        .. note:: Must be accessed from within the running event loop
+        """
+
+        if self.host not in self._sessions or \
+                self._sessions[self.host].closed:
+            self._sessions[self.host] = aiohttp.ClientSession()
+        return self._sessions[self.host]
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """ The semaphore limiting concurrent requests to the same host.
+        """
+
+        if self.host not in self._semaphores:
+            self._semaphores[self.host] = asyncio.Semaphore(
+                self._host_concurrency
+            )
+        return self._semaphores[self.host]
+
+    @classmethod
+    async def close(cls) -> None:
+        """ Closes all of the shared client sessions.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for session in cls._sessions.values():
+            await session.close()
+        cls._sessions.clear()
+        cls._semaphores.clear()
+
+    async def request(self, timeout: float=None) -> Tuple[str, dict]:
+        """ Request information from the obvius.
+
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
+        :returns: A tuple of the retrieved data and meta, None on failure
+        :rtype: tuple
+        """
+
+        timeout = self.effective_timeout(timeout)
+        if not self.breaker.allow():
+            const.log.debug((
+                'skipping device `{self._device_id}` request, circuit '
+                'breaker of `{self._obvius_ip}` is open ...'
+            ).format(self=self))
+            return
+        const.log.debug((
+            'requesting device `{self._device_id}` status from '
+            '`{self._obvius_ip}` ...'
+        ).format(self=self))
+        async with self.semaphore:
+            started = asyncio.get_event_loop().time()
+            try:
+                async with self.session.get(
+                    self.url,
+                    auth=aiohttp.BasicAuth(
+                        self._obvius_user, self._obvius_pass
+                    ),
+                    params=self.params,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as resp:
+                    self.latency.record(
+                        asyncio.get_event_loop().time() - started
+                    )
+                    if resp.status >= 500:
+                        self.breaker.failure()
+                    else:
+                        self.breaker.success()
+                    if resp.status == 200:
+                        const.log.debug((
+                            'received response from `{resp.url}` ...'
+                        ).format(resp=resp))
+                        return (await resp.text(), self._meta)
+                    const.log.error((
+                        'received invalid response from `{resp.url}` '
+                        '({resp.status}) ...'
+                    ).format(resp=resp))
+            except asyncio.TimeoutError as exc:
+                self.latency.record(timeout, timeout=True)
+                self.breaker.failure()
+                const.log.error((
+                    'connection timeout occured after `{timeout}` '
+                    'seconds for device `{self._device_id}` at '
+                    '`{self._obvius_ip}` ...'
+                ).format(self=self, timeout=timeout))
+            except aiohttp.ClientError as exc:
+                self.breaker.failure()
+                const.log.error((
+                    'request failed for device `{self._device_id}` at '
+                    '`{self._obvius_ip}`, {exc} ...'
+                ).format(self=self, exc=exc))
+            finally:
+                self.breaker.release()
+
+
+class ObviusLogRequester(ObviusRequester):
+    """ The requester of a device's stored interval log on the Obvius server.
+
+    Instead of the newest status the AcquiSuite's interval log (a csv of
+    every logged interval) is downloaded and streamed line by line, which
+    allows backfilling periods the live requesters missed.
+
+    .. note:: The log endpoint differs in between AcquiSuite firmwares and
+        can be configured with ``log_endpoint``
+    """
+
+    _request_endpoint = '/setup/devicelogfile.cgi'
+
+    def __init__(
+        self, device_id: int, obvius_ip: str,
+        obvius_user: str, obvius_pass: str, obvius_port: int=80,
+        timeout: int=60, log_endpoint: str=None, chunk_size: int=65536,
+        pool_size: int=10, pool_idle_timeout: float=300.0,
+        breaker_threshold: int=3, breaker_delay: float=5.0,
+        breaker_max_delay: float=300.0, **kwargs: dict
+    ):
+        """ The Obvius log requester initializer.
+
+        :param device_id: The id of the Obvius device to request
+        :type device_id: int
+        :param obvius_ip: The IP of the Obvius server
+        :type obvius_ip: str
+        :param obvius_user: The auth username of the Obvius server
+        :type obvius_user: str
+        :param obvius_pass: The auth password of the Obvius server (readonly)
+        :type obvius_pass: str
+        :param obvius_port: The port of the Obvius server (80)
+        :type obvius_port: int
+        :param timeout: The request timeout period (60 seconds)
+        :type timeout: int
+        :param log_endpoint: The endpoint of the log download (class default)
+        :type log_endpoint: str
+        :param chunk_size: The bytes read at once from the download (65536)
+        :type chunk_size: int
+        :param pool_size: The keep-alive connections kept for the host (10)
+        :type pool_size: int
+        :param pool_idle_timeout: Seconds before idle connections close (300)
+        :type pool_idle_timeout: float
+        :param breaker_threshold: The failures which open the host breaker (3)
+        :type breaker_threshold: int
+        :param breaker_delay: The seconds before probing an opened host (5.0)
+        :type breaker_delay: float
+        :param breaker_max_delay: The maximum seconds in between probes (300)
+        :type breaker_max_delay: float
+        :param kwargs: Any additional attributes for valid record creation
+        :type kwargs: dict
+        """
+
+        super().__init__(
+            device_id, obvius_ip, obvius_user, obvius_pass,
+            obvius_port=obvius_port, timeout=timeout,
+            pool_size=pool_size, pool_idle_timeout=pool_idle_timeout,
+            breaker_threshold=breaker_threshold, breaker_delay=breaker_delay,
+            breaker_max_delay=breaker_max_delay, **kwargs
+        )
+        if log_endpoint:
+            self._request_endpoint = log_endpoint
+        self._chunk_size = chunk_size
+
+    @property
+    def devices(self) -> List[Tuple[str, dict]]:
+        """ The device ids and meta of the logs to download.
+        """
+
+        return [(str(self._device_id), self._meta)]
+
+    def log_params(self, device_id: str) -> dict:
+        """ The query parameters for downloading a device's log.
+
+        :param device_id: The id of the device whose log is downloaded
+        :type device_id: str
+        :returns: The query parameters of the log download
+        :rtype: dict
+        """
+
+        return {'ADDRESS': device_id, 'TYPE': 'LOGFILE'}
+
+    def fetch(self, device_id: str, timeout: float=None) -> Iterator[str]:
+        """ Streams the lines of a device's interval log.
+
+        :param device_id: The id of the device whose log is downloaded
+        :type device_id: str
+        :param timeout: The budget of the request, None if unbounded
+        :type timeout: float
+        :returns: A generator of the log's lines, empty on failure
+        :rtype: Iterator[str]
+        """
+
+        timeout = self.effective_timeout(timeout)
+        if not self.breaker.allow():
+            const.log.debug((
+                'skipping device `{device_id}` log download, circuit '
+                'breaker of `{self._obvius_ip}` is open ...'
+            ).format(self=self, device_id=device_id))
+            return
+        const.log.debug((
+            'downloading device `{device_id}` log from `{self._obvius_ip}` '
+            '...'
+        ).format(self=self, device_id=device_id))
+        try:
+            resp = self.session.get(
+                self.url,
+                auth=(self._obvius_user, self._obvius_pass),
+                params=self.log_params(device_id),
+                timeout=timeout, stream=True
+            )
+        except requests.exceptions.Timeout as exc:
+            self.latency.record(timeout, timeout=True)
+            self.breaker.failure()
+            const.log.error((
+                'connection timeout occured after `{timeout}` seconds '
+                'for device `{device_id}` log at `{self._obvius_ip}` ...'
+            ).format(self=self, timeout=timeout, device_id=device_id))
+            return
+        except requests.exceptions.RequestException as exc:
+            self.breaker.failure()
+            const.log.error((
+                'log download failed for device `{device_id}` at '
+                '`{self._obvius_ip}`, {exc} ...'
+            ).format(self=self, device_id=device_id, exc=exc))
+            return
+        else:
+            with resp:
+                self.latency.record(resp.elapsed.total_seconds())
+                if resp.status_code >= 500:
+                    self.breaker.failure()
+                else:
+                    self.breaker.success()
+                if resp.status_code != 200:
+                    const.log.error((
+                        'received invalid response from `{resp.url}` '
+                        '({resp.status_code}) ...'
+                    ).format(resp=resp))
+                    return
+                if resp.encoding is None:
+                    resp.encoding = 'utf-8'
+                for line in resp.iter_lines(
+                    chunk_size=self._chunk_size, decode_unicode=True
+                ):
+                    if line:
+                        yield line
+        finally:
+            self.breaker.release()
+
+    def request(self, timeout: float=None) -> None:
+        """ Request the interval logs from the obvius.
+
+        .. note:: Every log is sent as a single payload, prefer
+            :meth:`fetch` for streaming large logs
+
+        :param timeout: The scheduled budget of the request, None if unbounded
+        :type timeout: float
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for (device_id, meta) in self.devices:
+            lines = list(self.fetch(device_id, timeout=timeout))
+            if len(lines) > 0:
+                self.signal.send(self, data='\n'.join(lines), meta=meta)
+
+
+class ObviusHostLogRequester(ObviusLogRequester):
+    """ The requester of the interval logs of many devices of the same host.
+
+    Accepts the same ``devices`` as :class:`ObviusHostRequester`, each
+    device's log is downloaded in turn over the host's shared session.
+    """
+
+    def __init__(
+        self, devices: List[dict], obvius_ip: str,
+        obvius_user: str, obvius_pass: str, obvius_port: int=80,
+        timeout: int=60, log_endpoint: str=None, chunk_size: int=65536,
+        pool_size: int=10, pool_idle_timeout: float=300.0,
+        breaker_threshold: int=3, breaker_delay: float=5.0,
+        breaker_max_delay: float=300.0
+    ):
+        """ The Obvius host log requester initializer.
+
+        :param devices: The meta of each device, including its ``device_id``
+        :type devices: list
+        :param obvius_ip: The IP of the Obvius server
+        :type obvius_ip: str
+        :param obvius_user: The auth username of the Obvius server
+        :type obvius_user: str
+        :param obvius_pass: The auth password of the Obvius server (readonly)
+        :type obvius_pass: str
+        :param obvius_port: The port of the Obvius server (80)
+        :type obvius_port: int
+        :param timeout: The request timeout period (60 seconds)
+        :type timeout: int
+        :param log_endpoint: The endpoint of the log download (class default)
+        :type log_endpoint: str
+        :param chunk_size: The bytes read at once from the download (65536)
+        :type chunk_size: int
+        :param pool_size: The keep-alive connections kept for the host (10)
+        :type pool_size: int
+        :param pool_idle_timeout: Seconds before idle connections close (300)
+        :type pool_idle_timeout: float
+        :param breaker_threshold: The failures which open the host breaker (3)
+        :type breaker_threshold: int
+        :param breaker_delay: The seconds before probing an opened host (5.0)
+        :type breaker_delay: float
+        :param breaker_max_delay: The maximum seconds in between probes (300)
+        :type breaker_max_delay: float
+        """
+
+        super().__init__(
+            None, obvius_ip, obvius_user, obvius_pass,
+            obvius_port=obvius_port, timeout=timeout,
+            log_endpoint=log_endpoint, chunk_size=chunk_size,
+            pool_size=pool_size, pool_idle_timeout=pool_idle_timeout,
+            breaker_threshold=breaker_threshold, breaker_delay=breaker_delay,
+            breaker_max_delay=breaker_max_delay
+        )
+        self._devices = {}
+        for device in devices:
+            device = dict(device)
+            self._devices[str(device.pop('device_id'))] = device
+        self._device_id = sorted(self._devices.keys())
+
+    @property
+    def devices(self) -> List[Tuple[str, dict]]:
+        """ The device ids and meta of the logs to download.
+        """
+
+        return [
+            (device_id, self._devices[device_id])
+            for device_id in self._device_id
+        ]
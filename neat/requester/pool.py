@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import time
+import threading
+from typing import Tuple
+
+from .. import const
+
+import requests
+
+
+class SessionPool(object):
+    """ A process-wide pool of keep-alive sessions.
+
+    Sessions are keyed by ``(ip, port, user, pass)`` so every requester of
+    the same host shares warm connections instead of reconnecting per poll.
+
+    .. note:: Sessions are discarded (not closed) after a fork
+    """
+
+    def __init__(self, pool_size: int=10, idle_timeout: float=300.0):
+        """ Initializes the session pool.
+
+        :param pool_size: The default number of connections kept per session
+        :type pool_size: int
+        :param idle_timeout: The default seconds before idle sessions close
+        :type idle_timeout: float
+        """
+
+        (self.pool_size, self.idle_timeout) = (pool_size, idle_timeout)
+        self._entries = {}
+        self._evicted = 0
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """ A string representation of the session pool.
+
+        :returns: A string representation of the session pool
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} sessions={sessions}>'
+        ).format(self=self, sessions=len(self._entries))
+
+    def session(
+        self, key: Tuple[str, int, str, str],
+        pool_size: int=None, idle_timeout: float=None
+    ) -> requests.Session:
+        """ Retrieves the shared session for a key, creating it if needed.
+
+        :param key: The ``(ip, port, user, pass)`` tuple of the host
+        :type key: tuple
+        :param pool_size: The number of connections kept for a new session
+        :type pool_size: int
+        :param idle_timeout: The seconds before a new session is evicted
+        :type idle_timeout: float
+        :returns: The shared session for the key
+        :rtype: requests.Session
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            if self._pid != os.getpid():
+                (self._entries, self._pid) = ({}, os.getpid())
+            self._evict(now)
+            if key not in self._entries:
+                pool_size = (pool_size if pool_size else self.pool_size)
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=1, pool_maxsize=pool_size
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._entries[key] = {
+                    'session': session,
+                    'adapter': adapter,
+                    'idle_timeout': (
+                        idle_timeout
+                        if idle_timeout is not None else
+                        self.idle_timeout
+                    ),
+                    'requests': 0,
+                }
+                const.log.debug((
+                    'created pooled session for `{key[0]}:{key[1]}` '
+                    'with `{pool_size}` connections ...'
+                ).format(key=key, pool_size=pool_size))
+            entry = self._entries[key]
+            (entry['last_used'], entry['requests']) = (
+                now, (entry['requests'] + 1)
+            )
+            return entry['session']
+
+    def _evict(self, now: float) -> None:
+        """ Closes and removes sessions which have been idle for too long.
+
+        .. note:: Expects the pool's lock to be held
+
+        :param now: The current monotonic time
+        :type now: float
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for (key, entry) in list(self._entries.items()):
+            if (now - entry['last_used']) >= entry['idle_timeout']:
+                const.log.debug((
+                    'evicting idle pooled session for `{key[0]}:{key[1]}` ...'
+                ).format(key=key))
+                entry['session'].close()
+                del self._entries[key]
+                self._evicted += 1
+
+    def evict(self) -> None:
+        """ Closes and removes sessions which have been idle for too long.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            self._evict(time.monotonic())
+
+    def clear(self) -> None:
+        """ Closes and removes all sessions from the pool.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            for entry in self._entries.values():
+                entry['session'].close()
+            self._entries = {}
+
+    @property
+    def metrics(self) -> dict:
+        """ The connection reuse counters of each pooled session.
+        """
+
+        metrics = {'evicted': self._evicted, 'sessions': {}}
+        with self._lock:
+            for (key, entry) in self._entries.items():
+                connections = sum(
+                    entry['adapter'].poolmanager.pools[pool_key]
+                    .num_connections
+                    for pool_key in entry['adapter'].poolmanager.pools.keys()
+                )
+                metrics['sessions']['{}@{}:{}'.format(
+                    key[2], key[0], key[1]
+                )] = {
+                    'requests': entry['requests'],
+                    'connections': connections,
+                    'reused': max((entry['requests'] - connections), 0),
+                    'idle': (time.monotonic() - entry['last_used']),
+                }
+        return metrics
@@ -6,3 +6,7 @@
 
 from ._common import *
 from .simple import *
+from .shared import *
+from .asynchronous import *
+from .monotonic import *
+from .adaptive import *
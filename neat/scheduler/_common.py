@@ -5,11 +5,141 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 import abc
+import random
+import signal
 import multiprocessing
+from typing import Tuple, List
 
 import blinker
 
 
+def next_deadline(
+    deadline: float, delay: float, now: float, missed: str='skip'
+) -> Tuple[float, int]:
+    """ Computes the next absolute deadline of a fixed delay schedule.
+
+    Deadlines stay on the grid of ``deadline + n * delay`` regardless of how
+    long handling the previous tick took.
+    Ticks whose deadlines already passed are either skipped (waiting for the
+    next grid deadline) or coalesced (firing once immediately).
+
+    :param deadline: The deadline of the tick that was just handled
+    :type deadline: float
+    :param delay: The delay period in between ticks
+    :type delay: float
+    :param now: The current monotonic time
+    :type now: float
+    :param missed: The missed tick policy, ``skip`` or ``coalesce``
+    :type missed: str
+    :returns: A tuple of the next deadline and the number of dropped ticks
+    :rtype: tuple
+    """
+
+    deadline += delay
+    if deadline > now:
+        return (deadline, 0)
+    passed = int((now - deadline) // delay) + 1
+    if missed == 'coalesce':
+        return ((deadline + ((passed - 1) * delay)), (passed - 1))
+    return ((deadline + (passed * delay)), passed)
+
+
+def spread_phases(schedulers: List[object], jitter: float=0.0) -> None:
+    """ Spreads the first fire time of schedulers evenly across their delay.
+
+    The ``n`` given schedulers get phases at ``i / n`` of their own delay.
+    An optional jitter moves each phase by a random offset bounded by
+    ``jitter`` halves of a slot.
+
+    :param schedulers: The schedulers sharing a resource (such as a host)
+    :type schedulers: list
+    :param jitter: The bounded jitter as a fraction of a slot (0.0 - 1.0)
+    :type jitter: float
+    :returns: Does not return
+    :rtype: None
+    """
+
+    jitter = min(max(float(jitter), 0.0), 1.0)
+    for (index, scheduler) in enumerate(schedulers):
+        slot = (scheduler.delay / len(schedulers))
+        offset = (random.uniform(-jitter, jitter) * (slot / 2.0))
+        scheduler.phase = min(
+            max(((index * slot) + offset), 0.0),
+            (scheduler.delay - (slot / 2.0))
+        )
+
+
+class TickMetrics(object):
+    """ The tick telemetry of a scheduler.
+
+    .. note:: Values live in shared memory so they are readable by the
+        engine even when recorded from a forked scheduler process
+    """
+
+    fields = (
+        'ticks', 'overruns', 'skipped', 'shed',
+        'lateness', 'lateness_max', 'lateness_total',
+    )
+
+    def __init__(self):
+        """ Initializes the tick metrics.
+        """
+
+        self._values = multiprocessing.Array('d', len(self.fields))
+
+    def record(
+        self, lateness: float, skipped: int=0, overrun: bool=False
+    ) -> None:
+        """ Records a handled tick.
+
+        :param lateness: The seconds the tick was fired after its deadline
+        :type lateness: float
+        :param skipped: The number of ticks dropped after this tick
+        :type skipped: int
+        :param overrun: True if handling the tick ran past the next deadline
+        :type overrun: bool
+        :returns: Does not return
+        :rtype: None
+        """
+
+        lateness = max(lateness, 0.0)
+        with self._values.get_lock():
+            self._values[0] += 1
+            self._values[1] += int(overrun)
+            self._values[2] += skipped
+            self._values[4] = lateness
+            self._values[5] = max(self._values[5], lateness)
+            self._values[6] += lateness
+
+    def shed(self) -> None:
+        """ Records a tick which was shed instead of requested.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._values.get_lock():
+            self._values[3] += 1
+
+    def to_dict(self) -> dict:
+        """ Builds a serializable representation of the tick metrics.
+
+        :returns: A serializable representation of the tick metrics
+        :rtype: dict
+        """
+
+        with self._values.get_lock():
+            metrics = dict(zip(self.fields, self._values[:]))
+        for field in ('ticks', 'overruns', 'skipped', 'shed'):
+            metrics[field] = int(metrics[field])
+        metrics['lateness_mean'] = (
+            (metrics['lateness_total'] / metrics['ticks'])
+            if metrics['ticks'] > 0 else
+            0.0
+        )
+        return metrics
+
+
 class AbstractScheduler(multiprocessing.Process, metaclass=abc.ABCMeta):
     """ The base scheduler for all valid schedulers.
 
@@ -17,12 +147,93 @@ class AbstractScheduler(multiprocessing.Process, metaclass=abc.ABCMeta):
     """
 
     signal = blinker.Signal()
+    # NOTE: schedulers signal from a forked (daemonic) process unless they
+    # are driven by threads of the engine's process
+    forks = True
 
     def __init__(self):
         """ The abstract scheduler initializer.
         """
 
         super().__init__()
+        self.phase = 0.0
+        self.budget_ratio = None
+
+    @property
+    def phase(self) -> float:
+        """ The seconds to wait before the first scheduled request.
+        """
+
+        return self._phase
+
+    @phase.setter
+    def phase(self, phase: float) -> None:
+        """ Sets the scheduler's phase.
+
+        :param phase: The new phase of the scheduler
+        :type phase: float
+        """
+
+        self._phase = float(phase)
+
+    @property
+    def budget(self) -> float:
+        """ The seconds a scheduled request may take, None if unbounded.
+
+        .. note:: Derived from the scheduler's delay and ``budget_ratio``
+        """
+
+        delay = getattr(self, 'delay', None)
+        if self.budget_ratio is None or delay is None:
+            return None
+        return (delay * self.budget_ratio)
+
+    def observe(self, record) -> None:
+        """ Observes a record produced by one of the scheduler's requests.
+
+        .. note:: Does nothing unless the scheduler adapts to its records
+
+        :param record: The record produced by the scheduled request
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        pass
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the scheduler.
+        """
+
+        return {}
+
+    def _exit_on_terminate(self) -> None:
+        """ Exits the scheduler's process gracefully once it is terminated.
+
+        .. note:: Only applies when called from the scheduler's own process,
+            exiting through ``SystemExit`` runs the process' exit handlers
+            (such as writing out records queued for pipes)
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if multiprocessing.current_process() is self:
+            signal.signal(signal.SIGTERM, self._terminated)
+
+    def _terminated(self, signum: int, frame) -> None:
+        """ Handles the termination signal of the scheduler's process.
+
+        :param signum: The number of the received signal
+        :type signum: int
+        :param frame: The interrupted stack frame
+        :type frame: frame
+        :returns: Does not return
+        :rtype: None
+        """
+
+        raise SystemExit(0)
 
     @abc.abstractmethod
     def run(self) -> None:
@@ -33,3 +244,58 @@ class AbstractScheduler(multiprocessing.Process, metaclass=abc.ABCMeta):
         """
 
         raise NotImplementedError()
+
+
+class AbstractAsyncScheduler(object, metaclass=abc.ABCMeta):
+    """ The base scheduler for all valid asyncio schedulers.
+
+    .. note:: Async schedulers are driven by the event loop of an
+        :class:`~neat.engine.AsyncEngine` rather than a process
+    """
+
+    phase = 0.0
+    budget_ratio = None
+
+    @property
+    def budget(self) -> float:
+        """ The seconds a scheduled request may take, None if unbounded.
+
+        .. note:: Derived from the scheduler's delay and ``budget_ratio``
+        """
+
+        delay = getattr(self, 'delay', None)
+        if self.budget_ratio is None or delay is None:
+            return None
+        return (delay * self.budget_ratio)
+
+    def observe(self, record) -> None:
+        """ Observes a record produced by one of the scheduler's requests.
+
+        .. note:: Does nothing unless the scheduler adapts to its records
+
+        :param record: The record produced by the scheduled request
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        pass
+
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the scheduler.
+        """
+
+        return {}
+
+    @abc.abstractmethod
+    async def run(self, callback) -> None:
+        """ The infinite coroutine to start calling back on scheduled delays.
+
+        :param callback: The coroutine function to schedule with the scheduler
+        :type callback: callable
+        :returns: Does not return
+        :rtype: None
+        """
+
+        raise NotImplementedError()
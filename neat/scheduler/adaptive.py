@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import multiprocessing
+
+from .. import const
+from .monotonic import MonotonicDelayScheduler
+
+
+class AdaptiveDelayScheduler(MonotonicDelayScheduler):
+    """ The drift-free scheduler adapting its delay to the polled devices.
+
+    Polls are aligned to the update cadence of the device (derived from the
+    age of its data) and back off while the device's values do not change.
+    The delay always stays within ``min_delay`` and ``max_delay``.
+
+    .. note:: Required, that all subclasses call super initialization
+    """
+
+    _adaptive_fields = ('delay', 'cadence', 'started',)
+
+    def __init__(
+        self,
+        delay: float=10.0, min_delay: float=None, max_delay: float=None,
+        backoff: float=2.0, margin: float=1.0, missed: str='skip',
+        budget_ratio: float=0.8
+    ):
+        """ The AdaptiveDelayScheduler scheduler initializer.
+
+        :param delay: The initial delay to wait in between requests
+        :type delay: float
+        :param min_delay: The minimum delay in between requests (delay)
+        :type min_delay: float
+        :param max_delay: The maximum delay in between requests (delay * 6)
+        :type max_delay: float
+        :param backoff: The delay multiplier for each unchanged poll (2.0)
+        :type backoff: float
+        :param margin: Seconds to wait after a device's expected update (1.0)
+        :type margin: float
+        :param missed: The missed tick policy, ``skip`` or ``coalesce``
+        :type missed: str
+        :param budget_ratio: The fraction of the delay a request may take
+        :type budget_ratio: float
+        """
+
+        super().__init__(delay=delay, missed=missed, budget_ratio=budget_ratio)
+        self.base_delay = self.delay
+        self.min_delay = float(min_delay if min_delay else self.delay)
+        self.max_delay = float(max_delay if max_delay else (self.delay * 6))
+        if self.min_delay > self.max_delay:
+            raise ValueError((
+                "min_delay '{self.min_delay}' must not be greater than "
+                "max_delay '{self.max_delay}'"
+            ).format(self=self))
+        (self.backoff, self.margin) = (float(backoff), float(margin))
+        self._devices = {}
+        self._adaptive_metrics = multiprocessing.Array(
+            'd', len(self._adaptive_fields)
+        )
+
+    def __repr__(self):
+        """ A string representation of the scheduler object.
+
+        :returns: A string representation of the scheduler object
+        :rtype: str
+        """
+
+        return (
+            '<{self.name} delay={self.delay} '
+            'range=({self.min_delay}, {self.max_delay})>'
+        ).format(self=self)
+
+    @property
+    def metrics(self) -> dict:
+        """ The tick and adaptive delay metrics of the scheduler.
+
+        .. note:: ``saved`` counts the requests avoided versus polling at
+            the initial delay since the first observed record
+        """
+
+        metrics = super().metrics
+        with self._adaptive_metrics.get_lock():
+            metrics.update(dict(zip(
+                self._adaptive_fields, self._adaptive_metrics[:]
+            )))
+        started = metrics.pop('started')
+        metrics['saved'] = (
+            max(
+                (int((time.monotonic() - started) / self.base_delay) + 1) -
+                metrics['ticks'],
+                0
+            )
+            if started > 0 else
+            0
+        )
+        return metrics
+
+    def _desire(self, state: dict, record, now: float) -> float:
+        """ Computes the desired delay of a single device.
+
+        :param state: The tracked state of the device
+        :type state: dict
+        :param record: The most recent record of the device
+        :type record: Record
+        :param now: The current monotonic time
+        :type now: float
+        :returns: The desired delay of the device
+        :rtype: float
+        """
+
+        values = tuple(sorted(
+            (str(number), point.value)
+            for (number, point) in record.data.items()
+        ))
+        state['unchanged'] = (
+            (state['unchanged'] + 1) if values == state['values'] else 0
+        )
+        state['values'] = values
+
+        delay = self.base_delay
+        if record.age is not None:
+            refreshed = (now - record.age)
+            # NOTE: a refresh is only counted when the device's data is newer
+            # than the previous refresh by more than the scheduling margin
+            if state['refreshed'] is not None and \
+                    (refreshed - state['refreshed']) > self.margin:
+                state['cadence'] = (refreshed - state['refreshed'])
+            if state['refreshed'] is None or \
+                    (refreshed - state['refreshed']) > self.margin:
+                state['refreshed'] = refreshed
+            if state['cadence'] is not None:
+                delay = (
+                    (state['refreshed'] + state['cadence'] + self.margin) - now
+                )
+                if delay <= 0:
+                    delay = state['cadence']
+        return (delay * (self.backoff ** min(state['unchanged'], 32)))
+
+    def observe(self, record) -> None:
+        """ Observes a record and adapts the scheduler's delay.
+
+        :param record: The record produced by the scheduled request
+        :type record: Record
+        :returns: Does not return
+        :rtype: None
+        """
+
+        now = time.monotonic()
+        state = self._devices.setdefault(record.name, {
+            'values': None, 'unchanged': 0,
+            'refreshed': None, 'cadence': None,
+            'desired': self.base_delay,
+        })
+        state['desired'] = self._desire(state, record, now)
+        delay = min(
+            max(
+                min(_['desired'] for _ in self._devices.values()),
+                self.min_delay
+            ),
+            self.max_delay
+        )
+        if delay != self.delay:
+            const.log.debug((
+                'scheduler `{self}` adapting delay to `{delay:.3f}` '
+                'seconds ...'
+            ).format(self=self, delay=delay))
+        self.delay = delay
+        with self._adaptive_metrics.get_lock():
+            self._adaptive_metrics[0] = delay
+            self._adaptive_metrics[1] = (
+                state['cadence'] if state['cadence'] is not None else 0.0
+            )
+            if self._adaptive_metrics[2] <= 0:
+                self._adaptive_metrics[2] = now
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import asyncio
+
+from .. import const
+from ._common import AbstractAsyncScheduler, TickMetrics, next_deadline
+
+
+class AsyncDelayScheduler(AbstractAsyncScheduler):
+    """ The asyncio scheduler for async requesters.
+    """
+
+    def __init__(self, delay: float=1.0, budget_ratio: float=0.8):
+        """ The AsyncDelayScheduler scheduler initializer.
+
+        :param delay: The delay to wait in between requests
+        :type delay: float
+        :param budget_ratio: The fraction of the delay a request may take
+        :type budget_ratio: float
+        """
+
+        self.delay = delay
+        self.budget_ratio = budget_ratio
+        self._pending = set()
+        self._tick_metrics = TickMetrics()
+
+    def __repr__(self):
+        """ A string representation of the scheduler object.
+
+        :returns: A string representation of the scheduler object
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} delay={self.delay}>'
+        ).format(self=self)
+
+    @property
+    def delay(self) -> float:
+        """ The delay period in between scheduled requests.
+        """
+
+        return self._delay
+
+    @delay.setter
+    def delay(self, delay: float) -> None:
+        """ Sets the scheduler's delay.
+
+        :param delay: The new delay of the scheduler
+        :type delay: float
+        """
+
+        self._delay = float(delay)
+
+    @property
+    def pending(self) -> int:
+        """ The number of scheduled callbacks which have not yet finished.
+        """
+
+        return len(self._pending)
+
+    @property
+    def metrics(self) -> dict:
+        """ The tick lateness and load shedding metrics of the scheduler.
+        """
+
+        return self._tick_metrics.to_dict()
+
+    async def run(self, callback) -> None:
+        """ Starts the infinite loop for calling back scheduled requests.
+
+        .. note:: The callback is spawned as a task, so slow requests never
+            delay the following scheduled request; ticks arriving while the
+            previous callback is still in flight are shed
+
+        :param callback: The coroutine function to call with the scheduler
+        :type callback: callable
+        :returns: Does not return
+        :rtype: None
+        """
+
+        loop = asyncio.get_event_loop()
+        deadline = (loop.time() + self.phase)
+        await asyncio.sleep(self.phase)
+        while True:
+            lateness = (loop.time() - deadline)
+            if len(self._pending) > 0:
+                self._tick_metrics.shed()
+                const.log.warning((
+                    'scheduler `{self}` shed tick, previous request is '
+                    'still in flight ...'
+                ).format(self=self))
+            else:
+                task = asyncio.ensure_future(callback(self))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+            (deadline, skipped) = next_deadline(
+                deadline, self.delay, loop.time()
+            )
+            self._tick_metrics.record(
+                lateness, skipped=skipped, overrun=(skipped > 0)
+            )
+            try:
+                await asyncio.sleep(deadline - loop.time())
+            except asyncio.CancelledError as exc:
+                const.log.debug((
+                    'scheduler `{self}` was cancelled ...'
+                ).format(self=self))
+                raise exc
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+
+from .. import const
+from ._common import AbstractScheduler, TickMetrics, next_deadline
+
+
+class MonotonicDelayScheduler(AbstractScheduler):
+    """ The drift-free scheduler for simple requesters.
+
+    Unlike :class:`~neat.scheduler.simple.SimpleDelayScheduler` the period
+    does not include the time spent handling the signal, ticks are fired
+    against absolute :func:`time.monotonic` deadlines.
+
+    .. note:: Required, that all subclasses call super initialization
+    """
+
+    _missed_policies = ('skip', 'coalesce',)
+
+    def __init__(
+        self, delay: float=1.0, missed: str='skip', budget_ratio: float=0.8
+    ):
+        """ The MonotonicDelayScheduler scheduler initializer.
+
+        :param delay: The delay to wait in between requests
+        :type delay: float
+        :param missed: The missed tick policy, ``skip`` or ``coalesce``
+        :type missed: str
+        :param budget_ratio: The fraction of the delay a request may take
+        :type budget_ratio: float
+        """
+
+        super().__init__()
+        self.delay = delay
+        self.budget_ratio = budget_ratio
+        if missed not in self._missed_policies:
+            raise ValueError((
+                "missed tick policy must be one of {self._missed_policies}, "
+                "received '{missed}'"
+            ).format(self=self, missed=missed))
+        self.missed = missed
+        self._tick_metrics = TickMetrics()
+
+    def __repr__(self):
+        """ A string representation of the scheduler object.
+
+        :returns: A string representation of the scheduler object
+        :rtype: str
+        """
+
+        return (
+            '<{self.name} delay={self.delay} missed={self.missed}>'
+        ).format(self=self)
+
+    @property
+    def delay(self) -> float:
+        """ The delay period in between scheduled requests.
+        """
+
+        return self._delay
+
+    @delay.setter
+    def delay(self, delay: float) -> None:
+        """ Sets the scheduler's delay.
+
+        :param delay: The new delay of the scheduler
+        :type delay: float
+        """
+
+        self._delay = float(delay)
+
+    @property
+    def metrics(self) -> dict:
+        """ The tick lateness and overrun metrics of the scheduler.
+        """
+
+        return self._tick_metrics.to_dict()
+
+    def tick(self, deadline: float) -> float:
+        """ Sends the signal for a deadline and computes the next deadline.
+
+        :param deadline: The monotonic deadline of the tick
+        :type deadline: float
+        :returns: The monotonic deadline of the next tick
+        :rtype: float
+        """
+
+        lateness = (time.monotonic() - deadline)
+        self.signal.send(self)
+        (deadline, skipped) = next_deadline(
+            deadline, self.delay, time.monotonic(), missed=self.missed
+        )
+        overrun = (skipped > 0 or deadline <= time.monotonic())
+        self._tick_metrics.record(lateness, skipped=skipped, overrun=overrun)
+        if overrun:
+            const.log.warning((
+                'scheduler `{self}` overran its delay, {policy} `{skipped}` '
+                'missed ticks ...'
+            ).format(
+                self=self, skipped=skipped,
+                policy=('skipped' if self.missed == 'skip' else 'coalesced')
+            ))
+        return deadline
+
+    def run(self) -> None:
+        """ Starts the infinite loop for signaling scheduled requests.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self.daemon = True
+        self._exit_on_terminate()
+        deadline = (time.monotonic() + self.phase)
+        if self.is_alive():
+            time.sleep(self.phase)
+        while self.is_alive():
+            deadline = self.tick(deadline)
+            try:
+                time.sleep(max((deadline - time.monotonic()), 0.0))
+            except KeyboardInterrupt as exc:
+                const.log.debug((
+                    'scheduler `{self}` was terminated ...'
+                ).format(self=self))
+                break
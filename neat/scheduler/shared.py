@@ -0,0 +1,395 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import time
+import heapq
+import itertools
+import threading
+import concurrent.futures
+
+from .. import const
+from ._common import AbstractScheduler, TickMetrics, next_deadline
+
+
+class _SharedLoop(object):
+    """ A heap based timer loop which drives many schedulers from one thread.
+
+    .. note:: Signals are sent from a bounded pool of worker threads
+    """
+
+    def __init__(self, name: str, workers: int):
+        """ Initializes the shared loop.
+
+        :param name: The name of the shared loop
+        :type name: str
+        :param workers: The maximum number of concurrent worker threads
+        :type workers: int
+        """
+
+        self.name = name
+        self.workers = workers
+        self._heap = []
+        self._active = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        (self._thread, self._executor) = (None, None)
+        self._futures = set()
+
+    def __repr__(self):
+        """ A string representation of the shared loop.
+
+        :returns: A string representation of the shared loop
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} "{self.name}" workers={self.workers}>'
+        ).format(self=self)
+
+    def __contains__(self, scheduler: AbstractScheduler) -> bool:
+        """ Checks if a scheduler is currently driven by the loop.
+
+        :param scheduler: The scheduler to check for
+        :type scheduler: AbstractScheduler
+        :returns: True if the scheduler is driven by the loop, otherwise False
+        :rtype: bool
+        """
+
+        return scheduler in self._active
+
+    @property
+    def schedulers(self) -> list:
+        """ The list of schedulers currently driven by the loop.
+        """
+
+        return list(self._active.keys())
+
+    @property
+    def backlog(self) -> int:
+        """ The number of fired signals which have not yet been handled.
+        """
+
+        return len(self._futures)
+
+    def submit(self, function) -> concurrent.futures.Future:
+        """ Submits a function to the loop's worker pool.
+
+        :param function: The function to call from a worker thread
+        :type function: callable
+        :returns: The future of the submitted function
+        :rtype: concurrent.futures.Future
+        """
+
+        future = self._executor.submit(function)
+        self._futures.add(future)
+        future.add_done_callback(self._futures.discard)
+        return future
+
+    def add(self, scheduler: AbstractScheduler) -> None:
+        """ Adds a scheduler to the loop, starting the loop if necessary.
+
+        :param scheduler: The scheduler to add to the loop
+        :type scheduler: AbstractScheduler
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._condition:
+            token = next(self._sequence)
+            self._active[scheduler] = token
+            heapq.heappush(self._heap, (
+                (time.monotonic() + scheduler.phase), token, scheduler
+            ))
+            if self._thread is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers
+                )
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                const.log.info((
+                    'starting `{self}` thread as daemon ...'
+                ).format(self=self))
+                self._thread.start()
+            self._condition.notify()
+
+    def remove(self, scheduler: AbstractScheduler) -> None:
+        """ Removes a scheduler from the loop, stopping the loop if empty.
+
+        :param scheduler: The scheduler to remove from the loop
+        :type scheduler: AbstractScheduler
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._condition:
+            self._active.pop(scheduler, None)
+            if len(self._active) <= 0 and self._thread is not None:
+                const.log.info((
+                    'stopping `{self}` thread, no schedulers remaining ...'
+                ).format(self=self))
+                self._executor.shutdown(wait=False)
+                (self._thread, self._executor) = (None, None)
+                self._heap = []
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """ The infinite loop for firing schedulers on their deadlines.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        thread = threading.current_thread()
+        with self._condition:
+            while self._thread is thread:
+                if len(self._heap) <= 0:
+                    self._condition.wait()
+                    continue
+                (deadline, token, scheduler) = self._heap[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self._condition.wait(deadline - now)
+                    continue
+                heapq.heappop(self._heap)
+                # NOTE: entries for removed (or re-added) schedulers are
+                # dropped lazily as they reach the top of the heap
+                if self._active.get(scheduler) != token:
+                    continue
+                scheduler.dispatch(self)
+                deadline = scheduler.reschedule(deadline, now)
+                heapq.heappush(self._heap, (deadline, token, scheduler))
+
+
+class SharedDelayScheduler(AbstractScheduler):
+    """ A delay scheduler which shares a single timer loop with its peers.
+
+    Instead of forking a process per device, every ``SharedDelayScheduler``
+    with the same ``pool`` is driven by one heap based timer thread which
+    sends the scheduler's signal from a bounded pool of worker threads.
+
+    .. note:: Required, that all subclasses call super initialization
+    """
+
+    forks = False
+    _loops = {}
+    _loops_lock = threading.Lock()
+
+    _missed_policies = ('skip', 'coalesce',)
+
+    def __init__(
+        self,
+        delay: float=1.0, pool: str='default', workers: int=16,
+        missed: str='skip', budget_ratio: float=0.8, max_backlog: int=None
+    ):
+        """ The SharedDelayScheduler scheduler initializer.
+
+        :param delay: The delay to wait in between requests
+        :type delay: float
+        :param pool: The name of the shared loop to schedule on
+        :type pool: str
+        :param workers: The number of workers of the shared loop (16)
+        :type workers: int
+        :param missed: The missed tick policy, ``skip`` or ``coalesce``
+        :type missed: str
+        :param budget_ratio: The fraction of the delay a request may take
+        :type budget_ratio: float
+        :param max_backlog: The backlog of the loop to shed ticks at (workers)
+        :type max_backlog: int
+
+        .. note:: The first scheduler to start a pool sets its ``workers``
+        """
+
+        super().__init__()
+        self.delay = delay
+        (self.pool, self.workers) = (pool, int(workers))
+        if missed not in self._missed_policies:
+            raise ValueError((
+                "missed tick policy must be one of {self._missed_policies}, "
+                "received '{missed}'"
+            ).format(self=self, missed=missed))
+        self.missed = missed
+        self.budget_ratio = budget_ratio
+        self.max_backlog = int(max_backlog if max_backlog else self.workers)
+        self._future = None
+        self._stopped = threading.Event()
+        self._tick_metrics = TickMetrics()
+
+    def __repr__(self):
+        """ A string representation of the scheduler object.
+
+        :returns: A string representation of the scheduler object
+        :rtype: str
+        """
+
+        return (
+            '<{self.name} delay={self.delay} pool={self.pool}>'
+        ).format(self=self)
+
+    @property
+    def delay(self) -> float:
+        """ The delay period in between scheduled requests.
+        """
+
+        return self._delay
+
+    @delay.setter
+    def delay(self, delay: float) -> None:
+        """ Sets the scheduler's delay.
+
+        :param delay: The new delay of the scheduler
+        :type delay: float
+        """
+
+        self._delay = float(delay)
+
+    @property
+    def loop(self) -> _SharedLoop:
+        """ The shared loop this scheduler is driven by.
+        """
+
+        with self._loops_lock:
+            if self.pool not in self._loops:
+                self._loops[self.pool] = _SharedLoop(self.pool, self.workers)
+            return self._loops[self.pool]
+
+    @property
+    def metrics(self) -> dict:
+        """ The tick lateness and overrun metrics of the scheduler.
+        """
+
+        return self._tick_metrics.to_dict()
+
+    @property
+    def pid(self) -> int:
+        """ The pid of the process driving the scheduler.
+        """
+
+        return (os.getpid() if self.is_alive() else None)
+
+    def is_alive(self) -> bool:
+        """ Checks if the scheduler is currently driven by its shared loop.
+
+        :returns: True if the scheduler is scheduled, otherwise False
+        :rtype: bool
+        """
+
+        loop = self._loops.get(self.pool)
+        return (loop is not None and self in loop)
+
+    def start(self) -> None:
+        """ Adds the scheduler to its shared loop.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self._stopped.clear()
+        self.loop.add(self)
+
+    def terminate(self) -> None:
+        """ Removes the scheduler from its shared loop.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self.loop.remove(self)
+        self._stopped.set()
+
+    def join(self, timeout: float=None) -> None:
+        """ Blocks until the scheduler is terminated.
+
+        .. note:: Also waits for the scheduler's in flight request
+
+        :param timeout: The number of seconds to wait for termination
+        :type timeout: float
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if self._stopped.wait(timeout) and self._future is not None:
+            concurrent.futures.wait([self._future], timeout=timeout)
+
+    def reschedule(self, deadline: float, now: float) -> float:
+        """ Records a fired deadline and computes the next deadline.
+
+        :param deadline: The monotonic deadline that was fired
+        :type deadline: float
+        :param now: The monotonic time the deadline was fired at
+        :type now: float
+        :returns: The monotonic deadline of the next tick
+        :rtype: float
+        """
+
+        (next_tick, skipped) = next_deadline(
+            deadline, self.delay, now, missed=self.missed
+        )
+        self._tick_metrics.record(
+            (now - deadline), skipped=skipped,
+            overrun=(skipped > 0 or next_tick <= now)
+        )
+        return next_tick
+
+    def dispatch(self, loop: _SharedLoop) -> concurrent.futures.Future:
+        """ Fires the scheduler on a loop's worker pool unless it is shed.
+
+        Ticks are shed while the scheduler's previous request is still in
+        flight or while the loop's backlog has reached ``max_backlog``.
+
+        :param loop: The shared loop driving the scheduler
+        :type loop: _SharedLoop
+        :returns: The future of the fired signal, None if the tick was shed
+        :rtype: concurrent.futures.Future
+        """
+
+        if self._future is not None and not self._future.done():
+            reason = 'previous request is still in flight'
+        elif loop.backlog >= self.max_backlog:
+            reason = (
+                'loop backlog reached `{}` signals'.format(self.max_backlog)
+            )
+        else:
+            self._future = loop.submit(self.fire)
+            return self._future
+        self._tick_metrics.shed()
+        const.log.warning((
+            'scheduler `{self}` shed tick, {reason} ...'
+        ).format(self=self, reason=reason))
+
+    def fire(self) -> None:
+        """ Sends the scheduler's signal, called from the shared worker pool.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        # NOTE: signals queued before the scheduler was terminated are dropped
+        if not self.is_alive():
+            return
+        try:
+            self.signal.send(self)
+        except Exception as exc:
+            const.log.exception((
+                'scheduler `{self}` failed handling scheduled signal, '
+                '{exc} ...'
+            ).format(self=self, exc=exc))
+
+    def run(self) -> None:
+        """ Schedules the scheduler and blocks until it is terminated.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        self.start()
+        try:
+            self.join()
+        except KeyboardInterrupt as exc:
+            const.log.debug((
+                'scheduler `{self}` was terminated ...'
+            ).format(self=self))
+            self.terminate()
@@ -16,15 +16,18 @@ class SimpleDelayScheduler(AbstractScheduler):
     .. note:: Required, that all subclasses call super initialization
     """
 
-    def __init__(self, delay: float=1.0):
+    def __init__(self, delay: float=1.0, budget_ratio: float=0.8):
         """ The SimpleDelayScheduler scheduler initializer.
 
         :param delay: The delay to wait in between requests
         :type delay: float
+        :param budget_ratio: The fraction of the delay a request may take
+        :type budget_ratio: float
         """
 
         super().__init__()
         self.delay = delay
+        self.budget_ratio = budget_ratio
 
     def __repr__(self):
         """ A string representation of the scheduler object.
@@ -61,6 +64,9 @@ class SimpleDelayScheduler(AbstractScheduler):
         """
 
         self.daemon = True
+        self._exit_on_terminate()
+        if self.is_alive():
+            time.sleep(self.phase)
         while self.is_alive():
             self.signal.send(self)
             try:
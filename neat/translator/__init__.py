@@ -8,7 +8,7 @@ import sys
 import inspect
 
 from ._common import *
-from .obvius import ObviusTranslator
+from .obvius import ObviusTranslator, ObviusLogTranslator
 
 
 def get_translator(requester_name: str) -> AbstractTranslator:
@@ -17,6 +17,13 @@ class AbstractTranslator(object, metaclass=abc.ABCMeta):
     signal = blinker.Signal()
     supported_requesters = ()
 
+    @property
+    def metrics(self) -> dict:
+        """ The runtime metrics of the translator.
+        """
+
+        return {}
+
     @abc.abstractmethod
     def validate(self, data: str) -> bool:
         """ Self validates the data of a supported requester.
@@ -5,23 +5,183 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 
+import re
+import csv
 import time
+import calendar
+import operator
 import importlib
+import threading
+from typing import Tuple, List, Dict, Iterable, Iterator
 
 from .. import const, device
+from ..units import get_registry
 from ..models import Record, RecordPoint
 from ._common import AbstractTranslator
 
 import bs4
-import pint
+import lxml.etree
 import dateutil.parser
 
 
+_parsers = threading.local()
+_encoding_expr = re.compile(
+    br'^\s*<\?xml[^>]*?encoding=["\']([A-Za-z0-9._-]+)["\']'
+)
+
+
+def decode_xml(data: bytes) -> str:
+    """ Decodes xml with the encoding declared by its prolog.
+
+    :param data: The encoded xml
+    :type data: bytes
+    :returns: The decoded xml, utf-8 if no known encoding is declared
+    :rtype: str
+    """
+
+    match = _encoding_expr.search(data)
+    if match is not None:
+        try:
+            return data.decode(match.group(1).decode('ascii'), 'replace')
+        except LookupError:
+            pass
+    return data.decode('utf-8-sig', 'replace')
+
+
+def parse_xml(data: str) -> lxml.etree._Element:
+    """ Parses decoded xml using lxml.
+
+    .. note:: The text is already decoded, so the encoding declared by the
+        xml prolog is overridden instead of applied to the text a second time
+
+    :param data: The decoded xml to parse
+    :type data: str
+    :returns: The root element of the xml
+    :rtype: lxml.etree._Element
+    """
+
+    # NOTE: parsers are not safe to share between threads
+    if not hasattr(_parsers, 'utf8'):
+        _parsers.utf8 = lxml.etree.XMLParser(encoding='utf-8')
+    return lxml.etree.fromstring(
+        data.strip().encode('utf-8'), parser=_parsers.utf8
+    )
+
+
+def parse_timestamp(value: str) -> float:
+    """ Parses the unix timestamp of an Obvius UTC time.
+
+    :param value: The UTC time, usually formatted as ``YYYY-MM-DD HH:MM:SS``
+    :type value: str
+    :returns: The unix timestamp of the time
+    :rtype: float
+    """
+
+    try:
+        # NOTE: slicing the expected format is much faster than strptime
+        return float(calendar.timegm((
+            int(value[0:4]), int(value[5:7]), int(value[8:10]),
+            int(value[11:13]), int(value[14:16]), int(value[17:19]),
+        )))
+    except (ValueError, IndexError):
+        parsed = dateutil.parser.parse(value)
+        if parsed.tzinfo is None:
+            return float(calendar.timegm(parsed.timetuple()))
+        return parsed.timestamp()
+
+
+class TranslationPlan(object):
+    """ The compiled translation of an Obvius device's point layout.
+
+    Point numbers, names and units are resolved once, records with the same
+    layout only have their values extracted into the precomputed slots.
+    """
+
+    def __init__(self, numpoints: str, points: List[tuple], unit_table: dict):
+        """ Compiles the translation plan of a point layout.
+
+        :param numpoints: The number of points reported by the device
+        :type numpoints: str
+        :param points: The raw points of a record of the device
+        :type points: list
+        :param unit_table: The mapping of Obvius units to pint unit strings
+        :type unit_table: dict
+        """
+
+        self.numpoints = numpoints
+        self.signature = tuple(point[:3] for point in points)
+        # NOTE: unknown units are translated as dimensionless
+        self.slots = sorted(
+            (
+                (
+                    index, int(number), name,
+                    unit_table.get(units, unit_table[''])
+                )
+                for (index, (number, name, units, _)) in enumerate(points)
+            ),
+            key=operator.itemgetter(1)
+        )
+
+    def __repr__(self):
+        """ A string representation of the translation plan.
+
+        :returns: A string representation of the translation plan
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} points={points}>'
+        ).format(self=self, points=len(self.slots))
+
+    def matches(self, numpoints: str, points: List[tuple]) -> bool:
+        """ Checks if a record's point layout matches the plan.
+
+        :param numpoints: The number of points reported by the device
+        :type numpoints: str
+        :param points: The raw points of a record of the device
+        :type points: list
+        :returns: True if the layout matches, otherwise False
+        :rtype: bool
+        """
+
+        return (
+            numpoints == self.numpoints and
+            len(points) == len(self.signature) and
+            all(
+                point[:3] == expected
+                for (point, expected) in zip(points, self.signature)
+            )
+        )
+
+    def build(self, points: List[tuple]) -> Dict[int, RecordPoint]:
+        """ Builds the record data of a record's points.
+
+        :param points: The raw points of a record matching the plan
+        :type points: list
+        :returns: A dictionary of point numbers mapped to record points
+        :rtype: dict
+        """
+
+        record_data = {}
+        for (index, number, name, unit) in self.slots:
+            try:
+                value = float(points[index][3])
+            except (TypeError, ValueError):
+                value = None
+            record_data[number] = RecordPoint(
+                name=name, value=value, unit=unit
+            )
+        return record_data
+
+
 class ObviusTranslator(AbstractTranslator):
     """ The translator for Obvius devices.
     """
 
-    supported_requesters = ('ObviusRequester',)
+    supported_requesters = (
+        'ObviusRequester', 'ObviusHostRequester', 'AsyncObviusRequester',
+    )
+    _engine_pref = ['lxml', 'bs4']
     _parser_pref = ['lxml', 'html.parser']
     _expression_unit_map = {
         # energy
@@ -137,11 +297,36 @@ class ObviusTranslator(AbstractTranslator):
         'mmHg': 'mmHg',
     }
 
+    _unit_map = None
+    _unit_table = None
+
     def __init__(self):
         """ Initiaalizes the Obvius translator.
+
+        .. note:: The unit map is built once per process and shared by all
+            Obvius translators
         """
 
-        self._unit_reg = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+        self.__class__.build_units()
+        self._plans = {}
+        (self._plans_compiled, self._plans_reused) = (0, 0)
+
+    @classmethod
+    def build_units(cls) -> None:
+        """ Builds the shared Obvius unit map and table if necessary.
+
+        :returns: Does not return
+        :rtype: None
+        """
+
+        if cls._unit_map is None:
+            registry = get_registry()
+            unit_map = {
+                k: registry.parse_expression(v)
+                for (k, v) in cls._expression_unit_map.items()
+            }
+            cls._unit_table = {k: str(v.units) for (k, v) in unit_map.items()}
+            cls._unit_map = unit_map
 
     @property
     def parser(self) -> str:
@@ -161,12 +346,175 @@ class ObviusTranslator(AbstractTranslator):
         """ The mapping of Obvius units to valid pint units.
         """
 
-        if not hasattr(self, '_unit_map'):
-            self._unit_map = {}
-            for (k, v) in self._expression_unit_map.items():
-                self._unit_map[k] = self._unit_reg.parse_expression(v)
         return self._unit_map
 
+    @property
+    def unit_table(self) -> dict:
+        """ The precomputed mapping of Obvius units to pint unit strings.
+        """
+
+        return self._unit_table
+
+    @property
+    def metrics(self) -> dict:
+        """ The translation plan reuse metrics of the translator.
+        """
+
+        return {
+            'plans': len(self._plans),
+            'compiled': self._plans_compiled,
+            'reused': self._plans_reused,
+        }
+
+    def plan(
+        self, key: tuple, numpoints: str, points: List[tuple]
+    ) -> 'TranslationPlan':
+        """ Retrieves the translation plan of a device's point layout.
+
+        The device's cached plan is reused until its ``numpoints`` or point
+        signature changes, in which case a new plan is compiled.
+
+        :param key: The key identifying the device
+        :type key: tuple
+        :param numpoints: The number of points reported by the device
+        :type numpoints: str
+        :param points: The raw points of one of the device's records
+        :type points: list
+        :returns: The translation plan of the point layout
+        :rtype: TranslationPlan
+        """
+
+        plan = self._plans.get(key)
+        if plan is not None and plan.matches(numpoints, points):
+            self._plans_reused += 1
+            return plan
+        if plan is not None:
+            const.log.info((
+                'point layout of device `{key[1]}` changed, '
+                'recompiling translation plan ...'
+            ).format(key=key))
+        plan = TranslationPlan(numpoints, points, self._unit_table)
+        self._plans[key] = plan
+        self._plans_compiled += 1
+        return plan
+
+    @property
+    def engine(self) -> str:
+        """ The engine to use for parsing the returned requester content.
+
+        .. note:: ``lxml`` parses payloads once as xml, ``bs4`` is the
+            fallback for environments (or payloads) lxml cannot handle
+        """
+
+        if not hasattr(self, '_engine') or \
+                self._engine not in self._engine_pref:
+            for engine in self._engine_pref:
+                if importlib.util.find_spec(engine):
+                    self._engine = engine
+                    break
+        return self._engine
+
+    def _parse_lxml(self, data: str) -> Tuple[int, List[dict]]:
+        """ Parses Obvius data into its error and devices using lxml.
+
+        :param data: The xml returned from the Obvius endpoint
+        :type data: str
+        :returns: A tuple of the payload's error and parsed devices
+        :rtype: tuple
+        """
+
+        root = parse_xml(data)
+        error = root.find('.//error')
+        devices = []
+        for device_record in root.iter('devices'):
+            records = []
+            for rec in device_record.iter('record'):
+                records.append({
+                    'time': rec.findtext('time'),
+                    'age': rec.findtext('age'),
+                    'points': [
+                        (
+                            point.get('number'), point.get('name'),
+                            point.get('units'), point.get('value'),
+                        )
+                        for point in rec.iter('point')
+                    ],
+                })
+            devices.append({
+                'name': device_record.findtext('.//name'),
+                'numpoints': device_record.findtext('.//numpoints'),
+                'records': records,
+            })
+        return (
+            (int(error.text) if error is not None else None),
+            devices
+        )
+
+    def _parse_soup(self, data: str) -> Tuple[int, List[dict]]:
+        """ Parses Obvius data into its error and devices using bs4.
+
+        :param data: The xml returned from the Obvius endpoint
+        :type data: str
+        :returns: A tuple of the payload's error and parsed devices
+        :rtype: tuple
+        """
+
+        soup = bs4.BeautifulSoup(data, self.parser)
+        error = soup.find('error')
+        devices = []
+        for device_record in soup.find_all('devices'):
+            records = []
+            for rec in device_record.find_all('record'):
+                (age, rec_time) = (rec.find('age'), rec.find('time'))
+                records.append({
+                    'time': (rec_time.text if rec_time is not None else None),
+                    'age': (age.text if age is not None else None),
+                    'points': [
+                        (
+                            point.attrs.get('number'), point.attrs.get('name'),
+                            point.attrs.get('units'), point.attrs.get('value'),
+                        )
+                        for point in rec.find_all('point')
+                    ],
+                })
+            (name, numpoints) = (
+                device_record.find('name'), device_record.find('numpoints')
+            )
+            devices.append({
+                'name': (name.text if name is not None else None),
+                'numpoints': (
+                    numpoints.text if numpoints is not None else None
+                ),
+                'records': records,
+            })
+        return (
+            (int(error.text) if error is not None else None),
+            devices
+        )
+
+    def parse(self, data: str) -> Tuple[int, List[dict]]:
+        """ Parses Obvius data into its error and devices.
+
+        Each parsed device is a dictionary of its ``name``, ``numpoints`` and
+        ``records``, each record is a dictionary of its ``time``, ``age`` and
+        ``points`` (raw tuples of number, name, units and value in document
+        order).
+
+        :param data: The xml returned from the Obvius endpoint
+        :type data: str
+        :returns: A tuple of the payload's error and parsed devices
+        :rtype: tuple
+        """
+
+        if self.engine == 'lxml':
+            try:
+                return self._parse_lxml(data)
+            except lxml.etree.XMLSyntaxError as exc:
+                const.log.debug((
+                    'falling back to `bs4` for unparsable xml, {exc} ...'
+                ).format(exc=exc))
+        return self._parse_soup(data)
+
     def validate(self, data: str) -> bool:
         """ Checks if the data from the Obvius is valid.
 
@@ -176,10 +524,70 @@ class ObviusTranslator(AbstractTranslator):
         :rtype: bool
         """
 
-        return int(
-            bs4.BeautifulSoup(data, self.parser)
-            .find('error').text
-        ) == 0
+        (error, _) = self.parse(data)
+        return error == 0
+
+    def records(
+        self, data: str, meta: dict={}, device_time: bool=False
+    ) -> Iterator[Record]:
+        """ Translates Obvius data to a record per device.
+
+        .. note:: The data is parsed exactly once
+
+        :param data: The xml returned from the Obvius endpoint
+        :type data: str
+        :param meta: Any additional data given to the requester
+        :type meta: dict
+        :param device_time: Stamps records with the device's time if True,
+            otherwise with the current time (False)
+        :type device_time: bool
+        :returns: A generator of the translated records
+        :rtype: Iterator[Record]
+        """
+
+        (error, devices) = self.parse(data)
+        if error != 0:
+            return
+        for device_record in devices:
+            # prepopulate the Record with meta fields that match
+            record = Record(**meta)
+            if not record.type or len(record.type) <= 0:
+                const.log.warning((
+                    'no device type for `{record}`, '
+                    'default set to {device.DeviceType.UNKNOWN} ...'
+                ).format(record=record, device=device))
+                record.type = device.DeviceType.UNKNOWN.name
+            try:
+                # discover device type
+                device_type = device.DeviceType[record.type]
+                record.device_name = device_record['name']
+                for rec in device_record['records']:
+                    record.timestamp = (
+                        parse_timestamp(rec['time'])
+                        if device_time and rec['time'] else
+                        time.time()
+                    )
+                    try:
+                        record.age = float(rec['age'])
+                    except (TypeError, ValueError):
+                        record.age = None
+                    plan = self.plan(
+                        (meta.get('name'), device_record['name']),
+                        device_record['numpoints'], rec['points']
+                    )
+                    record_data = plan.build(rec['points'])
+
+                    # try and parse record data into reliable parsed data
+                    record.data = record_data
+                    (device_type_id, device_instance,) = device_type.value
+                    record.parsed = device_instance.parse(record)
+                yield record
+            except KeyError as exc:
+                const.log.error((
+                    'invalid device type `{exc.args[0]}` for '
+                    'record `{record}`, discarding record ...'
+                ).format(exc=exc, record=record))
+                break
 
     def translate(self, data: str, meta: dict={}) -> None:
         """ Translates Obvius data to a record.
@@ -192,59 +600,235 @@ class ObviusTranslator(AbstractTranslator):
         :rtype: None
         """
 
-        if self.validate(data):
-            soup = bs4.BeautifulSoup(data, self.parser)
-            for device_record in soup.find_all('devices'):
-                # prepopulate the Record with meta fields that match
-                record = Record(**meta)
-                if not record.type or len(record.type) <= 0:
-                    const.log.warning((
-                        'no device type for `{record}`, '
-                        'default set to {device.DeviceType.UNKNOWN} ...'
-                    ).format(record=record, device=device))
-                    record.type = device.DeviceType.UNKNOWN.name
+        for record in self.records(data, meta=meta):
+            # send the generated record out to the engine
+            self.signal.send(record)
+
+
+class ObviusLogTranslator(AbstractTranslator):
+    """ The translator for Obvius interval logs.
+
+    Logs are csv files of a header and one row per logged interval, led by
+    the interval's time (UTC), error and alarm columns, for example:
+
+    .. code-block:: text
+
+        'time(UTC)','error','lowrange','highrange','Energy (kWh)','Power (kW)'
+        '2017-02-24 16:00:00',0,0,0,790338.000,1.153
+
+    Every interval becomes its own record, stamped with the interval's time.
+    """
+
+    supported_requesters = (
+        'ObviusLogRequester', 'ObviusHostLogRequester',
+    )
+    _leading_columns = 4
+    _header_expr = re.compile(r'^(?P<name>.*?)\s*\((?P<units>[^()]*)\)$')
+
+    def __init__(self):
+        """ Initializes the Obvius log translator.
+
+        .. note:: Shares the Obvius unit table of :class:`ObviusTranslator`
+        """
+
+        ObviusTranslator.build_units()
+        (self._rows, self._skipped, self._records) = (0, 0, 0)
+
+    @property
+    def unit_table(self) -> dict:
+        """ The precomputed mapping of Obvius units to pint unit strings.
+        """
+
+        return ObviusTranslator._unit_table
+
+    @property
+    def metrics(self) -> dict:
+        """ The row and record counts of the translator.
+        """
+
+        return {
+            'rows': self._rows,
+            'skipped': self._skipped,
+            'records': self._records,
+        }
+
+    def _cells(self, lines: Iterable[str]) -> Iterator[List[str]]:
+        """ Splits log lines into their unquoted cells.
+
+        :param lines: The lines of the log
+        :type lines: Iterable[str]
+        :returns: A generator of each non empty row's cells
+        :rtype: Iterator[list]
+        """
+
+        for row in csv.reader(lines, quotechar="'", skipinitialspace=True):
+            if len(row) > 0:
+                yield [cell.strip().strip('"') for cell in row]
+
+    @staticmethod
+    def _is_number(value: str) -> bool:
+        """ Checks if a cell of the log is numeric.
+
+        :param value: The cell to check
+        :type value: str
+        :returns: True if the cell is numeric, otherwise False
+        :rtype: bool
+        """
+
+        try:
+            float(value)
+            return True
+        except ValueError:
+            return False
+
+    def timestamp(self, value: str) -> float:
+        """ Parses the unix timestamp of an interval's time.
+
+        :param value: The UTC time of the interval
+        :type value: str
+        :returns: The unix timestamp of the interval
+        :rtype: float
+        """
+
+        return parse_timestamp(value)
+
+    def header(self, row: List[str]) -> List[tuple]:
+        """ Parses the header of a log into its raw point layout.
+
+        :param row: The cells of the log's header
+        :type row: list
+        :returns: The raw points of the header (number, name, units, value)
+        :rtype: list
+        """
+
+        points = []
+        for (number, cell) in enumerate(row[self._leading_columns:]):
+            match = self._header_expr.match(cell)
+            (name, units) = (
+                (match.group('name'), match.group('units').strip())
+                if match else
+                (cell, '')
+            )
+            points.append((str(number), name, units, None))
+        return points
+
+    def records(
+        self, lines: Iterable[str], meta: dict={},
+        start: float=None, end: float=None
+    ) -> Iterator[Record]:
+        """ Streams the records of a log's intervals.
+
+        :param lines: The lines of the log
+        :type lines: Iterable[str]
+        :param meta: Any additional data given to the requester
+        :type meta: dict
+        :param start: The earliest unix timestamp to include (unbounded)
+        :type start: float
+        :param end: The unix timestamp to stop before (unbounded)
+        :type end: float
+        :returns: A generator of the translated records
+        :rtype: Iterator[Record]
+        """
+
+        device_type = meta.get('type')
+        if not device_type:
+            const.log.warning((
+                'no device type for `{name}` log, '
+                'default set to {device.DeviceType.UNKNOWN} ...'
+            ).format(name=meta.get('name'), device=device))
+            device_type = device.DeviceType.UNKNOWN.name
+        try:
+            (_, device_instance,) = device.DeviceType[device_type].value
+        except KeyError as exc:
+            const.log.error((
+                'invalid device type `{exc.args[0]}` for `{name}` log, '
+                'discarding log ...'
+            ).format(exc=exc, name=meta.get('name')))
+            return
+
+        plan = None
+        for row in self._cells(lines):
+            try:
+                timestamp = self.timestamp(row[0])
+                error = int(float(row[1] or 0))
+            except (ValueError, IndexError, OverflowError):
+                # NOTE: headers are the rows whose time and error columns
+                # are both non numeric, anything else is a broken interval
+                if len(row) > self._leading_columns and \
+                        not self._is_number(row[1]):
+                    points = self.header(row)
+                    plan = TranslationPlan(
+                        str(len(points)), points, self.unit_table
+                    )
+                else:
+                    (self._rows, self._skipped) = (
+                        (self._rows + 1), (self._skipped + 1)
+                    )
+                continue
+            self._rows += 1
+            if plan is None:
+                points = self.header([''] * len(row))
+                plan = TranslationPlan(
+                    str(len(points)), points, self.unit_table
+                )
+            if error != 0 or \
+                    (start is not None and timestamp < start) or \
+                    (end is not None and timestamp >= end):
+                self._skipped += 1
+                continue
+
+            record = Record(**meta)
+            record.type = device_type
+            # NOTE: logs do not carry the device's name, prefer the meta's
+            if record.device_name is None:
+                record.device_name = record.name
+            (record.timestamp, record.age) = (timestamp, None)
+            values = row[self._leading_columns:]
+            record_data = {}
+            for (index, number, name, unit) in plan.slots:
                 try:
-                    # discover device type
-                    device_type = device.DeviceType[record.type]
-                    record.device_name = device_record.find('name').text
-                    for rec in device_record.find_all('record'):
-                        record.timestamp = time.time()
-                        rec_error = rec.find('error').text
-                        record_data = {}
-                        for point in sorted(
-                            rec.find_all('point'),
-                            key=lambda x: int(x.attrs['number'])
-                        ):
-                            # discover valid point values and units
-                            try:
-                                rec_point_value = float(point.attrs['value'])
-                            except ValueError:
-                                rec_point_value = None
-                            try:
-                                self.unit_map[point.attrs['units']]
-                            except KeyError:
-                                point.attrs['units'] = ''
-
-                            # add generated RecordPoint to record_data
-                            record_data[
-                                int(point.attrs['number'])
-                            ] = RecordPoint(
-                                name=point.attrs['name'],
-                                value=rec_point_value,
-                                unit=str(self.unit_map[
-                                    point.attrs['units']
-                                ].units)
-                            )
-
-                        # try and parse record data into reliable parsed data
-                        record.data = record_data
-                        (device_type_id, device_instance,) = device_type.value
-                        record.parsed = device_instance.parse(record)
-                    # send the generated record out to the engine
-                    self.signal.send(record)
-                except KeyError as exc:
-                    const.log.error((
-                        'invalid device type `{exc.args[0]}` for '
-                        'record `{record}`, discarding record ...'
-                    ).format(exc=exc, record=record))
-                    break
+                    value = float(values[index])
+                except (IndexError, ValueError):
+                    value = None
+                record_data[number] = RecordPoint(
+                    name=name, value=value, unit=unit
+                )
+            record.data = record_data
+            try:
+                record.parsed = device_instance.parse(record)
+            except (TypeError, KeyError) as exc:
+                const.log.warning((
+                    'could not parse interval `{row[0]}` of `{record}`, '
+                    'skipping ...'
+                ).format(row=row, record=record))
+                self._skipped += 1
+                continue
+            self._records += 1
+            yield record
+
+    def validate(self, data: str) -> bool:
+        """ Checks if the data of an Obvius log is valid.
+
+        :param data: The data returned from a supported requester
+        :type data: str
+        :returns: True if the data is valid, otherwise False
+        :rtype: bool
+        """
+
+        for row in self._cells(data.splitlines()):
+            return (len(row) > self._leading_columns)
+        return False
+
+    def translate(self, data: str, meta: dict={}) -> None:
+        """ Translates an Obvius log to records.
+
+        :param data: The csv returned from the Obvius log endpoint
+        :type data: str
+        :param meta: Any additional data given to the requester
+        :type meta: dict
+        :returns: Does not return
+        :rtype: None
+        """
+
+        for record in self.records(data.splitlines(), meta=meta):
+            self.signal.send(record)
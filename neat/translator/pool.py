@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import time
+import queue
+import threading
+import collections
+import concurrent.futures
+from typing import Tuple, List, Callable, Hashable
+
+from .. import const
+from ..models import Record
+
+import blinker
+
+
+_translators = {}
+
+
+def _translate(
+    requester_name: str, data: str, meta: dict
+) -> Tuple[List[Record], float]:
+    """ Translates data within a translator worker process.
+
+    :param requester_name: The class name of the requester of the data
+    :type requester_name: str
+    :param data: The data returned from the requester
+    :type data: str
+    :param meta: Any additional fields given to the requester
+    :type meta: dict
+    :returns: A tuple of the translated records and seconds spent
+    :rtype: tuple
+    """
+
+    started = time.perf_counter()
+    if requester_name not in _translators:
+        from . import get_translator
+        translator = get_translator(requester_name)()
+        # NOTE: an instance signal keeps records away from receivers which
+        # the worker inherited from its parent when forked
+        translator.signal = blinker.Signal()
+        _translators[requester_name] = translator
+    translator = _translators[requester_name]
+    records = []
+    receiver = records.append
+    translator.signal.connect(receiver, weak=False)
+    try:
+        translator.translate(data, meta=meta)
+    finally:
+        translator.signal.disconnect(receiver)
+    return (records, (time.perf_counter() - started))
+
+
+class TranslatorPool(object):
+    """ A pool of worker processes translating data off the polling path.
+
+    Translated records are delivered in submission order per key (usually
+    the requester), regardless of which worker finishes first.
+    Callbacks are run by a delivery thread of the pool, so slow callbacks
+    (such as pipe writes) never hold up the collection of translations.
+
+    .. note:: The executor and delivery thread are created lazily and
+        recreated after a fork
+    """
+
+    def __init__(self, workers: int=2):
+        """ Initializes the translator pool.
+
+        :param workers: The number of translator worker processes (2)
+        :type workers: int
+        """
+
+        self.workers = int(workers)
+        (self._executor, self._pid) = (None, None)
+        self._queues = {}
+        (self._deliveries, self._delivery) = (queue.Queue(), None)
+        (self._submitted, self._completed, self._failed) = (0, 0, 0)
+        (self._busy, self._started) = (0.0, None)
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.RLock()
+
+    def __repr__(self):
+        """ A string representation of the translator pool.
+
+        :returns: A string representation of the translator pool
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} workers={self.workers}>'
+        ).format(self=self)
+
+    @property
+    def executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        """ The process pool executor of the translator workers.
+        """
+
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                const.log.info((
+                    'starting `{self.workers}` translator worker processes '
+                    '...'
+                ).format(self=self))
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.workers
+                )
+                (self._pid, self._started) = (os.getpid(), time.monotonic())
+                (self._queues, self._busy) = ({}, 0.0)
+                self._deliveries = queue.Queue()
+                self._delivery = threading.Thread(
+                    target=self._deliver, args=(self._deliveries,)
+                )
+                self._delivery.daemon = True
+                self._delivery.start()
+            return self._executor
+
+    @property
+    def metrics(self) -> dict:
+        """ The queue depth and worker utilization of the pool.
+        """
+
+        with self._lock:
+            elapsed = (
+                (time.monotonic() - self._started)
+                if self._started is not None else
+                0.0
+            )
+            return {
+                'workers': self.workers,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'failed': self._failed,
+                'depth': (self._submitted - self._completed - self._failed),
+                'waiting': sum(len(_) for _ in self._queues.values()),
+                'delivering': self._deliveries.qsize(),
+                'utilization': (
+                    min((self._busy / (elapsed * self.workers)), 1.0)
+                    if elapsed > 0 else
+                    0.0
+                ),
+            }
+
+    def submit(
+        self, key: Hashable, requester_name: str, data: str, meta: dict,
+        callback: Callable[[List[Record]], None]
+    ) -> concurrent.futures.Future:
+        """ Submits data to be translated by a worker.
+
+        :param key: The key whose submissions are delivered in order
+        :type key: Hashable
+        :param requester_name: The class name of the requester of the data
+        :type requester_name: str
+        :param data: The data returned from the requester
+        :type data: str
+        :param meta: Any additional fields given to the requester
+        :type meta: dict
+        :param callback: Called with the translated records of the data
+        :type callback: callable
+        :returns: The future of the translation
+        :rtype: concurrent.futures.Future
+        """
+
+        executor = self.executor
+        with self._lock:
+            future = executor.submit(_translate, requester_name, data, meta)
+            self._queues.setdefault(key, collections.deque()).append(
+                (future, callback)
+            )
+            self._submitted += 1
+        future.add_done_callback(lambda _: self._drain(key))
+        return future
+
+    def _drain(self, key: Hashable) -> None:
+        """ Delivers the finished translations at the head of a key's queue.
+
+        :param key: The key whose queue should be drained
+        :type key: Hashable
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._delivery_lock:
+            while True:
+                with self._lock:
+                    queue = self._queues.get(key)
+                    if not queue or not queue[0][0].done():
+                        return
+                    (future, callback) = queue.popleft()
+                    if len(queue) <= 0:
+                        del self._queues[key]
+                try:
+                    (records, seconds) = future.result()
+                except Exception as exc:
+                    with self._lock:
+                        self._failed += 1
+                    const.log.exception((
+                        'translation failed in `{self}`, {exc} ...'
+                    ).format(self=self, exc=exc))
+                    continue
+                with self._lock:
+                    (self._completed, self._busy) = (
+                        (self._completed + 1), (self._busy + seconds)
+                    )
+                    self._deliveries.put((callback, records))
+
+    def _deliver(self, deliveries: queue.Queue) -> None:
+        """ Runs the callbacks of delivered translations until stopped.
+
+        :param deliveries: The queue of callbacks and their records
+        :type deliveries: queue.Queue
+        :returns: Does not return
+        :rtype: None
+        """
+
+        while True:
+            delivery = deliveries.get()
+            if delivery is None:
+                return
+            (callback, records) = delivery
+            try:
+                callback(records)
+            except Exception as exc:
+                const.log.exception((
+                    'delivering translated records failed in `{self}`, '
+                    '{exc} ...'
+                ).format(self=self, exc=exc))
+
+    def shutdown(self, wait: bool=True) -> None:
+        """ Shuts down the worker processes and the delivery thread.
+
+        :param wait: Waits for pending translations to be delivered if True
+        :type wait: bool
+        :returns: Does not return
+        :rtype: None
+        """
+
+        with self._lock:
+            (executor, self._executor) = (self._executor, None)
+            (delivery, self._delivery) = (self._delivery, None)
+            deliveries = self._deliveries
+        if executor is not None:
+            executor.shutdown(wait=wait)
+        # NOTE: without waiting, the delivery thread keeps delivering the
+        # translations still in flight
+        if delivery is not None and wait:
+            deliveries.put(None)
+            delivery.join()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import math
+import time
+import threading
+from typing import Tuple, Callable
+
+from . import const
+
+import pint
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> pint.UnitRegistry:
+    """ Retrieves the process wide unit registry, building it on first use.
+
+    .. note:: Building a registry is expensive, building it before forking
+        lets child processes share it
+
+    :returns: The shared unit registry
+    :rtype: pint.UnitRegistry
+    """
+
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            const.log.debug('building shared unit registry ...')
+            _registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+    return _registry
+
+
+class UnitConverter(object):
+    """ A cache of compiled conversions in between pairs of units.
+
+    Each ``(source, target)`` pair is compiled once.
+    Affine conversions (``value * factor + offset``) are probed through pint
+    at two points, verified at a third, and then applied with plain float
+    arithmetic.
+    Pairs failing verification keep converting through pint.
+    """
+
+    _verify_point = 100.0
+
+    def __init__(self, registry: pint.UnitRegistry=None):
+        """ Initializes the unit converter.
+
+        :param registry: The unit registry to compile with (shared registry)
+        :type registry: pint.UnitRegistry
+        """
+
+        self._registry = (registry if registry else get_registry())
+        self._conversions = {}
+        (self._hits, self._misses, self._fallbacks) = (0, 0, 0)
+        (self._conversions_count, self._seconds) = (0, 0.0)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """ A string representation of the unit converter.
+
+        :returns: A string representation of the unit converter
+        :rtype: str
+        """
+
+        return (
+            '<{self.__class__.__name__} compiled={compiled}>'
+        ).format(self=self, compiled=len(self._conversions))
+
+    @property
+    def registry(self) -> pint.UnitRegistry:
+        """ The unit registry conversions are compiled with.
+        """
+
+        return self._registry
+
+    @property
+    def metrics(self) -> dict:
+        """ The cache hit rate and throughput of the converter.
+        """
+
+        with self._lock:
+            lookups = (self._hits + self._misses)
+            return {
+                'compiled': len(self._conversions),
+                'fallbacks': self._fallbacks,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': ((self._hits / lookups) if lookups > 0 else 0.0),
+                'conversions': self._conversions_count,
+                'conversions_per_second': (
+                    (self._conversions_count / self._seconds)
+                    if self._seconds > 0 else
+                    0.0
+                ),
+            }
+
+    def _convert_pint(self, value: float, source: str, target: str) -> float:
+        """ Converts a value in between units through pint.
+
+        :param value: The value to convert
+        :type value: float
+        :param source: The unit expression of the value
+        :type source: str
+        :param target: The unit expression to convert to
+        :type target: str
+        :returns: The converted value
+        :rtype: float
+        """
+
+        return self._registry.Quantity(
+            value, self._registry.Unit(source)
+        ).to(self._registry.Unit(target)).magnitude
+
+    def compile(
+        self, source: str, target: str
+    ) -> Tuple[Callable[[float], float], str]:
+        """ Compiles the conversion in between a pair of units.
+
+        :param source: The unit expression to convert from
+        :type source: str
+        :param target: The unit expression to convert to
+        :type target: str
+        :returns: A tuple of the conversion function and the target unit
+        :rtype: tuple
+        """
+
+        zero = self._registry.Quantity(
+            0.0, self._registry.Unit(source)
+        ).to(self._registry.Unit(target))
+        (offset, unit) = (zero.magnitude, str(zero.units))
+        factor = (self._convert_pint(1.0, source, target) - offset)
+        expected = ((self._verify_point * factor) + offset)
+        if math.isclose(
+            self._convert_pint(self._verify_point, source, target), expected,
+            rel_tol=1e-9, abs_tol=1e-12
+        ):
+            return ((lambda value: ((value * factor) + offset)), unit)
+
+        const.log.debug((
+            'conversion from `{source}` to `{target}` is not affine, '
+            'falling back to pint ...'
+        ).format(source=source, target=target))
+        self._fallbacks += 1
+        return (
+            (lambda value: self._convert_pint(value, source, target)), unit
+        )
+
+    def _lookup(
+        self, source: str, target: str
+    ) -> Tuple[bool, Tuple[Callable[[float], float], str]]:
+        """ Looks up the compiled conversion of a pair, compiling if needed.
+
+        :param source: The unit expression to convert from
+        :type source: str
+        :param target: The unit expression to convert to
+        :type target: str
+        :returns: A tuple of True on a cache hit and the compiled conversion
+        :rtype: tuple
+        """
+
+        key = (source, target)
+        conversion = self._conversions.get(key)
+        if conversion is not None:
+            return (True, conversion)
+        conversion = self.compile(source, target)
+        self._conversions[key] = conversion
+        return (False, conversion)
+
+    def conversion(
+        self, source: str, target: str
+    ) -> Tuple[Callable[[float], float], str]:
+        """ Retrieves the cached conversion in between a pair of units.
+
+        .. note:: Meant for converting many values at once, the returned
+            function's calls are not counted in the converter's metrics
+
+        :param source: The unit expression to convert from
+        :type source: str
+        :param target: The unit expression to convert to
+        :type target: str
+        :returns: A tuple of the conversion function and the target unit
+        :rtype: tuple
+        """
+
+        (hit, conversion) = self._lookup(source, target)
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return conversion
+
+    def convert(
+        self, value: float, source: str, target: str
+    ) -> Tuple[float, str]:
+        """ Converts a value in between units.
+
+        :param value: The value to convert
+        :type value: float
+        :param source: The unit expression of the value
+        :type source: str
+        :param target: The unit expression to convert to
+        :type target: str
+        :returns: A tuple of the converted value and its unit
+        :rtype: tuple
+        """
+
+        started = time.perf_counter()
+        (hit, (function, unit)) = self._lookup(source, target)
+        converted = function(value)
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._conversions_count += 1
+            self._seconds += (time.perf_counter() - started)
+        return (converted, unit)
@@ -23,6 +23,7 @@ setup(
     install_requires=[
         'jsonschema>=2.6.0',
         'requests>=2.13.0',
+        'aiohttp>=3.3.0',
         'blinker>=1.4',
         'pint>=0.7.2',
         'lxml>=3.4.2',
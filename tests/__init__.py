@@ -8,6 +8,9 @@ from ._example import *
 from .engine import *
 from .client import *
 from .device import *
+from .units import *
+from .backfill import *
+from .importer import *
 from .models import *
 from .scheduler import *
 from .requester import *
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import logging
+import unittest
+
+from neat import const
+from neat.backfill import Backfill
+from neat.requester.obvius import ObviusLogRequester, ObviusHostLogRequester
+
+import requests_mock
+
+from . import fixtures
+
+
+class BackfillTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        (self._data, self._meta) = (
+            fixtures.OBVIUS_LOG_DAT, fixtures.obvius_log_meta()
+        )
+        self._devices = [
+            {
+                'scheduler': {'$': 'SimpleDelayScheduler', 'delay': 10.0},
+                'requester': dict(
+                    self._meta,
+                    **{
+                        '$': 'AsyncObviusRequester', 'device_id': 4,
+                        'obvius_ip': '127.0.0.3', 'obvius_user': 'user',
+                        'obvius_pass': 'pass', 'host_concurrency': 2,
+                    }
+                ),
+            },
+            {
+                'scheduler': {'$': 'SimpleDelayScheduler', 'delay': 10.0},
+                'requester': {'$': 'UnknownRequester'},
+            },
+        ]
+        self._url = (
+            'http://127.0.0.3:80{endpoint}?ADDRESS=4&TYPE=LOGFILE'
+        ).format(endpoint=ObviusLogRequester._request_endpoint)
+
+    def test_from_devices(self):
+        job = Backfill.from_devices(self._devices, [])
+        self.assertEqual(len(job.requesters), 1)
+        (requester,) = job.requesters
+        self.assertIsInstance(requester, ObviusLogRequester)
+        self.assertNotIn('host_concurrency', requester._meta)
+        self.assertEqual(requester._meta['name'], 'wind.1')
+
+        job = Backfill.from_devices([{'requester': {
+            '$': 'ObviusHostRequester', 'devices': [{'device_id': 4}],
+            'obvius_ip': '127.0.0.3', 'obvius_user': 'user',
+            'obvius_pass': 'pass',
+        }}], [])
+        self.assertIsInstance(job.requesters[0], ObviusHostLogRequester)
+
+    def test_run(self):
+        (pipe, invalid_pipe) = (
+            fixtures.ListPipe(), fixtures.ListPipe(valid=False)
+        )
+        job = Backfill.from_devices(
+            self._devices, [pipe, invalid_pipe], batch_size=2
+        )
+        with requests_mock.mock() as mock:
+            mock.get(self._url, text=self._data)
+            stats = job.run(1487952000)
+        self.assertEqual(job.pipes, [pipe])
+        self.assertEqual(stats['records'], 3)
+        self.assertEqual(stats['invalid'], 0)
+        self.assertEqual(stats['batches'], 2)
+        self.assertEqual(stats['devices']['wind.1']['records'], 3)
+        self.assertGreater(stats['records_per_second'], 0)
+        self.assertEqual(pipe.batches, 2)
+        self.assertEqual(
+            [_.timestamp for _ in pipe.records],
+            [1487952000, 1487952900, 1487954700]
+        )
+        self.assertEqual(invalid_pipe.records, [])
+
+        with requests_mock.mock() as mock:
+            mock.get(self._url, text=self._data)
+            stats = job.run(1487952000, end=1487952900)
+        self.assertEqual(stats['records'], 1)
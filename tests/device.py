@@ -10,6 +10,7 @@ import unittest
 
 from neat import const
 from neat.models.record import Record, RecordPoint
+from neat.units import get_registry
 from neat.device import AbstractDevice, DeviceType
 
 import pint
@@ -180,6 +181,7 @@ class DeviceTypeTest(unittest.TestCase):
             self.assertEqual(len(entry.value), 2)
             self.assertIsInstance(entry.value[-1], AbstractDevice)
             self.assertIsInstance(entry.value[-1].ureg, pint.UnitRegistry)
+            self.assertIs(entry.value[-1].ureg, get_registry())
 
     def test_parse(self):
         valid_parsed = self._device_type[
@@ -201,3 +203,25 @@ class DeviceTypeTest(unittest.TestCase):
         self.assertIsInstance(broken_parsed['inverter_real'], RecordPoint)
         self.assertIsNone(broken_parsed['inverter_real'].value)
         self.assertEqual(broken_parsed['inverter_real'].unit, 'dimensionless')
+
+    def test_parse_units(self):
+        record = Record(**{
+            'name': 'test_name',
+            'type': 'SOLAR_THERM',
+            'data': {
+                '0': RecordPoint(name='rate', unit='kilowatt', value=2.0),
+                '1': RecordPoint(name='supply', unit='degC', value=100.0),
+            },
+            'parsed': {
+                'energy_rate': {'point': '0', 'unit': 'btu / hour'},
+                'supply_temp': {'point': '1', 'unit': 'degF'},
+            }
+        })
+        solar_therm = self._device_type.SOLAR_THERM.value[-1]
+        parsed = solar_therm.parse(record)
+        self.assertAlmostEqual(parsed['energy_rate'].value, 6824.283, places=3)
+        self.assertEqual(parsed['energy_rate'].unit, 'btu / hour')
+        self.assertAlmostEqual(parsed['supply_temp'].value, 212.0, places=5)
+        self.assertEqual(parsed['supply_temp'].unit, 'degF')
+        self.assertIsNone(parsed['flow_rate'].value)
+        self.assertGreaterEqual(solar_therm.converter.metrics['misses'], 2)
@@ -4,13 +4,22 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import os
+import time
 import logging
+import tempfile
 import unittest
+import multiprocessing
 from unittest.mock import MagicMock
 
-
 from neat import const
-from neat.engine import Engine
+from neat.engine import Engine, AsyncEngine
+from neat.models.record import Record
+from neat.requester.obvius import ObviusRequester
+from neat.scheduler.monotonic import MonotonicDelayScheduler
+from neat.scheduler.shared import SharedDelayScheduler
+
+from . import fixtures
 
 
 class EngineTest(unittest.TestCase):
@@ -25,6 +34,150 @@ class EngineTest(unittest.TestCase):
     def test_initialization(self):
         self.assertEqual(self._blank_engine._register, {})
 
+    def test_metrics(self):
+        self.assertEqual(
+            {
+                k: v for (k, v) in self._blank_engine.metrics.items()
+                if k != 'units'
+            },
+            {
+                'schedulers': {}, 'requesters': {},
+                'translators': {}, 'translation': {}, 'pipes': {},
+            }
+        )
+        self.assertIsInstance(self._blank_engine.metrics['units'], dict)
+
+    def test_spread_phases(self):
+        register = {
+            MonotonicDelayScheduler(10): ObviusRequester(
+                device_id, '127.0.0.1', 'user', 'pass'
+            )
+            for device_id in range(2)
+        }
+        register[MonotonicDelayScheduler(10)] = ObviusRequester(
+            0, '127.0.0.2', 'user', 'pass'
+        )
+        engine = Engine(register, phase_spread=False)
+        engine._spread_phases()
+        self.assertEqual([_.phase for _ in register.keys()], [0.0] * 3)
+        engine = Engine(register)
+        engine._spread_phases()
+        self.assertEqual([_.phase for _ in register.keys()], [0.0] * 3)
+        engine = Engine(register, phase_spread=True)
+        engine._spread_phases()
+        self.assertEqual([_.phase for _ in register.keys()], [0.0, 5.0, 0.0])
+
+    def test_latency_baseline(self):
+        requester = ObviusRequester(0, '127.0.0.3', 'user', 'pass')
+        requester.host_latency.pop(requester.host, None)
+        self.addCleanup(requester.host_latency.pop, requester.host, None)
+        requester.latency.record(0.5)
+        engine = Engine({MonotonicDelayScheduler(10): requester})
+        engine._log_latency(baseline=True)
+        process = multiprocessing.Process(
+            target=requester.latency.record, args=(1.5,)
+        )
+        process.start()
+        process.join(5.0)
+        latency = engine.metrics['requesters'][repr(requester)]['latency']
+        self.assertEqual((latency['count'], latency['max']), (2, 1.5))
+        self.assertEqual(
+            (latency['baseline']['count'], latency['baseline']['mean']),
+            (1, 0.5)
+        )
+
+    def test_on_scheduled(self):
+        scheduler = MonotonicDelayScheduler(10)
+        requester = MagicMock()
+        Engine({scheduler: requester}).on_scheduled(scheduler)
+        requester.request.assert_called_with(timeout=8.0)
+
+    def test_translate_workers(self):
+        with self.assertRaises(ValueError):
+            Engine({MonotonicDelayScheduler(10): None}, translate_workers=1)
+        Engine(
+            {SharedDelayScheduler(10): None}, translate_workers=1
+        )._translator_pool.shutdown()
+        engine = Engine({}, translate_workers=1)
+        engine.on_record = MagicMock()
+        scheduler = MagicMock()
+        engine._context.scheduler = scheduler
+        engine.on_data(
+            ObviusRequester(4, '127.0.0.1', 'user', 'pass'),
+            fixtures.OBVIUS_VALID_DAT, {'name': 'test', 'type': 'WIND'}
+        )
+        engine._context.scheduler = None
+        engine._translator_pool.shutdown()
+        (record,) = engine.on_record.call_args[0]
+        self.assertIsInstance(record, Record)
+        self.assertEqual(record.name, 'test')
+        self.assertEqual(engine.metrics['translation']['completed'], 1)
+        self.assertEqual(engine.translators, {})
+
+    def test_pipe_queue(self):
+        with self.assertRaises(ValueError):
+            Engine({}, pipe_policy='unknown')
+        record = fixtures.populated_record()
+        piper = fixtures.ListPipe()
+        piper.close = MagicMock()
+        engine = Engine({}, [piper], pipe_queue=2, pipe_policy='spill')
+        engine.start()
+        self.assertIn(piper, engine._dispatchers)
+        for _ in range(5):
+            engine.on_record(record)
+        self.assertIn('queue', engine.metrics['pipes'][repr(piper)])
+        engine.stop()
+        self.assertEqual(engine._dispatchers, {})
+        piper.close.assert_called_once_with()
+        self.assertEqual(len(piper.records), 5)
+        self.assertEqual(piper.records[0], record)
+
+    def test_pipe_queue_forked(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        piper = fixtures.FilePipe(os.path.join(directory.name, 'records'))
+        scheduler = MonotonicDelayScheduler(0.02)
+        requester = MagicMock()
+        engine = Engine({scheduler: requester}, [piper], pipe_queue=10)
+        requester.request.side_effect = (
+            lambda timeout=None: engine.on_record(fixtures.populated_record())
+        )
+        # NOTE: schedulers share their signal, keep later engines clean
+        self.addCleanup(scheduler.signal.disconnect, engine.on_scheduled)
+        engine.start()
+        time.sleep(0.3)
+        engine.stop()
+        self.assertEqual(scheduler.exitcode, 0)
+        ticks = scheduler.metrics['ticks']
+        self.assertGreater(ticks, 0)
+        # NOTE: the scheduler may be terminated before recording its tick
+        self.assertIn(len(piper.read()), (ticks, ticks + 1))
+
+    def test_pipe_buffer_forked(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        piper = fixtures.FilePipe(
+            os.path.join(directory.name, 'records'), batch_size=1000
+        )
+        scheduler = MonotonicDelayScheduler(0.02)
+        requester = MagicMock()
+        engine = Engine({scheduler: requester}, [piper])
+        requester.request.side_effect = (
+            lambda timeout=None: engine.on_record(fixtures.populated_record())
+        )
+        # NOTE: schedulers share their signal, keep later engines clean
+        self.addCleanup(scheduler.signal.disconnect, engine.on_scheduled)
+        engine.start()
+        time.sleep(0.3)
+        self.assertEqual(piper.read(), [])
+        engine.stop()
+        ticks = scheduler.metrics['ticks']
+        self.assertGreater(ticks, 0)
+        self.assertIn(len(piper.read()), (ticks, ticks + 1))
+        self.assertEqual(engine.metrics['pipes'][repr(piper)]['buffer'], {
+            'buffered': 0, 'flushes': 0, 'failed_flushes': 0, 'failed': 0,
+        })
+
     def test_signals(self):
         that = self
         self._blank_engine.on_start.send = MagicMock()
@@ -42,3 +195,28 @@ class EngineTest(unittest.TestCase):
         self._blank_engine.on_start.send.assert_called_with(self._blank_engine)
         self._blank_engine.stop()
         self._blank_engine.on_stop.send.assert_called_with(self._blank_engine)
+
+
+class AsyncEngineTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._blank_engine = AsyncEngine({})
+
+    def tearDown(self):
+        del self._blank_engine
+
+    def test_initialization(self):
+        self.assertIsInstance(self._blank_engine, Engine)
+        self.assertEqual(self._blank_engine._register, {})
+        self.assertIsNone(self._blank_engine.loop)
+
+    def test_start_stop(self):
+        self._blank_engine.on_start.send = MagicMock()
+        self._blank_engine.on_stop.send = MagicMock()
+        self._blank_engine.start()
+        self._blank_engine.on_start.send.assert_called_with(self._blank_engine)
+        self.assertIsNotNone(self._blank_engine.loop)
+        self._blank_engine.stop()
+        self._blank_engine.on_stop.send.assert_called_with(self._blank_engine)
+        self.assertIsNone(self._blank_engine.loop)
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+""" Payloads shared by the test cases and the benchmarks.
+
+Kept out of the test case modules so importing a fixture never makes the
+test runner collect (and run) another module's test cases again.
+"""
+
+import os
+import threading
+
+from neat.models.record import Record, RecordPoint
+from neat.pipe._common import AbstractPipe
+
+OBVIUS_VALID_DAT = '''<?xml version="1.0" encoding="UTF-8" ?>
+<DAS>
+    <name>001EC600070F</name>
+    <serial>001EC600070F</serial>
+    <devices>
+        <device>
+            <name>Broyhill Wind Turbine</name>
+            <address>4</address>
+            <type>Turbine</type>
+            <class>8000</class>
+            <status>Ok</status>
+            <numpoints>16</numpoints>
+            <records>
+                <record>
+                    <time zone="UTC">2017-02-24 16:06:22</time>
+                    <age units="seconds">59</age>
+                    <error text="Ok">0</error>
+                    <point number="0" name="Inverter Reactive Power" units="kVAR" value="0.214"  />
+                    <point number="1" name="Inverter Real Power" units="kW" value="1.153"  />
+                    <point number="2" name="RMS Line Voltage Phase A-N" units="Volts" value="278.874"  />
+                    <point number="3" name="RMS Line Voltage Phase B-N" units="Volts" value="279.530"  />
+                    <point number="4" name="RMS Line Voltage Phase C-N" units="Volts" value="278.169"  />
+                    <point number="5" name="RMS Line Current Phase A" units="Amps" value="2.961"  />
+                    <point number="6" name="RMS Line Current Phase B" units="Amps" value="3.130"  />
+                    <point number="7" name="RMS Line Current Phase C" units="Amps" value="2.830"  />
+                    <point number="8" name="Grid Frequency" units="Hz" value="59.985"  />
+                    <point number="9" name="Ambient Temperature" units="Degrees F" value="59.756"  />
+                    <point number="10" name="Rotor Speed" units="RPM" value="32.819"  />
+                    <point number="11" name="Inverter Energy Total" units="kWh" value="790338.000"  />
+                    <point number="12" name="Wind Speed (10 minute average)" units="MPH" value="7.843"  />
+                    <point number="13" name="Wind Speed (1 minute average)" units="MPH" value="10.924"  />
+                    <point number="14" name="Wind speed (1 second average)" units="MPH" value="10.781"  />
+                    <point number="15" name="Turbine Run Time" units="hours" value="49126.903"  />
+                </record>
+            </records>
+        </device>
+    </devices>
+</DAS>'''
+
+OBVIUS_INVALID_DAT = '''<?xml version="1.0" encoding="UTF-8" ?>
+<DAS>
+    <name>001EC600070F</name>
+    <serial>001EC600070F</serial>
+    <devices>
+        <device>
+            <name>Broyhill Wind Turbine</name>
+            <address>4</address>
+            <type>Turbine</type>
+            <class>8000</class>
+            <status>Ok</status>
+            <numpoints>16</numpoints>
+            <records>
+                <record>
+                    <time zone="UTC">2017-02-24 16:06:22</time>
+                    <age units="seconds">59</age>
+                    <error text="Ok">1</error>
+                    <point number="0" name="Inverter Reactive Power" units="kVAR" value="0.214"  />
+                    <point number="1" name="Inverter Real Power" units="kW" value="1.153"  />
+                    <point number="2" name="RMS Line Voltage Phase A-N" units="Volts" value="278.874"  />
+                    <point number="3" name="RMS Line Voltage Phase B-N" units="Volts" value="279.530"  />
+                    <point number="4" name="RMS Line Voltage Phase C-N" units="Volts" value="278.169"  />
+                    <point number="5" name="RMS Line Current Phase A" units="Amps" value="2.961"  />
+                    <point number="6" name="RMS Line Current Phase B" units="Amps" value="3.130"  />
+                    <point number="7" name="RMS Line Current Phase C" units="Amps" value="2.830"  />
+                    <point number="8" name="Grid Frequency" units="Hz" value="59.985"  />
+                    <point number="9" name="Ambient Temperature" units="Degrees F" value="59.756"  />
+                    <point number="10" name="Rotor Speed" units="RPM" value="32.819"  />
+                    <point number="11" name="Inverter Energy Total" units="kWh" value="790338.000"  />
+                    <point number="12" name="Wind Speed (10 minute average)" units="MPH" value="7.843"  />
+                    <point number="13" name="Wind Speed (1 minute average)" units="MPH" value="10.924"  />
+                    <point number="14" name="Wind speed (1 second average)" units="MPH" value="10.781"  />
+                    <point number="15" name="Turbine Run Time" units="hours" value="49126.903"  />
+                </record>
+            </records>
+        </device>
+    </devices>
+</DAS>'''
+
+OBVIUS_LOG_DAT = '\n'.join((
+    "'time(UTC)','error','lowrange','highrange',"
+    "'Inverter Reactive Power (kVAR)','Inverter Real Power (kW)',"
+    "'Inverter Energy Total (kWh)','Rotor Speed (RPM)',"
+    "'Wind Speed (10 minute average) (MPH)'",
+    "'2017-02-24 16:00:00',0,0,0,0.214,1.153,790338.000,32.819,7.843",
+    "'2017-02-24 16:15:00',0,0,0,0.200,1.100,790338.300,30.000,7.000",
+    "'2017-02-24 16:30:00',1,0,0,,,,,",
+    "'2017-02-24 16:45:00',0,0,0,0.100,1.000,790338.600,29.000,6.500",
+))
+
+
+def obvius_log_meta() -> dict:
+    """ Builds the meta of the device logging :data:`OBVIUS_LOG_DAT`.
+
+    :returns: A new meta dictionary
+    :rtype: dict
+    """
+
+    return {
+        'name': 'wind.1', 'type': 'WIND', 'lat': 1.0, 'lon': 2.0,
+        'ttl': 300,
+        'parsed': {
+            'inverter_real': {'point': 1},
+            'inverter_energy_total': {'point': 2},
+            'rotor_speed': {'point': 3},
+            'wind_speed': {'point': 4},
+        },
+    }
+
+
+def populated_record() -> Record:
+    """ Builds a valid record with a single data point.
+
+    :returns: A new record
+    :rtype: Record
+    """
+
+    return Record(**{
+        'device_name': 'test_device_name',
+        'name': 'test_name',
+        'lon': 12.3,
+        'lat': -12.3,
+        'timestamp': 1234567890,
+        'ttl': 1,
+        'type': 'DEVICE_TYPE',
+        'data': {
+            '0': RecordPoint(**{
+                'number': 1,
+                'name': 'test_name',
+                'unit': 'test_unit',
+                'value': 123.45
+            })
+        }
+    })
+
+
+class ListPipe(AbstractPipe):
+    """ A pipe collecting accepted records into a list.
+
+    Records named ``fail`` raise a ValueError and ``accept`` blocks while
+    ``gate`` is cleared.
+    """
+
+    def __init__(self, valid: bool=True):
+        (self.valid, self.records, self.batches) = (valid, [], 0)
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def accept(self, record):
+        self.gate.wait()
+        if record.name == 'fail':
+            raise ValueError('failed to write')
+        self.records.append(record)
+
+    def accept_many(self, records):
+        self.batches += 1
+        super().accept_many(records)
+
+    def validate(self):
+        return self.valid
+
+
+class FilePipe(AbstractPipe):
+    """ A pipe appending the names of accepted records to a file.
+
+    Unlike :class:`ListPipe` the written records are visible to the parent
+    of a forked scheduler process.
+    """
+
+    def __init__(self, path: str, batch_size: int=1):
+        (self.path, self.batch_size) = (path, batch_size)
+
+    def accept(self, record):
+        if self.batch_size > 1:
+            self.buffer(record)
+        else:
+            self.accept_many([record])
+
+    def accept_many(self, records):
+        with open(self.path, 'a') as fp:
+            fp.write(''.join(record.name + '\n' for record in records))
+
+    def validate(self):
+        return True
+
+    def read(self):
+        if not os.path.isfile(self.path):
+            return []
+        with open(self.path, 'r') as fp:
+            return fp.read().splitlines()
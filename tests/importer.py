@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import os
+import json
+import shutil
+import logging
+import tempfile
+import unittest
+
+from neat import const
+from neat.importer import BulkImporter, _import_file
+
+from . import fixtures
+
+
+class BulkImporterTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._directory = tempfile.mkdtemp()
+        for (relpath, content) in (
+            ('wind/2017/a.xml', fixtures.OBVIUS_VALID_DAT),
+            ('wind/2017/b.xml', fixtures.OBVIUS_INVALID_DAT),
+            ('wind/2017/c.csv', fixtures.OBVIUS_LOG_DAT),
+            ('wind/notes.txt', 'ignored'),
+            ('other/d.xml', fixtures.OBVIUS_VALID_DAT),
+        ):
+            path = os.path.join(self._directory, relpath)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as fp:
+                fp.write(content)
+        self._devices = [
+            dict(fixtures.obvius_log_meta(), pattern='wind/*.csv'),
+            dict(
+                fixtures.obvius_log_meta(), pattern='wind/*',
+                parsed={
+                    'inverter_real': {'point': 1},
+                    'inverter_energy_total': {'point': 11},
+                    'rotor_speed': {'point': 10},
+                    'wind_speed': {'point': 12},
+                }
+            ),
+        ]
+        self._checkpoint = os.path.join(self._directory, 'checkpoint.json')
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_initialization(self):
+        importer = BulkImporter([], self._devices)
+        self.assertEqual(importer.workers, (os.cpu_count() or 1))
+        self.assertIsNone(importer.checkpoint)
+        self.assertEqual(importer.meta('wind/2017/a.xml')['name'], 'wind.1')
+        self.assertNotIn('pattern', importer.meta('wind/2017/a.xml'))
+        self.assertIsNone(importer.meta('other/d.xml'))
+        self.assertEqual(
+            [_[1] for _ in importer.walk(self._directory)],
+            [
+                os.path.join('other', 'd.xml'),
+                os.path.join('wind', '2017', 'a.xml'),
+                os.path.join('wind', '2017', 'b.xml'),
+                os.path.join('wind', '2017', 'c.csv'),
+            ]
+        )
+
+    def test_run(self):
+        pipe = fixtures.ListPipe()
+        importer = BulkImporter(
+            [pipe], self._devices, workers=2, batch_size=2,
+            checkpoint=self._checkpoint
+        )
+        stats = importer.run(self._directory)
+        self.assertEqual(stats['files'], 3)
+        self.assertEqual(stats['skipped'], 1)
+        self.assertEqual(stats['failed'], 0)
+        self.assertEqual(stats['records'], 4)
+        self.assertEqual(stats['batches'], 2)
+        self.assertGreater(stats['records_per_second'], 0)
+        self.assertEqual(len(pipe.records), 4)
+        # NOTE: archived xml payloads keep the device's time
+        self.assertIn(1487952382, [_.timestamp for _ in pipe.records])
+
+        with open(self._checkpoint, 'r') as fp:
+            self.assertEqual(len(json.load(fp)['files']), 3)
+        stats = importer.run(self._directory)
+        self.assertEqual(stats['resumed'], 3)
+        self.assertEqual(stats['records'], 0)
+        self.assertEqual(len(pipe.records), 4)
+
+    def test_import_file(self):
+        path = os.path.join(self._directory, 'wind', '2017', 'c.csv')
+        (records, invalid) = _import_file(path, fixtures.obvius_log_meta())
+        self.assertGreater(len(records), 0)
+        self.assertEqual(invalid, 0)
+        (records, invalid) = _import_file(
+            path, dict(fixtures.obvius_log_meta(), name=1)
+        )
+        self.assertEqual(records, [])
+        self.assertGreater(invalid, 0)
+
+    def test_import_declared_encoding(self):
+        path = os.path.join(self._directory, 'latin.xml')
+        with open(path, 'wb') as fp:
+            fp.write(fixtures.OBVIUS_VALID_DAT.replace(
+                'encoding="UTF-8"', 'encoding="ISO-8859-1"'
+            ).replace(
+                'Inverter Real Power', 'Inverter Real Power \u00b0'
+            ).encode('iso-8859-1'))
+        meta = dict(self._devices[1])
+        del meta['pattern']
+        (records, _) = _import_file(path, meta)
+        self.assertIn(
+            'Inverter Real Power \u00b0',
+            [_.name for _ in records[0].data.values()]
+        )
@@ -5,3 +5,5 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 from .record import *
+from .batch import *
+from .validator import *
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import logging
+import unittest
+
+from neat import const
+from neat.models.batch import RecordBatch
+from neat.models.record import Record, RecordPoint
+
+
+class RecordBatchTest(unittest.TestCase):
+
+    def _record(
+        self, name: str, timestamp: int, value: float, unit: str='watt'
+    ) -> Record:
+        return Record(**{
+            'name': name,
+            'device_name': '{} device'.format(name),
+            'type': 'WIND',
+            'lon': 12.3,
+            'lat': -12.3,
+            'ttl': 300,
+            'timestamp': timestamp,
+            'location': 'roof',
+            'data': {
+                1: RecordPoint(name='Power', value=value, unit=unit),
+            },
+            'parsed': {
+                'power': RecordPoint(value=value, unit=unit),
+                'speed': RecordPoint(value=None, unit='meter / second'),
+            },
+        })
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._records = [
+            self._record('wind.1', 30, 3.0),
+            self._record('wind.2', 20, 2.0),
+            self._record('wind.1', 10, 1.0),
+            self._record('wind.2', 40, 4.0),
+        ]
+        self._batch = RecordBatch.from_records(self._records)
+
+    def tearDown(self):
+        del self._records
+        del self._batch
+
+    def test_round_trip(self):
+        self.assertEqual(len(self._batch), 4)
+        self.assertEqual(len(self._batch.columns), 3)
+        self.assertEqual(
+            [record.to_dict() for record in self._batch.to_records()],
+            [record.to_dict() for record in self._records]
+        )
+        self.assertEqual(
+            list(self._batch.timestamps), [30.0, 20.0, 10.0, 40.0]
+        )
+        self.assertEqual(
+            self._batch.names, ['wind.1', 'wind.2', 'wind.1', 'wind.2']
+        )
+
+    def test_missing_points(self):
+        record = self._record('wind.3', 50, 5.0)
+        del record.parsed['speed']
+        record.parsed['direction'] = RecordPoint(value=90.0, unit='degree')
+        self._batch.append(record)
+        self.assertEqual(
+            list(self._batch.present(('parsed', 'speed'))),
+            [RecordBatch.NULL] * 4 + [RecordBatch.MISSING]
+        )
+        self.assertEqual(
+            list(self._batch.present(('parsed', 'direction'))),
+            [RecordBatch.MISSING] * 4 + [RecordBatch.VALUE]
+        )
+        self.assertEqual(
+            self._batch.record(4).to_dict(), record.to_dict()
+        )
+        self.assertNotIn('direction', self._batch.record(0).parsed)
+
+    def test_append_converts(self):
+        self._batch.append(self._record('wind.3', 50, 5.0, unit='kilowatt'))
+        self.assertEqual(self._batch.unit(('parsed', 'power')), 'watt')
+        self.assertAlmostEqual(
+            self._batch.values(('parsed', 'power'))[4], 5000.0
+        )
+        with self.assertRaises(ValueError):
+            self._batch.append(self._record('wind.3', 60, 6.0, unit='meter'))
+        self.assertEqual(len(self._batch), 5)
+        for key in self._batch.columns:
+            self.assertEqual(len(self._batch.values(key)), 5)
+
+    def test_slice(self):
+        view = self._batch[1:3]
+        self.assertEqual(len(view), 2)
+        self.assertEqual(list(view.timestamps), [20.0, 10.0])
+        self.assertEqual(
+            view.record(0).to_dict(), self._records[1].to_dict()
+        )
+        values = self._batch.values(('parsed', 'power'))
+        self.assertIsInstance(view.values(('parsed', 'power')), memoryview)
+        self.assertEqual(view.values(('parsed', 'power'))[0], values[1])
+        with self.assertRaises(ValueError):
+            view.append(self._records[0])
+
+    def test_between(self):
+        with self.assertRaises(ValueError):
+            self._batch.between(10, 30)
+        ordered = self._batch.sort()
+        self.assertTrue(ordered.time_sorted)
+        self.assertEqual(list(ordered.timestamps), [10.0, 20.0, 30.0, 40.0])
+        self.assertEqual(list(ordered.between(20, 40).timestamps), [
+            20.0, 30.0,
+        ])
+        self.assertEqual(list(ordered.between(start=25).timestamps), [
+            30.0, 40.0,
+        ])
+        self.assertEqual(len(ordered.between(end=5)), 0)
+
+    def test_by_device(self):
+        devices = self._batch.by_device()
+        self.assertEqual(sorted(devices.keys()), ['wind.1', 'wind.2'])
+        self.assertEqual(list(devices['wind.1'].timestamps), [10.0, 30.0])
+        self.assertEqual(list(devices['wind.2'].timestamps), [20.0, 40.0])
+        self.assertEqual(
+            devices['wind.2'].record(1).to_dict(), self._records[3].to_dict()
+        )
+
+    def test_convert(self):
+        (values, unit) = self._batch.convert(('data', 1, 'Power'), 'kilowatt')
+        self.assertEqual(unit, 'kilowatt')
+        self.assertEqual(
+            [round(value, 6) for value in values],
+            [0.003, 0.002, 0.001, 0.004]
+        )
+
+    def test_validate(self):
+        invalid = self._record('wind.3', 50, 5.0)
+        invalid.parsed['Bad Name'] = RecordPoint(value=1.0, unit='watt')
+        blank = Record()
+        self._batch.extend([invalid, blank])
+        self.assertEqual(
+            list(self._batch.validate()),
+            [
+                int(record.validate())
+                for record in (self._records + [invalid, blank])
+            ]
+        )
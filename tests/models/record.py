@@ -4,33 +4,24 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import json
+import pickle
+import logging
 import unittest
 
 from neat import const
 from neat.models.record import Record, RecordPoint
 
+import jsonschema
+
+from .. import fixtures
+
 
 class RecordTest(unittest.TestCase):
 
     def setUp(self):
         self._blank_record = Record()
-        self._populated_record = Record(**{
-            'device_name': 'test_device_name',
-            'name': 'test_name',
-            'lon': 12.3,
-            'lat': -12.3,
-            'timestamp': 1234567890,
-            'ttl': 1,
-            'type': 'DEVICE_TYPE',
-            'data': {
-                '0': RecordPoint(**{
-                    'number': 1,
-                    'name': 'test_name',
-                    'unit': 'test_unit',
-                    'value': 123.45
-                })
-            }
-        })
+        self._populated_record = fixtures.populated_record()
 
     def tearDown(self):
         del self._blank_record
@@ -44,6 +35,7 @@ class RecordTest(unittest.TestCase):
         self.assertIsNone(self._blank_record.timestamp)
         self.assertIsNone(self._blank_record.ttl)
         self.assertIsNone(self._blank_record.type)
+        self.assertIsNone(self._blank_record.age)
         self.assertEqual(self._blank_record.parsed, {})
         self.assertFalse(self._blank_record.validate())
 
@@ -61,6 +53,93 @@ class RecordTest(unittest.TestCase):
         self.assertIsInstance(self._populated_record.parsed, dict)
         self.assertTrue(self._populated_record.validate())
 
+        self._populated_record.age = '59'
+        self.assertEqual(self._populated_record.age, 59.0)
+        self.assertNotIn('age', self._populated_record.to_dict())
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self._blank_record, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self._blank_record.unknown = True
+        record = Record(name='test_name', unknown=True)
+        self.assertEqual(record.to_dict()['meta'], {'unknown': True})
+
+    def test_pickle(self):
+        record = pickle.loads(pickle.dumps(self._populated_record))
+        self.assertEqual(record.to_dict(), self._populated_record.to_dict())
+
+    def test_payload(self):
+        payload = self._populated_record.payload
+        self.assertEqual(payload, self._populated_record.to_dict())
+        self.assertIs(self._populated_record.payload, payload)
+        with self.assertRaises(TypeError):
+            payload['name'] = 'changed'
+        with self.assertRaises(TypeError):
+            payload['data']['0']['value'] = 0.0
+        self.assertEqual(
+            json.loads(self._populated_record.encoded.decode('utf-8')),
+            self._populated_record.to_dict()
+        )
+
+        self._populated_record.name = 'changed'
+        self.assertIsNot(self._populated_record.payload, payload)
+        self.assertEqual(self._populated_record.payload['name'], 'changed')
+        self.assertEqual(json.loads(
+            self._populated_record.encoded.decode('utf-8')
+        )['name'], 'changed')
+
+        record = self._populated_record
+        encoded = record.encoded
+        record.data['0'].value = 0.0
+        self.assertEqual(record.payload['data']['0']['value'], 0.0)
+        self.assertIsNot(record.encoded, encoded)
+        record.data['1'] = RecordPoint(name='Extra', value=1.0, unit='watt')
+        self.assertIn('1', record.payload['data'])
+        record.parsed['power'] = RecordPoint(value=1.0, unit='watt')
+        self.assertIn('power', record.payload['parsed'])
+        record.parsed['power'].unit = 'kilowatt'
+        self.assertEqual(record.payload['parsed']['power']['unit'], 'kilowatt')
+        del record.parsed['power']
+        self.assertNotIn('power', record.payload['parsed'])
+        record.to_dict()['meta']['location'] = 'roof'
+        self.assertEqual(record.payload['meta']['location'], 'roof')
+        self.assertEqual(
+            json.loads(record.encoded.decode('utf-8')), record.to_dict()
+        )
+        payload = record.payload
+        self.assertIs(record.payload, payload)
+
+        unpickled = pickle.loads(pickle.dumps(record))
+        self.assertEqual(unpickled.payload, record.payload)
+        unpickled.data['0'].value = 1.0
+        self.assertEqual(unpickled.payload['data']['0']['value'], 1.0)
+
+    def test_validate_many(self):
+        const.log_level = logging.CRITICAL
+        invalid_point = pickle.loads(pickle.dumps(self._populated_record))
+        invalid_point.data = {
+            '0': RecordPoint(name='test_name', unit=1, value=123.45),
+        }
+        invalid_parsed = pickle.loads(pickle.dumps(self._populated_record))
+        invalid_parsed.parsed = {
+            'Not Valid': RecordPoint(unit='watt', value=1.0),
+        }
+        records = [
+            self._populated_record, self._blank_record, invalid_point,
+            invalid_parsed,
+        ]
+        expected = []
+        for record in records:
+            try:
+                jsonschema.validate(record.to_dict(), const.record_schema)
+                expected.append(True)
+            except jsonschema.exceptions.ValidationError:
+                expected.append(False)
+        self.assertEqual(expected, [True, False, False, False])
+        self.assertEqual(Record.validate_many(records), expected)
+        self.assertEqual([record.validate() for record in records], expected)
+        self.assertEqual(Record.validate_many([]), [])
+
 
 class RecordPointTest(unittest.TestCase):
 
@@ -96,3 +175,15 @@ class RecordPointTest(unittest.TestCase):
                 'unit': 'test_unit', 'value': 123.45
             }
         )
+
+    def test_slots(self):
+        self.assertFalse(hasattr(self._blank_record_point, '__dict__'))
+        self.assertIsNone(self._blank_record_point._meta)
+        self.assertEqual(RecordPoint(extra=1)._meta, {'extra': 1})
+        # NOTE: explicitly set fields are serialized even if they are None
+        self.assertEqual(
+            RecordPoint(name=None).to_dict(),
+            {'value': None, 'unit': None, 'name': None}
+        )
+        point = pickle.loads(pickle.dumps(RecordPoint(value=1.0)))
+        self.assertEqual(point.to_dict(), {'value': 1.0, 'unit': None})
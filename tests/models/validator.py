@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import copy
+import logging
+import unittest
+
+from neat import const
+from neat.models.validator import SchemaValidator
+
+import jsonschema
+
+
+class SchemaValidatorTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._validator = SchemaValidator(const.record_schema)
+        self._valid_document = {
+            'name': 'wind.1',
+            'device_name': 'Wind Turbine',
+            'type': 'WIND',
+            'timestamp': 1487952382,
+            'data': {
+                '1': {'name': 'Power', 'unit': 'watt', 'value': 12.5},
+                '2': {'name': 'Speed', 'unit': 'meter', 'value': None},
+            },
+            'parsed': {
+                'power': {'unit': 'watt', 'value': 12.5},
+                'wind_speed': {'unit': 'meter', 'value': None},
+            },
+            'coord': {'lon': 12.3, 'lat': -12.3},
+            'ttl': 300,
+            'meta': {'location': 'roof'},
+        }
+
+    def tearDown(self):
+        del self._validator
+        del self._valid_document
+
+    def _mutations(self):
+        mutations = [
+            ('name', None), ('name', 1), ('device_name', []),
+            ('type', None), ('timestamp', '1'), ('timestamp', True),
+            ('timestamp', 1.5), ('ttl', None), ('coord', {'lon': 1.0}),
+            ('coord', {'lon': 1.0, 'lat': False}), ('coord', []),
+            ('data', {'a': {}}), ('data', {'1': {'unit': 'watt'}}),
+            ('data', {'1': {'name': 1, 'unit': 'watt', 'value': 1}}),
+            ('data', {'1': {'name': 'a', 'unit': 'watt', 'value': '1'}}),
+            ('data', {'1': []}), ('data', {'/': 1}), ('data', None),
+            ('parsed', {'Power': {'unit': 'watt', 'value': 1}}),
+            ('parsed', {'power_1': {'unit': 'watt', 'value': 1}}),
+            ('parsed', {'power': {'unit': None, 'value': 1}}),
+            ('parsed', {'power': {'value': 1}}),
+            ('parsed', {'power': {'unit': 'watt', 'value': 1, 'x': 1}}),
+            ('parsed', {}), ('meta', None), ('extra', 1), ('$meta', 1),
+            ('$meta', {}),
+        ]
+        for (key, value) in mutations:
+            document = copy.deepcopy(self._valid_document)
+            document[key] = value
+            yield document
+        for key in list(self._valid_document.keys()):
+            document = copy.deepcopy(self._valid_document)
+            del document[key]
+            yield document
+        yield []
+        yield None
+
+    def test_matches_jsonschema(self):
+        self.assertTrue(self._validator.is_valid(self._valid_document))
+        self.assertIsNone(self._validator.best_match(self._valid_document))
+        validator = jsonschema.Draft4Validator(const.record_schema)
+        for document in self._mutations():
+            self.assertEqual(
+                self._validator.is_valid(document),
+                validator.is_valid(document),
+                msg=repr(document)
+            )
+            if not validator.is_valid(document):
+                with self.assertRaises(jsonschema.ValidationError) as raised:
+                    jsonschema.validate(document, const.record_schema)
+                self.assertEqual(
+                    str(self._validator.best_match(document)),
+                    str(raised.exception)
+                )
+
+    def test_unknown_keywords(self):
+        validator = SchemaValidator({
+            '$schema': 'http://json-schema.org/draft-04/schema#',
+            'type': 'object',
+            'properties': {'count': {'type': 'integer', 'minimum': 1}},
+        })
+        self.assertTrue(validator.is_valid({'count': 1}))
+        self.assertFalse(validator.is_valid({'count': 0}))
+        self.assertFalse(validator.is_valid({'count': 1.5}))
+        self.assertTrue(validator.is_valid({}))
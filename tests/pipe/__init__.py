@@ -6,3 +6,4 @@
 
 from .rethinkdb import *
 from .mongodb import *
+from .dispatcher import *
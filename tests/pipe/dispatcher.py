@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import logging
+import tempfile
+import threading
+import unittest
+
+from neat import const
+from neat.models.record import Record
+from neat.pipe.dispatcher import PipeDispatcher
+
+from .. import fixtures
+
+
+class PipeDispatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._pipe = fixtures.ListPipe()
+        self._spill_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._pipe.gate.set()
+        self._spill_dir.cleanup()
+        del self._pipe
+
+    def _dispatcher(self, policy, maxsize=2):
+        dispatcher = PipeDispatcher(
+            self._pipe, maxsize=maxsize, policy=policy,
+            spill_dir=self._spill_dir.name
+        )
+        dispatcher.start()
+        self.addCleanup(dispatcher.close, 5.0)
+        return dispatcher
+
+    def _timestamps(self):
+        return [_.timestamp for _ in self._pipe.records]
+
+    def _stall(self, dispatcher):
+        # NOTE: the writer holds the first record until the gate opens
+        self._pipe.gate.clear()
+        dispatcher.put(Record(name='stall', timestamp=0))
+        while dispatcher.metrics['depth'] > 0:
+            time.sleep(0.001)
+
+    def test_initialization(self):
+        with self.assertRaises(ValueError):
+            PipeDispatcher(self._pipe, policy='unknown')
+        dispatcher = PipeDispatcher(self._pipe, maxsize=0)
+        self.assertEqual(dispatcher.maxsize, 1)
+        self.assertEqual(dispatcher.metrics['depth'], 0)
+
+    def test_ordered_writes(self):
+        dispatcher = self._dispatcher('block', maxsize=5)
+        for timestamp in range(20):
+            dispatcher.put(Record(timestamp=timestamp))
+        dispatcher.put(Record(name='fail', timestamp=20))
+        self.assertTrue(dispatcher.join(5.0))
+        self.assertEqual(self._timestamps(), list(range(20)))
+        self.assertEqual(dispatcher.metrics['written'], 20)
+        self.assertEqual(dispatcher.metrics['failed'], 1)
+
+    def test_block(self):
+        dispatcher = self._dispatcher('block')
+        self._stall(dispatcher)
+        for timestamp in range(1, 3):
+            dispatcher.put(Record(timestamp=timestamp))
+        blocked = threading.Thread(
+            target=dispatcher.put, args=(Record(timestamp=3),)
+        )
+        blocked.start()
+        blocked.join(0.05)
+        self.assertTrue(blocked.is_alive())
+        self.assertEqual(dispatcher.metrics['blocked'], 1)
+        self._pipe.gate.set()
+        blocked.join(5.0)
+        self.assertTrue(dispatcher.join(5.0))
+        self.assertEqual(self._timestamps(), [0, 1, 2, 3])
+
+    def test_drop_oldest(self):
+        dispatcher = self._dispatcher('drop_oldest')
+        self._stall(dispatcher)
+        for timestamp in range(1, 5):
+            dispatcher.put(Record(timestamp=timestamp))
+        self.assertEqual(dispatcher.metrics['depth'], 2)
+        self.assertEqual(dispatcher.metrics['dropped'], 2)
+        self._pipe.gate.set()
+        self.assertTrue(dispatcher.join(5.0))
+        self.assertEqual(self._timestamps(), [0, 3, 4])
+
+    def test_spill(self):
+        dispatcher = self._dispatcher('spill')
+        self._stall(dispatcher)
+        for timestamp in range(1, 6):
+            dispatcher.put(Record(timestamp=timestamp))
+        self.assertEqual(dispatcher.metrics['depth'], 2)
+        self.assertEqual(dispatcher.metrics['spilled'], 3)
+        self._pipe.gate.set()
+        self.assertTrue(dispatcher.join(5.0))
+        self.assertEqual(self._timestamps(), [0, 1, 2, 3, 4, 5])
+        self.assertEqual(dispatcher.metrics['spilled'], 0)
+        self.assertEqual(dispatcher.metrics['dropped'], 0)
+
+    def test_close(self):
+        dispatcher = self._dispatcher('block')
+        for timestamp in range(2):
+            dispatcher.put(Record(timestamp=timestamp))
+        dispatcher.close(5.0)
+        self.assertEqual(self._timestamps(), [0, 1])
+        dispatcher.put(Record(timestamp=2))
+        self.assertEqual(dispatcher.metrics['dropped'], 1)
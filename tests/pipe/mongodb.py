@@ -4,13 +4,108 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import time
+import logging
 import unittest
+from unittest.mock import MagicMock
+
+from neat import const
+from neat.pipe.mongodb import MongoDBPipe
+from neat.models.record import Record, RecordPoint
 
 
 class MongoDBPipeTest(unittest.TestCase):
 
     def setUp(self):
-        pass
+        const.log_level = logging.CRITICAL
+        self._pipe = MongoDBPipe('localhost', 27017, 'test')
+        self._pipe._table = MagicMock()
+        self._record = Record(
+            name='test_name', device_name='test_device_name', type='WIND',
+            lon=12.3, lat=-12.3, timestamp=1234567890, ttl=1,
+            data={'0': RecordPoint(name='test', unit='watt', value=1.0)}
+        )
 
     def tearDown(self):
-        pass
+        del self._pipe
+        del self._record
+
+    def test_document(self):
+        document = self._pipe.document(self._record)
+        self.assertEqual(document, self._record.to_dict())
+        document['_id'] = 'inserted'
+        self.assertNotIn('_id', self._record.payload)
+        self.assertIs(document['data'], self._record.payload['data'])
+
+    def _records(self, timestamps):
+        return [
+            Record(
+                name='test_name', device_name='test_device_name',
+                type='WIND', lon=12.3, lat=-12.3, timestamp=timestamp, ttl=1
+            )
+            for timestamp in timestamps
+        ]
+
+    def _inserted(self, pipe):
+        return [
+            [document['timestamp'] for document in call[0][0]]
+            for call in pipe.table.insert_many.call_args_list
+        ]
+
+    def test_initialization(self):
+        self.assertEqual(self._pipe.batch_size, 1)
+        self.assertIsNone(self._pipe._write_concern)
+        pipe = MongoDBPipe(
+            'localhost', 27017, 'test', batch_size=0,
+            write_concern={'w': 1, 'j': True}
+        )
+        self.assertEqual(pipe.batch_size, 1)
+        self.assertEqual(pipe._write_concern.document, {'w': 1, 'j': True})
+
+    def test_accept_many(self):
+        self._pipe.accept_many(self._records([0, 300, 600, 1200, 1000]))
+        self.assertEqual(self._inserted(self._pipe), [[0, 600, 1200, 1000]])
+        self.assertEqual(
+            self._pipe.table.insert_many.call_args[1], {'ordered': False}
+        )
+        self._pipe.accept_many(self._records([1300]))
+        self.assertEqual(len(self._inserted(self._pipe)), 1)
+        self._pipe.accept(self._records([1800])[0])
+        self.assertEqual(self._inserted(self._pipe)[-1], [1800])
+
+    def test_buffer(self):
+        pipe = MongoDBPipe(
+            'localhost', 27017, 'test', entry_delay=0, batch_size=3,
+            flush_delay=None
+        )
+        pipe._table = MagicMock()
+        for record in self._records(range(4)):
+            pipe.accept(record)
+        self.assertEqual(self._inserted(pipe), [[0, 1, 2]])
+        self.assertEqual(pipe.buffered, 1)
+        self.assertEqual(pipe.flush(), 1)
+        self.assertEqual(pipe.flush(), 0)
+        self.assertEqual(self._inserted(pipe), [[0, 1, 2], [3]])
+
+    def test_flush_delay(self):
+        pipe = MongoDBPipe(
+            'localhost', 27017, 'test', entry_delay=0, batch_size=10,
+            flush_delay=0.01
+        )
+        pipe._table = MagicMock()
+        pipe.accept(self._records([0])[0])
+        deadline = (time.monotonic() + 5.0)
+        while pipe.buffered > 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(self._inserted(pipe), [[0]])
+        self.assertEqual(pipe.buffer_metrics['flushes'], 1)
+
+        pipe._table.insert_many.side_effect = ValueError('failed to write')
+        pipe.accept(self._records([1])[0])
+        deadline = (time.monotonic() + 5.0)
+        while pipe.buffer_metrics['failed'] <= 0 and \
+                time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(pipe.buffer_metrics, {
+            'buffered': 0, 'flushes': 1, 'failed_flushes': 1, 'failed': 1,
+        })
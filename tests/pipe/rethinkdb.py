@@ -4,13 +4,178 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import logging
+import threading
 import unittest
+from unittest.mock import MagicMock, patch
+
+from neat import const
+from neat.models.record import Record
+from neat.pipe.rethinkdb import RethinkDBPipe
+
+import rethinkdb
 
 
 class RethinkDBPipeTest(unittest.TestCase):
 
     def setUp(self):
-        pass
+        const.log_level = logging.CRITICAL
+        patcher = patch('neat.pipe.rethinkdb.rethinkdb')
+        self._driver = patcher.start()
+        self.addCleanup(patcher.stop)
+        self._driver.errors = rethinkdb.errors
+        self._driver.connect.side_effect = (lambda *args, **kwargs: MagicMock(
+            **{'is_open.return_value': True}
+        ))
+        self._driver.db_list.return_value.run.return_value = []
+        self._driver.table_list.return_value.run.return_value = []
+        self._table = self._driver.table.return_value
+        self._table.index_list.return_value.run.return_value = []
+        self._table.insert.return_value.run.return_value = {'errors': 0}
+        # NOTE: keeps the cleaning thread from touching the driver
+        patcher = patch.object(RethinkDBPipe, '_cleaning_scheduler')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self._pipe = RethinkDBPipe('localhost', 28015, 'test')
 
     def tearDown(self):
-        pass
+        del self._pipe
+
+    def test_setup(self):
+        self._driver.db_create.assert_called_once_with(const.module_name)
+        self._driver.table_create.assert_called_once_with('test')
+        self.assertEqual(self._table.index_create.call_args[0][0], 'expires')
+        self._table.index_wait.assert_called_once_with('expires')
+        self.assertEqual(self._pipe.metrics['opened'], 1)
+
+    def test_connection_reuse(self):
+        connection = self._pipe.connection
+        for _ in range(3):
+            self.assertIs(self._pipe.connection, connection)
+        self._pipe.validate()
+        self.assertEqual(self._driver.connect.call_count, 1)
+
+        connections = []
+        thread = threading.Thread(
+            target=(lambda: connections.append(self._pipe.connection))
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], connection)
+        self.assertEqual(self._pipe.metrics['connections'], 2)
+        self.assertEqual(self._pipe.metrics['opened'], 2)
+
+    @patch('neat.pipe.rethinkdb.os.getpid')
+    def test_fork(self, getpid):
+        getpid.return_value = self._pipe._pid
+        connection = self._pipe.connection
+        getpid.return_value += 1
+        forked = self._pipe.connection
+        self.assertIsNot(forked, connection)
+        self.assertIs(self._pipe.connection, forked)
+        connection.close.assert_not_called()
+        self.assertEqual(self._pipe.metrics['connections'], 1)
+        self.assertEqual(self._pipe.metrics['opened'], 2)
+        getpid.return_value += 1
+        self._pipe.close()
+        forked.close.assert_not_called()
+
+    def test_reconnect(self):
+        connection = self._pipe.connection
+        connection.is_open.return_value = False
+        self.assertIs(self._pipe.connection, connection)
+        connection.reconnect.assert_called_once_with(noreply_wait=False)
+        self.assertEqual(self._pipe.metrics['reconnects'], 1)
+
+        connection.reconnect.side_effect = rethinkdb.errors.ReqlDriverError(
+            'connection refused'
+        )
+        with self.assertRaises(rethinkdb.errors.ReqlDriverError):
+            self._pipe.connection
+        self.assertEqual(self._pipe.metrics['failures'], 1)
+        self.assertEqual(self._pipe.metrics['connections'], 0)
+        self.assertIsNot(self._pipe.connection, connection)
+        self.assertEqual(self._pipe.metrics['opened'], 2)
+
+        self._driver.connect.side_effect = rethinkdb.errors.ReqlDriverError(
+            'connection refused'
+        )
+        self._pipe.close()
+        self.assertFalse(self._pipe.validate())
+        self.assertEqual(self._pipe.metrics['failures'], 2)
+
+    def test_validate(self):
+        connection = self._pipe.connection
+        self.assertTrue(self._pipe.validate())
+        connection.server.assert_called_once_with()
+        connection.server.side_effect = rethinkdb.errors.ReqlDriverError(
+            'connection reset'
+        )
+        self.assertTrue(self._pipe.validate())
+        self.assertEqual(self._pipe.metrics['reconnects'], 1)
+        connection.reconnect.side_effect = rethinkdb.errors.ReqlDriverError(
+            'connection refused'
+        )
+        self.assertFalse(self._pipe.validate())
+        self.assertEqual(self._pipe.metrics['health_checks'], 3)
+
+    def test_health_check(self):
+        connection = self._pipe.connection
+        self._pipe._health_delay = 0.0
+        connection.server.side_effect = rethinkdb.errors.ReqlDriverError(
+            'connection reset'
+        )
+        self.assertIs(self._pipe.connection, connection)
+        self.assertEqual(self._pipe.metrics['health_checks'], 1)
+        self.assertEqual(self._pipe.metrics['reconnects'], 1)
+
+    def test_close(self):
+        connection = self._pipe.connection
+        self._pipe.close()
+        connection.close.assert_called_once_with(noreply_wait=False)
+        self.assertEqual(self._pipe.metrics['connections'], 0)
+        self.assertIsNot(self._pipe.connection, connection)
+
+    def test_document(self):
+        record = Record(name='test_name', timestamp=1234567890, ttl=60)
+        document = self._pipe.document(record)
+        self.assertEqual(document['expires'], 1234567950)
+        self.assertNotIn('expires', record.payload)
+        self._pipe.accept(record)
+        self._table.insert.assert_called_once_with([document])
+
+    def test_clean(self):
+        self._pipe._clean_chunk = 2
+        delete = self._table.between.return_value.limit.return_value.delete
+        delete.return_value.run.side_effect = [
+            {'deleted': 2}, {'deleted': 2}, {'deleted': 1},
+        ]
+        self.assertEqual(self._pipe.clean(), 5)
+        self.assertEqual(self._table.between.call_count, 3)
+        (args, kwargs) = self._table.between.call_args
+        self.assertEqual(
+            kwargs, {'index': 'expires', 'right_bound': 'closed'}
+        )
+        self._table.between.return_value.limit.assert_called_with(2)
+        metrics = self._pipe.metrics
+        self.assertEqual((metrics['sweeps'], metrics['swept']), (1, 5))
+        self.assertEqual(metrics['last_sweep']['chunks'], 3)
+        self.assertGreaterEqual(metrics['last_sweep']['seconds'], 0.0)
+
+    def test_batched_insert(self):
+        with self.assertRaises(ValueError):
+            RethinkDBPipe('localhost', 28015, 'test', durability='unknown')
+        pipe = RethinkDBPipe(
+            'localhost', 28015, 'test', batch_size=3, flush_delay=None,
+            durability='soft'
+        )
+        for timestamp in range(4):
+            pipe.accept(Record(name='test_name', timestamp=timestamp, ttl=1))
+        self.assertEqual(self._table.insert.call_count, 1)
+        (args, kwargs) = self._table.insert.call_args
+        self.assertEqual([_['expires'] for _ in args[0]], [1, 2, 3])
+        self.assertEqual(kwargs, {'durability': 'soft'})
+        self.assertEqual(pipe.flush(), 1)
+        self.assertEqual(self._table.insert.call_count, 2)
+        pipe.accept_many([])
+        self.assertEqual(self._table.insert.call_count, 2)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import logging
+import unittest
+import multiprocessing
+from unittest.mock import patch
+
+from neat import const
+from neat.requester.breaker import BreakerState, CircuitBreaker
+from neat.requester.obvius import ObviusRequester, ObviusLogRequester
+
+import requests
+import requests_mock
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._breaker = CircuitBreaker(
+            'test', threshold=2, delay=10, max_delay=30, jitter=0
+        )
+
+    def tearDown(self):
+        del self._breaker
+
+    @patch('neat.requester.breaker.time.monotonic')
+    def test_transitions(self, monotonic):
+        monotonic.return_value = 100.0
+        self.assertEqual(self._breaker.state, BreakerState.CLOSED)
+        self._breaker.failure()
+        self.assertTrue(self._breaker.allow())
+        self._breaker.failure()
+        self.assertEqual(self._breaker.state, BreakerState.OPEN)
+        self.assertFalse(self._breaker.allow())
+        self.assertEqual(self._breaker.to_dict()['retry_in'], 10)
+
+        monotonic.return_value = 110.0
+        self.assertTrue(self._breaker.allow())
+        self.assertEqual(self._breaker.state, BreakerState.HALF_OPEN)
+        self.assertFalse(self._breaker.allow())
+        self._breaker.failure()
+        self.assertEqual(self._breaker.state, BreakerState.OPEN)
+        self.assertEqual(self._breaker.to_dict()['retry_in'], 20)
+
+        monotonic.return_value = 200.0
+        self.assertTrue(self._breaker.allow())
+        self._breaker.success()
+        self.assertEqual(self._breaker.state, BreakerState.CLOSED)
+        metrics = self._breaker.to_dict()
+        self.assertEqual(metrics['rejected'], 2)
+        self.assertEqual(metrics['failures'], 0)
+        self.assertEqual(
+            [_[1:] for _ in metrics['transitions']],
+            [
+                ('closed', 'open'), ('open', 'half_open'),
+                ('half_open', 'open'), ('open', 'half_open'),
+                ('half_open', 'closed'),
+            ]
+        )
+
+    @patch('neat.requester.breaker.time.monotonic')
+    def test_backoff(self, monotonic):
+        monotonic.return_value = 0.0
+        breaker = CircuitBreaker('test', threshold=1, delay=10, max_delay=30)
+        for expected in (10, 20, 30, 30):
+            breaker.failure()
+            retry_in = breaker.to_dict()['retry_in']
+            self.assertGreaterEqual(retry_in, expected * 0.9)
+            self.assertLessEqual(retry_in, expected * 1.1)
+            monotonic.return_value += 100.0
+            self.assertTrue(breaker.allow())
+
+    @patch('neat.requester.breaker.time.monotonic')
+    def test_release(self, monotonic):
+        monotonic.return_value = 0.0
+        self._breaker.failure()
+        self._breaker.release()
+        self._breaker.failure()
+        self.assertEqual(self._breaker.state, BreakerState.OPEN)
+        monotonic.return_value = 100.0
+        self.assertTrue(self._breaker.allow())
+        self.assertFalse(self._breaker.allow())
+        self._breaker.release()
+        self.assertEqual(self._breaker.state, BreakerState.HALF_OPEN)
+        self.assertTrue(self._breaker.allow())
+
+    def test_forked(self):
+        process = multiprocessing.Process(target=self._breaker.failure)
+        process.start()
+        process.join(5.0)
+        self.assertEqual(self._breaker.to_dict()['failures'], 1)
+        self._breaker.failure()
+        process = multiprocessing.Process(target=self._breaker.allow)
+        process.start()
+        process.join(5.0)
+        self.assertEqual(self._breaker.state, BreakerState.OPEN)
+        self.assertEqual(self._breaker.to_dict()['rejected'], 1)
+
+    def test_signal(self):
+        transitions = []
+
+        def receiver(breaker, previous, state):
+            transitions.append((breaker, previous, state))
+
+        CircuitBreaker.signal.connect(receiver)
+        try:
+            self._breaker.failure()
+            self._breaker.failure()
+        finally:
+            CircuitBreaker.signal.disconnect(receiver)
+        self.assertEqual(
+            transitions,
+            [(self._breaker, BreakerState.CLOSED, BreakerState.OPEN)]
+        )
+
+    def test_requester(self):
+        req = ObviusRequester(
+            1, '127.0.0.9', 'user', 'pass', breaker_threshold=2
+        )
+        self.assertIs(req.breaker, ObviusRequester(
+            2, '127.0.0.9', 'user', 'pass'
+        ).breaker)
+        with requests_mock.mock() as mock:
+            mock.get(req.url, exc=requests.exceptions.ConnectionError)
+            req.request()
+            req.request()
+            self.assertEqual(req.breaker.state, BreakerState.OPEN)
+            req.request()
+            self.assertEqual(mock.call_count, 2)
+        self.assertEqual(req.metrics['breaker']['rejected'], 1)
+
+        # NOTE: any failed probe opens the breaker again
+        req.breaker._retry_at = 0.0
+        with requests_mock.mock() as mock:
+            mock.get(req.url, exc=requests.exceptions.ChunkedEncodingError)
+            req.request()
+            self.assertEqual(req.breaker.state, BreakerState.OPEN)
+        req.breaker._retry_at = 0.0
+        with requests_mock.mock() as mock:
+            mock.get(req.url, exc=ValueError)
+            with self.assertRaises(ValueError):
+                req.request()
+            self.assertEqual(req.breaker.state, BreakerState.HALF_OPEN)
+            self.assertTrue(req.breaker.allow())
+        del ObviusRequester.host_breakers[req.host]
+
+    def test_log_requester(self):
+        req = ObviusLogRequester(
+            1, '127.0.0.10', 'user', 'pass', breaker_threshold=1
+        )
+        self.addCleanup(ObviusRequester.host_breakers.pop, req.host, None)
+        with requests_mock.mock() as mock:
+            mock.get(req.url, exc=requests.exceptions.ConnectionError)
+            self.assertEqual(list(req.fetch('1')), [])
+            self.assertEqual(req.breaker.state, BreakerState.OPEN)
+        # NOTE: an unexpected error of the probe allows another probe
+        req.breaker._retry_at = 0.0
+        with requests_mock.mock() as mock:
+            mock.get(req.url, exc=ValueError)
+            with self.assertRaises(ValueError):
+                list(req.fetch('1'))
+            self.assertEqual(req.breaker.state, BreakerState.HALF_OPEN)
+            self.assertTrue(req.breaker.allow())
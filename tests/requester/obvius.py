@@ -4,14 +4,19 @@
 # Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
+import asyncio
 import logging
 import unittest
 from unittest.mock import MagicMock
 
 from neat import const
-from neat.requester.obvius import ObviusRequester
+from neat.requester.obvius import (
+    ObviusRequester, ObviusHostRequester, AsyncObviusRequester,
+    ObviusLogRequester, ObviusHostLogRequester
+)
 
 import blinker
+import requests
 import requests_mock
 
 
@@ -71,3 +76,237 @@ class ObviusRequesterTest(unittest.TestCase):
                 self._req,
                 data='data', meta={'test': 'meta'}
             )
+            self.assertIsNone(self._req.request())
+        self.assertIs(self._req.session, ObviusRequester(
+            2, '127.0.0.1', 'user', 'pass'
+        ).session)
+
+    def test_timeout(self):
+        self.assertEqual(self._req.effective_timeout(), 10)
+        self.assertEqual(self._req.effective_timeout(4.0), 4.0)
+        self.assertEqual(self._req.effective_timeout(40.0), 10)
+        with requests_mock.mock() as mock:
+            mock.get(self._req_url, exc=requests.exceptions.ReadTimeout)
+            timeouts = self._req.latency.to_dict()['timeouts']
+            self.assertIsNone(self._req.request(timeout=2.0))
+            self.assertEqual(
+                self._req.latency.to_dict()['timeouts'], (timeouts + 1)
+            )
+            self.assertEqual(mock.last_request.timeout, 2.0)
+
+    def test_metrics(self):
+        self.assertEqual(self._req.host, ('127.0.0.1', 80))
+        self.assertIs(self._req.latency, ObviusRequester(
+            2, '127.0.0.1', 'user', 'pass'
+        ).latency)
+        metrics = self._req.metrics
+        self.assertIn('latency', metrics)
+        self.assertIn('pool', metrics)
+        with requests_mock.mock() as mock:
+            mock.get(self._req_url, text='data')
+            count = self._req.latency.to_dict()['count']
+            self._req.request()
+            self.assertEqual(
+                self._req.latency.to_dict()['count'], (count + 1)
+            )
+
+
+class ObviusHostRequesterTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._req = ObviusHostRequester(
+            [
+                {'device_id': 4, 'name': 'wind.1'},
+                {'device_id': 5, 'name': 'solar_therm.1'},
+                {'device_id': 6, 'name': 'missing.1'},
+            ],
+            '127.0.0.1', 'user', 'pass'
+        )
+        self._req_url = (
+            'http://{req._obvius_ip}:{req._obvius_port}'
+            '{req._request_endpoint}?TYPE=DATA'
+        ).format(req=self._req)
+        self._data = '''<?xml version="1.0" encoding="UTF-8" ?>
+        <DAS>
+            <name>001EC600070F</name>
+            <devices>
+                <device><name>Wind</name><address>4</address></device>
+                <device><name>Solar</name><address>5</address></device>
+                <device><name>Other</name><address>7</address></device>
+            </devices>
+        </DAS>'''
+
+    def tearDown(self):
+        del self._req
+
+    def test_initialization(self):
+        self.assertEqual(self._req.params, {'TYPE': 'DATA'})
+        self.assertEqual(self._req._device_id, ['4', '5', '6'])
+        self.assertEqual(self._req._devices['4'], {'name': 'wind.1'})
+
+    def test_split(self):
+        payloads = list(self._req.split(self._data))
+        self.assertEqual(len(payloads), 2)
+        (data, meta) = payloads[0]
+        self.assertEqual(meta, {'name': 'wind.1'})
+        self.assertIn('<name>001EC600070F</name>', data)
+        self.assertIn('<address>4</address>', data)
+        self.assertNotIn('<address>5</address>', data)
+        self.assertEqual(payloads[1][1], {'name': 'solar_therm.1'})
+        self.assertEqual(list(self._req.split('<DAS>')), [])
+
+    def test_split_declared_encoding(self):
+        data = self._data.replace(
+            'encoding="UTF-8"', 'encoding="ISO-8859-1"'
+        ).replace('<name>Wind</name>', '<name>Wind \u00b0</name>')
+        (payload, _) = next(self._req.split(data))
+        self.assertIn('<name>Wind \u00b0</name>', payload)
+
+    def test_request_receive(self):
+        with requests_mock.mock() as mock:
+            mock.get(self._req_url, text=self._data)
+
+            self._req.signal.send = MagicMock()
+            self.assertIsNone(self._req.request())
+            self.assertEqual(self._req.signal.send.call_count, 2)
+
+
+class ObviusLogRequesterTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._req = ObviusLogRequester(
+            1, '127.0.0.2', 'user', 'pass',
+            test='meta'
+        )
+        self._req_url = (
+            'http://{req._obvius_ip}:{req._obvius_port}'
+            '{req._request_endpoint}?ADDRESS=1&TYPE=LOGFILE'
+        ).format(req=self._req)
+        self._data = "'time(UTC)','error'\n\n'2017-02-24 16:00:00',0\n"
+
+    def tearDown(self):
+        del self._req
+
+    def test_initialization(self):
+        self.assertEqual(self._req._timeout, 60)
+        self.assertEqual(self._req.devices, [('1', {'test': 'meta'})])
+        req = ObviusLogRequester(
+            1, '127.0.0.2', 'user', 'pass', log_endpoint='/log.cgi'
+        )
+        self.assertTrue(req.url.endswith('/log.cgi'))
+        self.assertEqual(
+            ObviusLogRequester._request_endpoint, '/setup/devicelogfile.cgi'
+        )
+
+    def test_fetch(self):
+        with requests_mock.mock() as mock:
+            mock.get(self._req_url, text=self._data)
+            self.assertEqual(
+                list(self._req.fetch('1')),
+                ["'time(UTC)','error'", "'2017-02-24 16:00:00',0"]
+            )
+            self.assertEqual(mock.last_request.timeout, 60)
+
+            mock.get(self._req_url, status_code=404)
+            self.assertEqual(list(self._req.fetch('1')), [])
+            mock.get(self._req_url, exc=requests.exceptions.ReadTimeout)
+            self.assertEqual(list(self._req.fetch('1', timeout=5.0)), [])
+            self.assertEqual(mock.last_request.timeout, 5.0)
+
+    def test_request(self):
+        with requests_mock.mock() as mock:
+            mock.get(self._req_url, text=self._data)
+            self._req.signal.send = MagicMock()
+            self.assertIsNone(self._req.request())
+            self._req.signal.send.assert_called_with(
+                self._req,
+                data="'time(UTC)','error'\n'2017-02-24 16:00:00',0",
+                meta={'test': 'meta'}
+            )
+            del self._req.signal.send
+
+    def test_host(self):
+        req = ObviusHostLogRequester(
+            [
+                {'device_id': 5, 'name': 'solar_therm.1'},
+                {'device_id': 4, 'name': 'wind.1'},
+            ],
+            '127.0.0.2', 'user', 'pass'
+        )
+        self.assertEqual(req.devices, [
+            ('4', {'name': 'wind.1'}), ('5', {'name': 'solar_therm.1'}),
+        ])
+        self.assertEqual(
+            req.log_params('4'), {'ADDRESS': '4', 'TYPE': 'LOGFILE'}
+        )
+
+
+class _MockResponse(object):
+
+    def __init__(self, status, text):
+        (self.status, self._text, self.url) = (status, text, 'mock://')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def text(self):
+        return self._text
+
+
+class _MockSession(object):
+
+    closed = False
+
+    def __init__(self, status=200, text='data'):
+        (self.status, self.text, self.calls) = (status, text, [])
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return _MockResponse(self.status, self.text)
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncObviusRequesterTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._req = AsyncObviusRequester(
+            1, '127.0.0.1', 'user', 'pass',
+            host_concurrency=2, test='meta'
+        )
+        self._loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self._loop.run_until_complete(AsyncObviusRequester.close())
+        self._loop.close()
+        del self._req
+
+    def test_initialization(self):
+        self.assertIsInstance(self._req, ObviusRequester)
+        self.assertEqual(self._req._host_concurrency, 2)
+        self.assertEqual(self._req._meta, {'test': 'meta'})
+        self.assertEqual(self._req.host, ('127.0.0.1', 80))
+
+    def test_request(self):
+        session = _MockSession()
+        AsyncObviusRequester._sessions[self._req.host] = session
+        self.assertEqual(
+            self._loop.run_until_complete(self._req.request()),
+            ('data', {'test': 'meta'})
+        )
+        (url, kwargs) = session.calls[-1]
+        self.assertEqual(url, self._req.url)
+        self.assertEqual(kwargs['params'], {'ADDRESS': 1, 'TYPE': 'DATA'})
+
+        session.status = 500
+        self.assertIsNone(self._loop.run_until_complete(self._req.request()))
+        self._loop.run_until_complete(AsyncObviusRequester.close())
+        self.assertTrue(session.closed)
+        self.assertEqual(AsyncObviusRequester._sessions, {})
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import logging
+import unittest
+import multiprocessing
+
+from neat import const
+from neat.requester.pool import SessionPool
+from neat.requester._common import LatencyStats
+
+import requests
+
+
+class SessionPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._pool = SessionPool(pool_size=2, idle_timeout=60)
+        self._key = ('127.0.0.1', 80, 'user', 'pass')
+
+    def tearDown(self):
+        self._pool.clear()
+        del self._pool
+
+    def test_session(self):
+        session = self._pool.session(self._key)
+        self.assertIsInstance(session, requests.Session)
+        self.assertIs(session, self._pool.session(self._key))
+        self.assertIsNot(
+            session, self._pool.session(('127.0.0.1', 81, 'user', 'pass'))
+        )
+        self.assertEqual(
+            session.get_adapter('http://127.0.0.1')._pool_maxsize, 2
+        )
+
+    def test_evict(self):
+        session = self._pool.session(self._key, idle_timeout=0.01)
+        time.sleep(0.02)
+        self._pool.evict()
+        self.assertEqual(self._pool.metrics['evicted'], 1)
+        self.assertIsNot(session, self._pool.session(self._key))
+
+    def test_metrics(self):
+        for _ in range(3):
+            self._pool.session(self._key)
+        metrics = self._pool.metrics
+        self.assertEqual(metrics['evicted'], 0)
+        self.assertEqual(
+            metrics['sessions']['user@127.0.0.1:80']['requests'], 3
+        )
+        self.assertEqual(
+            metrics['sessions']['user@127.0.0.1:80']['connections'], 0
+        )
+
+
+class LatencyStatsTest(unittest.TestCase):
+
+    def test_record(self):
+        stats = LatencyStats(window=4)
+        self.assertEqual(stats.to_dict()['p95'], 0.0)
+        for seconds in (0.1, 0.2, 0.3, 0.4, 0.5):
+            stats.record(seconds)
+        stats.record(10.0, timeout=True)
+        result = stats.to_dict()
+        self.assertEqual(result['count'], 6)
+        self.assertEqual(result['timeouts'], 1)
+        self.assertEqual(result['max'], 10.0)
+        self.assertEqual(result['p50'], 0.5)
+        self.assertEqual(result['p95'], 10.0)
+
+    def test_mark(self):
+        stats = LatencyStats(window=4)
+        stats.record(0.1)
+        stats.record(0.3)
+        baseline = stats.mark()
+        self.assertEqual(baseline['count'], 2)
+        self.assertAlmostEqual(baseline['mean'], 0.2)
+        process = multiprocessing.Process(target=stats.record, args=(0.5,))
+        process.start()
+        process.join(5.0)
+        result = stats.to_dict()
+        self.assertEqual((result['count'], result['max']), (3, 0.5))
+        self.assertEqual(result['baseline'], baseline)
@@ -5,3 +5,7 @@
 # GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
 
 from .simple import *
+from .shared import *
+from .asynchronous import *
+from .monotonic import *
+from .adaptive import *
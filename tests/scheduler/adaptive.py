@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import logging
+import unittest
+from unittest.mock import patch
+
+from neat import const
+from neat.models.record import Record, RecordPoint
+from neat.scheduler.monotonic import MonotonicDelayScheduler
+from neat.scheduler.adaptive import AdaptiveDelayScheduler
+
+
+class AdaptiveDelaySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._obj = AdaptiveDelayScheduler(
+            10, min_delay=5, max_delay=60, margin=1
+        )
+
+    def tearDown(self):
+        del self._obj
+
+    def _record(self, value, age=None):
+        return Record(
+            name='test_name', age=age,
+            data={0: RecordPoint(name='test', unit='', value=value)}
+        )
+
+    def test_initialization(self):
+        self.assertIsInstance(self._obj, MonotonicDelayScheduler)
+        self.assertEqual(self._obj.delay, 10)
+        self.assertEqual(self._obj.min_delay, 5)
+        self.assertEqual(self._obj.max_delay, 60)
+        default = AdaptiveDelayScheduler(10)
+        self.assertEqual((default.min_delay, default.max_delay), (10, 60))
+        with self.assertRaises(ValueError):
+            AdaptiveDelayScheduler(10, min_delay=20, max_delay=15)
+
+    @patch('neat.scheduler.adaptive.time.monotonic')
+    def test_backoff(self, monotonic):
+        monotonic.return_value = 100.0
+        self._obj.observe(self._record(1.0))
+        self.assertEqual(self._obj.delay, 10)
+        self._obj.observe(self._record(1.0))
+        self.assertEqual(self._obj.delay, 20)
+        self._obj.observe(self._record(1.0))
+        self.assertEqual(self._obj.delay, 40)
+        self._obj.observe(self._record(1.0))
+        self.assertEqual(self._obj.delay, 60)
+        self._obj.observe(self._record(2.0))
+        self.assertEqual(self._obj.delay, 10)
+
+    @patch('neat.scheduler.adaptive.time.monotonic')
+    def test_cadence(self, monotonic):
+        monotonic.return_value = 100.0
+        self._obj.observe(self._record(1.0, age=3))
+        self.assertEqual(self._obj.delay, 10)
+        monotonic.return_value = 110.0
+        self._obj.observe(self._record(2.0, age=0))
+        # device refreshed at 97 and 110, next refresh expected at 123
+        self.assertAlmostEqual(self._obj.delay, 14.0)
+        self.assertAlmostEqual(self._obj.metrics['cadence'], 13.0)
+
+    @patch('neat.scheduler.adaptive.time.monotonic')
+    def test_metrics(self, monotonic):
+        monotonic.return_value = 100.0
+        self.assertEqual(self._obj.metrics['saved'], 0)
+        self._obj.observe(self._record(1.0))
+        monotonic.return_value = 200.0
+        metrics = self._obj.metrics
+        self.assertEqual(metrics['delay'], 10)
+        self.assertEqual(metrics['saved'], 11)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import asyncio
+import logging
+import unittest
+
+from neat import const
+from neat.scheduler._common import AbstractAsyncScheduler
+from neat.scheduler.asynchronous import AsyncDelayScheduler
+
+
+class AsyncDelaySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._default_obj = AsyncDelayScheduler()
+        self._loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self._loop.close()
+        del self._default_obj
+
+    def test_initialization(self):
+        self.assertIsInstance(self._default_obj, AbstractAsyncScheduler)
+        self.assertEqual(self._default_obj.delay, 1)
+        self.assertIsInstance(self._default_obj.delay, float)
+        self.assertEqual(self._default_obj.pending, 0)
+        self.assertEqual(self._default_obj.budget, 0.8)
+        self.assertEqual(self._default_obj.metrics['shed'], 0)
+
+    def test_run(self):
+        scheduler = AsyncDelayScheduler(0.05)
+        calls = []
+
+        async def callback(ret_scheduler):
+            calls.append(ret_scheduler)
+
+        async def run_for(seconds):
+            task = asyncio.ensure_future(scheduler.run(callback))
+            await asyncio.sleep(seconds)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        self._loop.run_until_complete(run_for(0.22))
+        self.assertGreaterEqual(len(calls), 3)
+        for ret_scheduler in calls:
+            self.assertIs(ret_scheduler, scheduler)
+
+    def test_shed(self):
+        scheduler = AsyncDelayScheduler(0.05)
+        calls = []
+
+        async def callback(ret_scheduler):
+            calls.append(ret_scheduler)
+            await asyncio.sleep(1)
+
+        async def run_for(seconds):
+            task = asyncio.ensure_future(scheduler.run(callback))
+            await asyncio.sleep(seconds)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            for pending in list(scheduler._pending):
+                pending.cancel()
+            await asyncio.sleep(0)
+
+        self._loop.run_until_complete(run_for(0.22))
+        self.assertEqual(len(calls), 1)
+        self.assertGreaterEqual(scheduler.metrics['shed'], 3)
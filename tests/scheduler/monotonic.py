@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import logging
+import unittest
+import multiprocessing
+
+from neat import const
+from neat.scheduler._common import TickMetrics, next_deadline, spread_phases
+from neat.scheduler.monotonic import MonotonicDelayScheduler
+
+
+class next_deadlineTest(unittest.TestCase):
+
+    def test_next_deadline(self):
+        self.assertEqual(next_deadline(10.0, 1.0, 10.5), (11.0, 0))
+        self.assertEqual(next_deadline(10.0, 1.0, 13.5), (14.0, 3))
+        self.assertEqual(
+            next_deadline(10.0, 1.0, 13.5, missed='coalesce'), (13.0, 2)
+        )
+        self.assertEqual(
+            next_deadline(10.0, 1.0, 11.5, missed='coalesce'), (11.0, 0)
+        )
+
+
+class spread_phasesTest(unittest.TestCase):
+
+    def test_spread_phases(self):
+        schedulers = [MonotonicDelayScheduler(10) for _ in range(4)]
+        self.assertEqual([_.phase for _ in schedulers], [0.0] * 4)
+        spread_phases(schedulers)
+        self.assertEqual([_.phase for _ in schedulers], [0.0, 2.5, 5.0, 7.5])
+        for _ in range(10):
+            spread_phases(schedulers, jitter=1.0)
+            for (index, scheduler) in enumerate(schedulers):
+                self.assertGreaterEqual(scheduler.phase, 0.0)
+                self.assertLessEqual(
+                    abs(scheduler.phase - (index * 2.5)), 1.25
+                )
+
+
+class TickMetricsTest(unittest.TestCase):
+
+    def test_record(self):
+        metrics = TickMetrics()
+        self.assertEqual(metrics.to_dict()['ticks'], 0)
+        self.assertEqual(metrics.to_dict()['lateness_mean'], 0.0)
+        metrics.record(0.5)
+        metrics.record(1.5, skipped=2, overrun=True)
+        metrics.record(-1.0)
+        result = metrics.to_dict()
+        self.assertEqual(result['ticks'], 3)
+        self.assertEqual(result['overruns'], 1)
+        self.assertEqual(result['skipped'], 2)
+        self.assertEqual(result['lateness'], 0.0)
+        self.assertEqual(result['lateness_max'], 1.5)
+        self.assertEqual(result['shed'], 0)
+        metrics.shed()
+        self.assertEqual(metrics.to_dict()['shed'], 1)
+        self.assertEqual(metrics.to_dict()['ticks'], 3)
+        self.assertAlmostEqual(result['lateness_mean'], (2.0 / 3))
+
+
+class MonotonicDelaySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._default_obj = MonotonicDelayScheduler()
+        self._obj = MonotonicDelayScheduler(0.05)
+
+    def tearDown(self):
+        del self._default_obj
+        del self._obj
+
+    def test_initialization(self):
+        self.assertEqual(self._default_obj.delay, 1)
+        self.assertIsInstance(self._default_obj.delay, float)
+        self.assertEqual(self._default_obj.missed, 'skip')
+        self.assertIsInstance(self._default_obj, multiprocessing.Process)
+        self.assertEqual(self._default_obj.metrics['ticks'], 0)
+        with self.assertRaises(ValueError):
+            MonotonicDelayScheduler(missed='unknown')
+
+    def test_tick(self):
+        def slow_receiver(scheduler):
+            time.sleep(0.12)
+
+        deadline = time.monotonic()
+        self.assertEqual(self._obj.tick(deadline), deadline + 0.05)
+        MonotonicDelayScheduler.signal.connect(slow_receiver)
+        try:
+            self.assertAlmostEqual(
+                self._obj.tick(deadline), (deadline + 0.15), places=5
+            )
+        finally:
+            MonotonicDelayScheduler.signal.disconnect(slow_receiver)
+        metrics = self._obj.metrics
+        self.assertEqual(metrics['ticks'], 2)
+        self.assertEqual(metrics['overruns'], 1)
+        self.assertEqual(metrics['skipped'], 2)
+
+    def test_run(self):
+        self.assertIsNone(self._obj.run())
+        self.assertEqual(True, self._obj.daemon)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import logging
+import threading
+import unittest
+import multiprocessing
+
+from neat import const
+from neat.scheduler.shared import SharedDelayScheduler
+
+
+class SharedDelaySchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._default_obj = SharedDelayScheduler()
+        self._various_objs = [
+            SharedDelayScheduler(0.05, pool='test'),
+            SharedDelayScheduler(0.05, pool='test'),
+            SharedDelayScheduler(0.05, pool='test')
+        ]
+
+    def tearDown(self):
+        for scheduler in self._various_objs:
+            scheduler.terminate()
+        del self._default_obj
+        del self._various_objs
+
+    def test_initialization(self):
+        self.assertEqual(self._default_obj.delay, 1)
+        self.assertIsInstance(self._default_obj.delay, float)
+        self.assertEqual(self._default_obj.pool, 'default')
+        self.assertEqual(self._default_obj.budget, 0.8)
+        self.assertEqual(self._default_obj.max_backlog, 16)
+        self.assertIsNone(SharedDelayScheduler(budget_ratio=None).budget)
+        self.assertFalse(self._default_obj.is_alive())
+        self.assertIsNone(self._default_obj.pid)
+        for scheduler in self._various_objs:
+            self.assertIsInstance(scheduler, multiprocessing.Process)
+            self.assertIs(scheduler.loop, self._various_objs[0].loop)
+
+    def test_start_terminate(self):
+        signals_received = []
+
+        def signal_receiver(scheduler):
+            signals_received.append(scheduler)
+
+        SharedDelayScheduler.signal.connect(signal_receiver)
+        try:
+            for scheduler in self._various_objs:
+                scheduler.start()
+                self.assertTrue(scheduler.is_alive())
+                self.assertIsNotNone(scheduler.pid)
+            time.sleep(0.2)
+            for scheduler in self._various_objs:
+                self.assertIn(scheduler, signals_received)
+                scheduler.terminate()
+                self.assertFalse(scheduler.is_alive())
+                scheduler.join(timeout=1)
+            fired = len(signals_received)
+            time.sleep(0.1)
+            self.assertEqual(fired, len(signals_received))
+            for scheduler in self._various_objs:
+                self.assertGreaterEqual(scheduler.metrics['ticks'], 1)
+        finally:
+            SharedDelayScheduler.signal.disconnect(signal_receiver)
+
+    def test_shed(self):
+        release = threading.Event()
+
+        def signal_receiver(scheduler):
+            release.wait(1)
+
+        (first, second) = self._various_objs[:2]
+        second.max_backlog = 1
+        SharedDelayScheduler.signal.connect(signal_receiver)
+        try:
+            first.start()
+            time.sleep(0.15)
+            self.assertGreaterEqual(first.metrics['shed'], 1)
+            self.assertEqual(first.loop.backlog, 1)
+            self.assertIsNone(second.dispatch(first.loop))
+            self.assertEqual(second.metrics['shed'], 1)
+        finally:
+            release.set()
+            SharedDelayScheduler.signal.disconnect(signal_receiver)
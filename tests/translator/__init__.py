@@ -7,6 +7,7 @@
 import unittest
 
 from .obvius import *
+from .pool import *
 from neat.translator import get_translator
 from neat.translator._common import AbstractTranslator
 from neat.translator.obvius import ObviusTranslator
@@ -10,89 +10,20 @@ from unittest.mock import MagicMock
 
 from neat import const
 from neat.models.record import Record
-from neat.translator import get_translator, ObviusTranslator
+from neat.translator import (
+    get_translator, ObviusTranslator, ObviusLogTranslator
+)
+from neat.translator.obvius import TranslationPlan
+
+from .. import fixtures
 
 
 class ObviusTranslatorTest(unittest.TestCase):
 
     def setUp(self):
         const.log_level = logging.CRITICAL
-        self._valid_dat = '''<?xml version="1.0" encoding="UTF-8" ?>
-        <DAS>
-            <name>001EC600070F</name>
-            <serial>001EC600070F</serial>
-            <devices>
-                <device>
-                    <name>Broyhill Wind Turbine</name>
-                    <address>4</address>
-                    <type>Turbine</type>
-                    <class>8000</class>
-                    <status>Ok</status>
-                    <numpoints>16</numpoints>
-                    <records>
-                        <record>
-                            <time zone="UTC">2017-02-24 16:06:22</time>
-                            <age units="seconds">59</age>
-                            <error text="Ok">0</error>
-                            <point number="0" name="Inverter Reactive Power" units="kVAR" value="0.214"  />
-                            <point number="1" name="Inverter Real Power" units="kW" value="1.153"  />
-                            <point number="2" name="RMS Line Voltage Phase A-N" units="Volts" value="278.874"  />
-                            <point number="3" name="RMS Line Voltage Phase B-N" units="Volts" value="279.530"  />
-                            <point number="4" name="RMS Line Voltage Phase C-N" units="Volts" value="278.169"  />
-                            <point number="5" name="RMS Line Current Phase A" units="Amps" value="2.961"  />
-                            <point number="6" name="RMS Line Current Phase B" units="Amps" value="3.130"  />
-                            <point number="7" name="RMS Line Current Phase C" units="Amps" value="2.830"  />
-                            <point number="8" name="Grid Frequency" units="Hz" value="59.985"  />
-                            <point number="9" name="Ambient Temperature" units="Degrees F" value="59.756"  />
-                            <point number="10" name="Rotor Speed" units="RPM" value="32.819"  />
-                            <point number="11" name="Inverter Energy Total" units="kWh" value="790338.000"  />
-                            <point number="12" name="Wind Speed (10 minute average)" units="MPH" value="7.843"  />
-                            <point number="13" name="Wind Speed (1 minute average)" units="MPH" value="10.924"  />
-                            <point number="14" name="Wind speed (1 second average)" units="MPH" value="10.781"  />
-                            <point number="15" name="Turbine Run Time" units="hours" value="49126.903"  />
-                        </record>
-                    </records>
-                </device>
-            </devices>
-        </DAS>'''
-        self._invalid_dat = '''<?xml version="1.0" encoding="UTF-8" ?>
-        <DAS>
-            <name>001EC600070F</name>
-            <serial>001EC600070F</serial>
-            <devices>
-                <device>
-                    <name>Broyhill Wind Turbine</name>
-                    <address>4</address>
-                    <type>Turbine</type>
-                    <class>8000</class>
-                    <status>Ok</status>
-                    <numpoints>16</numpoints>
-                    <records>
-                        <record>
-                            <time zone="UTC">2017-02-24 16:06:22</time>
-                            <age units="seconds">59</age>
-                            <error text="Ok">1</error>
-                            <point number="0" name="Inverter Reactive Power" units="kVAR" value="0.214"  />
-                            <point number="1" name="Inverter Real Power" units="kW" value="1.153"  />
-                            <point number="2" name="RMS Line Voltage Phase A-N" units="Volts" value="278.874"  />
-                            <point number="3" name="RMS Line Voltage Phase B-N" units="Volts" value="279.530"  />
-                            <point number="4" name="RMS Line Voltage Phase C-N" units="Volts" value="278.169"  />
-                            <point number="5" name="RMS Line Current Phase A" units="Amps" value="2.961"  />
-                            <point number="6" name="RMS Line Current Phase B" units="Amps" value="3.130"  />
-                            <point number="7" name="RMS Line Current Phase C" units="Amps" value="2.830"  />
-                            <point number="8" name="Grid Frequency" units="Hz" value="59.985"  />
-                            <point number="9" name="Ambient Temperature" units="Degrees F" value="59.756"  />
-                            <point number="10" name="Rotor Speed" units="RPM" value="32.819"  />
-                            <point number="11" name="Inverter Energy Total" units="kWh" value="790338.000"  />
-                            <point number="12" name="Wind Speed (10 minute average)" units="MPH" value="7.843"  />
-                            <point number="13" name="Wind Speed (1 minute average)" units="MPH" value="10.924"  />
-                            <point number="14" name="Wind speed (1 second average)" units="MPH" value="10.781"  />
-                            <point number="15" name="Turbine Run Time" units="hours" value="49126.903"  />
-                        </record>
-                    </records>
-                </device>
-            </devices>
-        </DAS>'''
+        self._valid_dat = fixtures.OBVIUS_VALID_DAT
+        self._invalid_dat = fixtures.OBVIUS_INVALID_DAT
         self._obj = ObviusTranslator()
 
     def tearDown(self):
@@ -102,6 +33,92 @@ class ObviusTranslatorTest(unittest.TestCase):
         self.assertIsInstance(self._obj.parser, str)
         self.assertIn(self._obj.parser, self._obj._parser_pref)
         self.assertIsInstance(self._obj.unit_map, dict)
+        self.assertIs(self._obj.unit_map, ObviusTranslator().unit_map)
+        self.assertEqual(self._obj.unit_table['kW'], 'kilowatt')
+        self.assertEqual(self._obj.unit_table[''], 'dimensionless')
+        self.assertEqual(
+            set(self._obj.unit_table.keys()), set(self._obj.unit_map.keys())
+        )
+
+    def test_parse(self):
+        self.assertEqual(self._obj.engine, 'lxml')
+        (error, devices) = self._obj.parse(self._valid_dat)
+        self.assertEqual(error, 0)
+        self.assertEqual(devices[0]['name'], 'Broyhill Wind Turbine')
+        self.assertEqual(devices[0]['numpoints'], '16')
+        self.assertEqual(devices[0]['records'][0]['age'], '59')
+        self.assertEqual(
+            devices[0]['records'][0]['points'][0],
+            ('0', 'Inverter Reactive Power', 'kVAR', '0.214')
+        )
+        self._obj._engine = 'bs4'
+        self.assertEqual(self._obj.parse(self._valid_dat), (error, devices))
+        self._obj._engine = 'lxml'
+        # NOTE: unparsable xml falls back to the bs4 engine
+        self.assertEqual(
+            self._obj.parse(self._valid_dat.replace('</DAS>', '')),
+            (error, devices)
+        )
+
+    def test_engines(self):
+        records = []
+
+        def receiver(record):
+            records.append(record.to_dict())
+
+        self._obj.signal.connect(receiver)
+        try:
+            for engine in ('lxml', 'bs4'):
+                self._obj._engine = engine
+                self._obj.translate(
+                    self._valid_dat, meta={'name': 'test', 'type': 'WIND'}
+                )
+        finally:
+            self._obj.signal.disconnect(receiver)
+        for record in records:
+            del record['timestamp']
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0], records[1])
+
+    def test_declared_encoding(self):
+        data = self._valid_dat.replace(
+            'encoding="UTF-8"', 'encoding="ISO-8859-1"'
+        ).replace('Inverter Real Power', 'Inverter Real Power \u00b0')
+        (_, devices) = self._obj._parse_lxml(data)
+        self.assertIn(
+            'Inverter Real Power \u00b0',
+            [_[1] for _ in devices[0]['records'][0]['points']]
+        )
+        self.assertEqual(
+            self._obj._parse_lxml(data), self._obj._parse_soup(data)
+        )
+
+    def test_plan(self):
+        (_, devices) = self._obj.parse(self._valid_dat)
+        points = list(reversed(devices[0]['records'][0]['points']))
+        plan = self._obj.plan(('test', 'device'), '16', points)
+        self.assertIsInstance(plan, TranslationPlan)
+        self.assertIs(plan, self._obj.plan(('test', 'device'), '16', points))
+        self.assertEqual(self._obj.metrics, {
+            'plans': 1, 'compiled': 1, 'reused': 1
+        })
+
+        data = plan.build(points)
+        self.assertEqual(list(data.keys()), list(range(16)))
+        self.assertEqual(data[1].name, 'Inverter Real Power')
+        self.assertEqual(data[1].unit, 'kilowatt')
+        self.assertEqual(data[1].value, 1.153)
+        points[0] = points[0][:3] + ('nan?',)
+        self.assertIsNone(plan.build(points)[15].value)
+
+        # NOTE: plans are recompiled when the point layout changes
+        self.assertIsNot(
+            plan, self._obj.plan(('test', 'device'), '17', points)
+        )
+        points[0] = ('15', 'Turbine Run Time', 'unknown', '1.0')
+        changed = self._obj.plan(('test', 'device'), '17', points)
+        self.assertEqual(changed.build(points)[15].unit, 'dimensionless')
+        self.assertEqual(self._obj.metrics['compiled'], 3)
 
     def test_validate(self):
         self.assertEqual(True, self._obj.validate(self._valid_dat))
@@ -114,6 +131,98 @@ class ObviusTranslatorTest(unittest.TestCase):
         def test_receiver(record: Record):
             that.assertIsInstance(record, Record)
 
+        self.addCleanup(self._obj.signal.disconnect, test_receiver)
+        # NOTE: the signal is shared by every translator, restore its send
         self._obj.signal.send = MagicMock()
+        self.addCleanup(delattr, self._obj.signal, 'send')
         self.assertIsNone(self._obj.translate(self._valid_dat))
         self.assertEqual(True, self._obj.signal.send.called)
+        (record,) = self._obj.signal.send.call_args[0]
+        self.assertEqual(record.age, 59.0)
+
+    def test_records(self):
+        (record,) = self._obj.records(self._valid_dat, device_time=True)
+        self.assertEqual(record.timestamp, 1487952382)
+        self.assertEqual(list(self._obj.records(self._invalid_dat)), [])
+
+
+class ObviusLogTranslatorTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._obj = ObviusLogTranslator()
+        self._meta = fixtures.obvius_log_meta()
+        self._valid_dat = fixtures.OBVIUS_LOG_DAT
+
+    def tearDown(self):
+        del self._obj
+
+    def test_get_translator(self):
+        self.assertIs(
+            get_translator('ObviusLogRequester'), ObviusLogTranslator
+        )
+        self.assertIs(
+            get_translator('ObviusHostLogRequester'), ObviusLogTranslator
+        )
+
+    def test_timestamp(self):
+        self.assertEqual(
+            self._obj.timestamp('2017-02-24 16:00:00'), 1487952000.0
+        )
+        self.assertEqual(
+            self._obj.timestamp('2017-02-24T16:00:00Z'), 1487952000.0
+        )
+        with self.assertRaises(ValueError):
+            self._obj.timestamp('time(UTC)')
+
+    def test_header(self):
+        self.assertEqual(
+            self._obj.header([
+                'time(UTC)', 'error', 'lowrange', 'highrange',
+                'Wind Speed (10 minute average) (MPH)', 'Pulses',
+            ]),
+            [
+                ('0', 'Wind Speed (10 minute average)', 'MPH', None),
+                ('1', 'Pulses', '', None),
+            ]
+        )
+
+    def test_validate(self):
+        self.assertTrue(self._obj.validate(self._valid_dat))
+        self.assertFalse(self._obj.validate(''))
+        self.assertFalse(self._obj.validate('<DAS></DAS>'))
+
+    def test_records(self):
+        records = list(self._obj.records(
+            self._valid_dat.splitlines(), meta=self._meta
+        ))
+        self.assertEqual(
+            [_.timestamp for _ in records],
+            [1487952000, 1487952900, 1487954700]
+        )
+        for record in records:
+            self.assertIsInstance(record, Record)
+            self.assertIsNone(record.age)
+            self.assertEqual(record.device_name, 'wind.1')
+            self.assertTrue(record.validate())
+        self.assertEqual(records[0].data[1].name, 'Inverter Real Power')
+        self.assertEqual(records[0].data[1].value, 1.153)
+        self.assertEqual(records[0].parsed['wind_speed'].value, 7.843)
+        self.assertEqual(
+            self._obj.metrics, {'rows': 4, 'skipped': 1, 'records': 3}
+        )
+
+        records = list(self._obj.records(
+            self._valid_dat.splitlines(), meta=self._meta,
+            start=1487952900, end=1487954700
+        ))
+        self.assertEqual([_.timestamp for _ in records], [1487952900])
+        self.assertEqual(list(self._obj.records(
+            self._valid_dat.splitlines(), meta={'type': 'INVALID'}
+        )), [])
+
+    def test_translate(self):
+        self._obj.signal.send = MagicMock()
+        self.addCleanup(delattr, self._obj.signal, 'send')
+        self.assertIsNone(self._obj.translate(self._valid_dat, self._meta))
+        self.assertEqual(self._obj.signal.send.call_count, 3)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import time
+import logging
+import threading
+import unittest
+
+from neat import const
+from neat.models.record import Record
+from neat.translator.pool import TranslatorPool
+
+from .. import fixtures
+
+
+class TranslatorPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._pool = TranslatorPool(workers=2)
+        (self._valid_dat, self._invalid_dat) = (
+            fixtures.OBVIUS_VALID_DAT, fixtures.OBVIUS_INVALID_DAT
+        )
+
+    def tearDown(self):
+        self._pool.shutdown()
+        del self._pool
+
+    def test_submit(self):
+        delivered = []
+        for index in range(8):
+            self._pool.submit(
+                'device', 'ObviusRequester', self._valid_dat,
+                {'name': 'test.{}'.format(index), 'type': 'WIND'},
+                delivered.extend
+            )
+        self._pool.submit(
+            'device', 'ObviusRequester', self._invalid_dat,
+            {'name': 'invalid', 'type': 'WIND'}, delivered.extend
+        )
+        self._pool.shutdown()
+        self.assertEqual(
+            [_.name for _ in delivered],
+            ['test.{}'.format(_) for _ in range(8)]
+        )
+        for record in delivered:
+            self.assertIsInstance(record, Record)
+            self.assertEqual(record.age, 59.0)
+            self.assertEqual(record.device_name, 'Broyhill Wind Turbine')
+
+    def test_metrics(self):
+        metrics = self._pool.metrics
+        self.assertEqual(metrics['depth'], 0)
+        self.assertEqual(metrics['utilization'], 0.0)
+        self._pool.submit(
+            'device', 'ObviusRequester', self._valid_dat,
+            {'name': 'test', 'type': 'WIND'}, (lambda records: None)
+        )
+        self._pool.submit(
+            'device', 'UnknownRequester', self._valid_dat,
+            {'name': 'test', 'type': 'WIND'}, (lambda records: None)
+        )
+        self._pool.shutdown()
+        metrics = self._pool.metrics
+        self.assertEqual(
+            (metrics['submitted'], metrics['completed'], metrics['failed']),
+            (2, 1, 1)
+        )
+        self.assertEqual((metrics['depth'], metrics['waiting']), (0, 0))
+        self.assertGreater(metrics['utilization'], 0.0)
+
+    def test_slow_callback(self):
+        (gate, delivered) = (threading.Event(), [])
+
+        def blocked(records):
+            gate.wait(5.0)
+            delivered.extend(records)
+
+        first = self._pool.submit(
+            'first', 'ObviusRequester', self._valid_dat,
+            {'name': 'first', 'type': 'WIND'}, blocked
+        )
+        first.result(5.0)
+        # NOTE: translations are collected while a callback is blocked
+        second = self._pool.submit(
+            'second', 'ObviusRequester', self._valid_dat,
+            {'name': 'second', 'type': 'WIND'}, delivered.extend
+        )
+        second.result(5.0)
+        try:
+            for _ in range(500):
+                metrics = self._pool.metrics
+                if (metrics['completed'], metrics['delivering']) == (2, 1):
+                    break
+                time.sleep(0.01)
+            self.assertEqual(self._pool.metrics['completed'], 2)
+            self.assertEqual(self._pool.metrics['delivering'], 1)
+            self.assertEqual(delivered, [])
+        finally:
+            gate.set()
+        self._pool.shutdown()
+        self.assertEqual([_.name for _ in delivered], ['first', 'second'])
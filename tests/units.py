@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- encoding: utf-8 -*-
+#
+# Copyright (c) 2017 Stephen Bunn (stephen@bunn.io)
+# GNU GPLv3 <https://www.gnu.org/licenses/gpl-3.0.en.html>
+
+import logging
+import unittest
+
+from neat import const
+from neat.units import UnitConverter, get_registry
+
+import pint
+
+
+class get_registryTest(unittest.TestCase):
+
+    def test_get_registry(self):
+        registry = get_registry()
+        self.assertIsInstance(registry, pint.UnitRegistry)
+        self.assertIs(registry, get_registry())
+        self.assertIs(UnitConverter().registry, registry)
+
+
+class UnitConverterTest(unittest.TestCase):
+
+    def setUp(self):
+        const.log_level = logging.CRITICAL
+        self._registry = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
+        self._converter = UnitConverter(self._registry)
+
+    def tearDown(self):
+        del self._converter
+
+    def _pint(self, value, source, target):
+        quantity = self._registry.Quantity(
+            value, self._registry.Unit(source)
+        ).to(self._registry.Unit(target))
+        return (quantity.magnitude, str(quantity.units))
+
+    def test_convert(self):
+        for (source, target) in (
+            ('kilowatt', 'kilowatt'),
+            ('watt', 'kilowatt'),
+            ('btu / hour', 'kilowatt'),
+            ('gallon / minute', 'liter / second'),
+            ('degF', 'degC'),
+            ('degC', 'degF'),
+            ('kelvin', 'degF'),
+        ):
+            for value in (-40.0, 0.0, 12.5, 790338.0):
+                (converted, unit) = self._converter.convert(
+                    value, source, target
+                )
+                (expected, expected_unit) = self._pint(value, source, target)
+                self.assertAlmostEqual(converted, expected, places=6)
+                self.assertEqual(unit, expected_unit)
+        self.assertEqual(self._converter.metrics['fallbacks'], 0)
+
+    def test_incompatible(self):
+        with self.assertRaises(pint.errors.DimensionalityError):
+            self._converter.convert(1.0, 'kilowatt', 'degF')
+        with self.assertRaises(TypeError):
+            self._converter.convert(None, 'kilowatt', 'watt')
+
+    def test_metrics(self):
+        metrics = self._converter.metrics
+        self.assertEqual(metrics['hit_rate'], 0.0)
+        self.assertEqual(metrics['conversions_per_second'], 0.0)
+        for _ in range(4):
+            self._converter.convert(1.0, 'watt', 'kilowatt')
+        metrics = self._converter.metrics
+        self.assertEqual(metrics['compiled'], 1)
+        self.assertEqual((metrics['hits'], metrics['misses']), (3, 1))
+        self.assertEqual(metrics['hit_rate'], 0.75)
+        self.assertEqual(metrics['conversions'], 4)
+        self.assertGreater(metrics['conversions_per_second'], 0.0)